@@ -0,0 +1,198 @@
+"""
+Agregados incrementales de los stats de los personajes.
+
+Para cada stat numerico (poder, inteligencia, velocidad) mantiene cantidad, suma,
+minimo, maximo y las posiciones que alcanzan el maximo, tanto para el total como
+para cada raza y cada genero. Se actualizan en O(1) con cada personaje agregado.
+"""
+import heapq
+
+COLUMNAS_STATS = (4, 5, 6)
+COLUMNAS_AMBITO = (2, 3)  # Raza y genero
+
+
+class Agregado:
+    """
+    Cantidad, suma, minimo, maximo y posiciones del maximo de un stat.
+    """
+
+    def __init__(self) -> None:
+        self.cantidad = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+        self.posiciones_maximo = []
+        self.posiciones_compartidas = False  # La lista es de otro agregado (ver derivar)
+
+    def actualizar(self, valor: int, posicion: int) -> None:
+        """
+        Incorpora el valor de un personaje al agregado.
+
+        Args:
+            valor (int): Valor del stat del personaje.
+            posicion (int): Posicion del personaje en el almacen.
+
+        Returns:
+            None
+        """
+        self.cantidad += 1
+        self.suma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+            self.posiciones_maximo = [posicion]
+            self.posiciones_compartidas = False
+        elif valor == self.maximo:
+            if self.posiciones_compartidas:
+                self.posiciones_maximo = self.posiciones_maximo[:]
+                self.posiciones_compartidas = False
+            self.posiciones_maximo.append(posicion)
+
+    def promedio(self) -> float:
+        """
+        Retorna el promedio del stat, o 0 si no hay personajes (igual que calcular_promedio).
+
+        Returns:
+            float: Suma dividida por cantidad.
+        """
+        if self.cantidad == 0:
+            return 0
+        return self.suma / self.cantidad
+
+    def copiar(self) -> "Agregado":
+        """
+        Retorna una copia independiente del agregado.
+
+        Returns:
+            Agregado: Copia del agregado.
+        """
+        copia = Agregado()
+        copia.cantidad = self.cantidad
+        copia.suma = self.suma
+        copia.minimo = self.minimo
+        copia.maximo = self.maximo
+        copia.posiciones_maximo = self.posiciones_maximo[:]
+        return copia
+
+    def derivar(self) -> "Agregado":
+        """
+        Retorna una copia que comparte la lista de posiciones del maximo con este
+        agregado. La copia recien duplica la lista si un empate en el maximo la modifica,
+        por lo que este agregado no cambia al actualizar la copia.
+
+        Returns:
+            Agregado: Copia para actualizar sin modificar este agregado.
+        """
+        copia = Agregado()
+        copia.cantidad = self.cantidad
+        copia.suma = self.suma
+        copia.minimo = self.minimo
+        copia.maximo = self.maximo
+        copia.posiciones_maximo = self.posiciones_maximo
+        copia.posiciones_compartidas = True
+        return copia
+
+
+def combinar_agregados(agregados: list) -> Agregado:
+    """
+    Combina varios agregados de un mismo stat en uno solo (ej: todas las razas que
+    contienen "Saiyan").
+
+    Args:
+        agregados (list): Lista de Agregado a combinar.
+
+    Returns:
+        Agregado: Agregado nuevo con la cantidad y suma totales, el minimo y maximo
+            global y las posiciones del maximo en orden ascendente.
+    """
+    combinado = Agregado()
+    for agregado in agregados:
+        if agregado.cantidad == 0:
+            continue
+        combinado.cantidad += agregado.cantidad
+        combinado.suma += agregado.suma
+        if combinado.minimo is None or agregado.minimo < combinado.minimo:
+            combinado.minimo = agregado.minimo
+        if combinado.maximo is None or agregado.maximo > combinado.maximo:
+            combinado.maximo = agregado.maximo
+
+    listas_maximo = []
+    for agregado in agregados:
+        if agregado.cantidad and agregado.maximo == combinado.maximo:
+            listas_maximo.append(agregado.posiciones_maximo)
+    combinado.posiciones_maximo = list(heapq.merge(*listas_maximo))
+    return combinado
+
+
+class RegistroAgregados:
+    """
+    Agregados de cada stat para el total de personajes y para cada codigo de raza y
+    de genero de un AlmacenPersonajes.
+    """
+
+    def __init__(self) -> None:
+        self.totales = {indice_stat: Agregado() for indice_stat in COLUMNAS_STATS}
+        self.por_codigo = {indice_columna: {} for indice_columna in COLUMNAS_AMBITO}
+
+    def actualizar(self, personaje_codificado, posicion: int) -> None:
+        """
+        Incorpora un personaje a todos los agregados que le corresponden.
+
+        Args:
+            personaje_codificado (sequence): Fila con los codigos de texto y los stats,
+                                        en el orden de las columnas del almacen.
+            posicion (int): Posicion del personaje en el almacen.
+
+        Returns:
+            None
+        """
+        for indice_columna in COLUMNAS_AMBITO:
+            codigo = personaje_codificado[indice_columna]
+            agregados_codigo = self.por_codigo[indice_columna].get(codigo)
+            if agregados_codigo is None:
+                agregados_codigo = {indice_stat: Agregado() for indice_stat in COLUMNAS_STATS}
+                self.por_codigo[indice_columna][codigo] = agregados_codigo
+            for indice_stat in COLUMNAS_STATS:
+                agregados_codigo[indice_stat].actualizar(personaje_codificado[indice_stat], posicion)
+        for indice_stat in COLUMNAS_STATS:
+            self.totales[indice_stat].actualizar(personaje_codificado[indice_stat], posicion)
+
+    def consultar(self, indice_stat: int, indice_columna=None, codigos=None) -> Agregado:
+        """
+        Retorna el agregado de un stat para el total o para un conjunto de codigos.
+
+        Args:
+            indice_stat (int): Índice del stat (4 = poder, 5 = inteligencia, 6 = velocidad).
+            indice_columna (int, opcional): 2 = raza, 3 = genero. None para el total.
+            codigos (iterable, opcional): Codigos de la columna a incluir.
+
+        Returns:
+            Agregado: Agregado resultante. No debe modificarse.
+        """
+        if indice_columna is None:
+            return self.totales[indice_stat]
+        agregados = []
+        for codigo in codigos:
+            agregados_codigo = self.por_codigo[indice_columna].get(codigo)
+            if agregados_codigo is not None:
+                agregados.append(agregados_codigo[indice_stat])
+        if len(agregados) == 1:
+            return agregados[0]
+        return combinar_agregados(agregados)
+
+    def copiar(self) -> "RegistroAgregados":
+        """
+        Retorna una copia independiente del registro.
+
+        Returns:
+            RegistroAgregados: Copia del registro.
+        """
+        copia = RegistroAgregados()
+        copia.totales = {indice: agregado.copiar() for indice, agregado in self.totales.items()}
+        for indice_columna, agregados_por_codigo in self.por_codigo.items():
+            copia.por_codigo[indice_columna] = {
+                codigo: {indice: agregado.copiar() for indice, agregado in agregados_codigo.items()}
+                for codigo, agregados_codigo in agregados_por_codigo.items()
+            }
+        return copia
@@ -0,0 +1,295 @@
+"""
+Almacen de personajes para varios hilos: un escritor y lectores con instantaneas.
+
+Las columnas se guardan en buffers array('i') de capacidad fija que nunca cambian de
+tamaño: una alta escribe la fila en la primera posicion libre y luego publica la nueva
+cantidad de filas. Una instantanea es un AlmacenPersonajes de solo lectura cuyas
+columnas son memoryviews de esos buffers limitados a la cantidad publicada al crearla,
+por lo que se crea en O(1), sin copiar filas, y no ve las altas posteriores. Cuando un
+buffer se llena, el escritor copia las filas a buffers del doble de capacidad y sigue
+en ellos; las instantaneas anteriores conservan los buffers viejos mientras existan.
+
+Los diccionarios de cadenas y los indices invertidos tambien se comparten: solo crecen
+al final, y cada instantanea ignora los codigos y posiciones posteriores a ella. El
+registro de agregados se copia por camino en cada alta: el registro nuevo comparte con
+el publicado los agregados de las razas y generos que la alta no toca, y los que toca
+comparten la lista de posiciones del maximo salvo que la alta empate el maximo.
+
+Los escritores se ordenan entre si con un cerrojo; los lectores nunca lo toman, por lo
+que un ordenamiento o una estadistica larga sobre una instantanea no bloquea las altas
+ni es bloqueado por ellas.
+
+Ejemplo:
+    almacen = AlmacenConcurrente(matriz)
+    instantanea = almacen.instantanea()    # En cualquier hilo
+    operaciones_ordenamiento.ordenar_por_stat(instantanea, 4)
+    almacen.agregar(personaje)             # La instantanea no cambia
+"""
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+
+from agregados import COLUMNAS_AMBITO, COLUMNAS_STATS, RegistroAgregados
+from almacen_personajes import (CANTIDAD_COLUMNAS, COLUMNAS_NUMERICAS, COLUMNAS_TEXTO, CONTADOR_ALMACENES,
+                                AlmacenPersonajes, DiccionarioCadenas)
+
+CAPACIDAD_MINIMA = 1024  # Filas de los primeros buffers
+
+
+class EstadoPublicado:
+    """
+    Version publicada del almacen: los buffers, la cantidad de filas visibles y el
+    registro de agregados de esas filas. No se modifica despues de publicarse.
+    """
+
+    def __init__(self, buffers: list, cantidad: int, version: int, agregados: RegistroAgregados) -> None:
+        self.buffers = buffers
+        self.cantidad = cantidad
+        self.version = version
+        self.agregados = agregados
+
+
+class InstantaneaAlmacen(AlmacenPersonajes):
+    """
+    Vista de solo lectura de un AlmacenConcurrente en una version. Se usa en lugar de
+    la matriz en todas las operaciones del programa.
+    """
+
+    def __init__(self, almacen: "AlmacenConcurrente", estado: EstadoPublicado) -> None:
+        # No llama a AlmacenPersonajes.__init__: comparte todo con el almacen
+        self.diccionarios = almacen.diccionarios
+        self.columnas = [memoryview(buffer)[:estado.cantidad] for buffer in estado.buffers]
+        self.indices_invertidos = almacen.indices_invertidos
+        self.agregados = estado.agregados
+        self.mapeo = None
+        self.identificador = almacen.identificador
+        self.version = estado.version
+
+    def agregar(self, personaje) -> None:
+        raise TypeError("Una instantanea es de solo lectura: agregue personajes en el AlmacenConcurrente.")
+
+    def agregar_varios(self, personajes) -> None:
+        raise TypeError("Una instantanea es de solo lectura: agregue personajes en el AlmacenConcurrente.")
+
+    def listas_coincidentes(self, indice_columna: int, predicado) -> list:
+        """
+        Retorna, para cada codigo cuyo valor cumple el predicado, la lista de sus
+        posiciones limitada a las filas de la instantanea.
+
+        Returns:
+            list: Listas de posiciones en orden ascendente.
+        """
+        indice_invertido = self.indices_invertidos[indice_columna]
+        cantidad = len(self)
+        listas = []
+        for codigo in self.codigos_coincidentes(indice_columna, predicado):
+            posiciones = indice_invertido.get(codigo)
+            if posiciones:
+                listas.append(posiciones[:bisect_left(posiciones, cantidad)])
+        return listas
+
+    def obtener_indice_invertido(self, indice_columna: int) -> dict:
+        """
+        Retorna una copia del indice invertido de una columna de texto limitada a las
+        filas de la instantanea.
+
+        Args:
+            indice_columna (int): Índice de la columna de texto (2 = raza, 3 = genero).
+
+        Returns:
+            dict: Diccionario {codigo: lista de posiciones en orden ascendente}.
+        """
+        cantidad = len(self)
+        indice_invertido = {}
+        for codigo, posiciones in list(self.indices_invertidos[indice_columna].items()):
+            limite = bisect_left(posiciones, cantidad)
+            if limite:
+                indice_invertido[codigo] = posiciones[:limite]
+        return indice_invertido
+
+    def posiciones_coincidentes(self, indice_columna: int, predicado) -> list:
+        listas = self.listas_coincidentes(indice_columna, predicado)
+        if len(listas) == 1:
+            return listas[0]
+        return list(heapq.merge(*listas))
+
+    def contar_coincidentes(self, indice_columna: int, predicado) -> int:
+        indice_invertido = self.indices_invertidos[indice_columna]
+        cantidad = 0
+        for codigo in self.codigos_coincidentes(indice_columna, predicado):
+            cantidad += bisect_left(indice_invertido.get(codigo, ()), len(self))
+        return cantidad
+
+    def copiar(self) -> AlmacenPersonajes:
+        """
+        Retorna un AlmacenPersonajes independiente (y modificable) con las filas de la
+        instantanea.
+
+        Returns:
+            AlmacenPersonajes: Copia con sus propias columnas y diccionarios.
+        """
+        copia = AlmacenPersonajes()
+        copia.diccionarios = [diccionario.copiar() for diccionario in self.diccionarios]
+        copia.columnas = [array('i', columna) for columna in self.columnas]
+        copia.agregados = self.agregados.copiar()
+        return copia
+
+
+class AlmacenConcurrente:
+    """
+    Almacen de personajes que admite altas mientras otros hilos leen instantaneas.
+    """
+
+    def __init__(self, matriz=None) -> None:
+        """
+        Args:
+            matriz (list | AlmacenPersonajes, opcional): Personajes iniciales. Se copian.
+        """
+        if isinstance(matriz, AlmacenPersonajes):
+            origen = matriz
+        else:
+            origen = AlmacenPersonajes()
+            origen.agregar_varios(matriz or [])
+        cantidad = len(origen)
+
+        self.diccionarios = []
+        for diccionario in origen.diccionarios:
+            copia = DiccionarioCadenas(list(diccionario.valores))
+            copia.codigos = {cadena: codigo for codigo, cadena in enumerate(copia.valores)}
+            self.diccionarios.append(copia)
+        self.indices_invertidos = {}
+        for indice_columna in COLUMNAS_AMBITO:
+            self.indices_invertidos[indice_columna] = {
+                codigo: posiciones[:] for codigo, posiciones in origen.obtener_indice_invertido(indice_columna).items()
+            }
+        agregados = origen.obtener_agregados().copiar()
+
+        capacidad = max(CAPACIDAD_MINIMA, cantidad + cantidad // 2)
+        buffers = []
+        for columna in origen.columnas:
+            buffer = array('i', columna)
+            buffer.frombytes(bytes(buffer.itemsize * (capacidad - cantidad)))
+            buffers.append(buffer)
+
+        self.identificador = next(CONTADOR_ALMACENES)
+        self.cerrojo = threading.Lock()  # Solo lo toman los escritores
+        self.estado = EstadoPublicado(buffers, cantidad, 0, agregados)
+
+    def __len__(self) -> int:
+        return self.estado.cantidad
+
+    @property
+    def version(self) -> int:
+        return self.estado.version
+
+    def instantanea(self) -> InstantaneaAlmacen:
+        """
+        Retorna una vista de solo lectura del almacen en su version actual. Se puede
+        llamar desde cualquier hilo, sin esperar a los escritores.
+
+        Returns:
+            InstantaneaAlmacen: Instantanea que no cambia con las altas posteriores.
+        """
+        return InstantaneaAlmacen(self, self.estado)
+
+    def agregar(self, personaje) -> None:
+        """
+        Agrega un personaje al final del almacen.
+
+        Args:
+            personaje (list | tuple): Datos [nombre, alias, raza, genero, poder, inteligencia, velocidad].
+
+        Returns:
+            None
+        """
+        self.agregar_varios([personaje])
+
+    def agregar_varios(self, personajes) -> None:
+        """
+        Agrega varios personajes al final del almacen y los publica juntos: una
+        instantanea ve todos o ninguno.
+
+        Args:
+            personajes (iterable): Personajes con estructura [nombre, alias, raza, genero,
+                                poder, inteligencia, velocidad].
+
+        Returns:
+            None
+        """
+        personajes = list(personajes)
+        # Convierte los stats antes de tocar las columnas, para no dejar filas a medias
+        stats = [array('i', [personaje[indice] for personaje in personajes]) for indice in COLUMNAS_NUMERICAS]
+        if not personajes:
+            return
+        with self.cerrojo:
+            publicado = self.estado
+            inicio = publicado.cantidad
+            fin = inicio + len(personajes)
+            buffers = self.asegurar_capacidad(publicado, fin)
+            for indice in COLUMNAS_TEXTO:
+                codificar = self.diccionarios[indice].codificar
+                buffers[indice][inicio:fin] = array('i', [codificar(personaje[indice]) for personaje in personajes])
+            for indice, columna_stats in zip(COLUMNAS_NUMERICAS, stats):
+                buffers[indice][inicio:fin] = columna_stats
+
+            agregados = self.registrar_nuevas_filas(publicado.agregados, buffers, inicio, fin)
+            self.estado = EstadoPublicado(buffers, fin, publicado.version + 1, agregados)
+
+    def asegurar_capacidad(self, publicado: EstadoPublicado, cantidad: int) -> list:
+        """
+        Retorna buffers con lugar para cantidad filas: los publicados o, si no alcanzan,
+        buffers nuevos del doble de capacidad con las filas copiadas.
+
+        Returns:
+            list: Un buffer por columna.
+        """
+        capacidad = len(publicado.buffers[0])
+        if cantidad <= capacidad:
+            return publicado.buffers
+        nueva_capacidad = max(cantidad, 2 * capacidad)
+        buffers = []
+        for buffer in publicado.buffers:
+            nuevo = buffer[:publicado.cantidad]
+            nuevo.frombytes(bytes(nuevo.itemsize * (nueva_capacidad - publicado.cantidad)))
+            buffers.append(nuevo)
+        return buffers
+
+    def registrar_nuevas_filas(self, publicado: RegistroAgregados, buffers: list, inicio: int, fin: int) -> RegistroAgregados:
+        """
+        Agrega las filas nuevas a los indices invertidos y arma el registro de agregados
+        de la nueva version: deriva solo los agregados que las filas modifican y comparte
+        los demas con el registro publicado.
+
+        Returns:
+            RegistroAgregados: Registro de la nueva version.
+        """
+        for indice_columna, indice_invertido in self.indices_invertidos.items():
+            codigos = buffers[indice_columna]
+            for posicion in range(inicio, fin):
+                codigo = codigos[posicion]
+                if codigo in indice_invertido:
+                    indice_invertido[codigo].append(posicion)
+                else:
+                    indice_invertido[codigo] = [posicion]
+
+        # Los diccionarios por codigo se copian superficialmente: solo se reemplazan
+        # las entradas de las razas y generos de las filas nuevas
+        agregados = RegistroAgregados()
+        agregados.totales = {indice: agregado.derivar() for indice, agregado in publicado.totales.items()}
+        agregados.por_codigo = {indice: dict(por_codigo) for indice, por_codigo in publicado.por_codigo.items()}
+        derivados = set()
+        for posicion in range(inicio, fin):
+            personaje_codificado = [buffers[indice][posicion] for indice in range(CANTIDAD_COLUMNAS)]
+            for indice_columna in COLUMNAS_AMBITO:
+                codigo = personaje_codificado[indice_columna]
+                if (indice_columna, codigo) in derivados:
+                    continue
+                derivados.add((indice_columna, codigo))
+                compartido = publicado.por_codigo[indice_columna].get(codigo)
+                if compartido is not None:
+                    agregados.por_codigo[indice_columna][codigo] = {
+                        indice_stat: compartido[indice_stat].derivar() for indice_stat in COLUMNAS_STATS
+                    }
+            agregados.actualizar(personaje_codificado, posicion)
+        return agregados
@@ -0,0 +1,397 @@
+"""
+Almacenamiento columnar de personajes.
+
+Guarda cada uno de los siete atributos en su propia columna en lugar de una
+lista por personaje. Las columnas de texto (nombre, alias, raza, genero) se
+codifican con un diccionario y se guardan como codigos enteros; las columnas
+numericas (poder, inteligencia, velocidad) se guardan en array('i').
+
+Para raza y genero mantiene ademas un indice invertido (codigo -> posiciones),
+y para los stats un registro de agregados (ver agregados.py). Ambos se construyen
+la primera vez que se consultan y luego se actualizan con cada personaje agregado.
+
+Cada almacen tiene un identificador unico y un numero de version que aumenta con
+cada alta; juntos identifican su contenido (ver cache_resultados.py).
+"""
+import heapq
+import itertools
+from array import array
+
+from agregados import RegistroAgregados
+
+COLUMNAS_TEXTO = (0, 1, 2, 3)
+COLUMNAS_NUMERICAS = (4, 5, 6)
+CANTIDAD_COLUMNAS = 7
+CONTADOR_ALMACENES = itertools.count(1)
+
+
+class DiccionarioCadenas:
+    """
+    Tabla de cadenas distintas de una columna. Cada cadena recibe un codigo entero
+    segun su orden de aparicion.
+    """
+
+    def __init__(self, valores=None) -> None:
+        if valores is None:
+            self.valores = []
+            self.codigos = {}
+        else:
+            # Valores ya existentes (ej: la tabla de cadenas de un snapshot). El
+            # diccionario inverso se arma recien si hace falta codificar.
+            self.valores = valores
+            self.codigos = None
+
+    def codificar(self, valor: str) -> int:
+        """
+        Retorna el codigo de una cadena, registrandola si es nueva.
+
+        Args:
+            valor (str): Cadena a codificar.
+
+        Returns:
+            int: Codigo entero de la cadena.
+        """
+        if self.codigos is None:
+            self.valores = list(self.valores)
+            self.codigos = {cadena: codigo for codigo, cadena in enumerate(self.valores)}
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = len(self.valores)
+            self.codigos[valor] = codigo
+            self.valores.append(valor)
+        return codigo
+
+    def copiar(self) -> "DiccionarioCadenas":
+        """
+        Retorna una copia independiente del diccionario.
+
+        Returns:
+            DiccionarioCadenas: Copia del diccionario.
+        """
+        copia = DiccionarioCadenas(list(self.valores))
+        if self.codigos is not None:
+            copia.codigos = dict(self.codigos)
+        return copia
+
+
+class AlmacenPersonajes:
+    """
+    Matriz de personajes guardada por columnas. Se comporta como una lista de filas
+    de solo lectura: admite len(), iteracion, indices y slices, y cada fila se
+    entrega como una tupla (nombre, alias, raza, genero, poder, inteligencia, velocidad).
+    """
+
+    def __init__(self) -> None:
+        self.diccionarios = [DiccionarioCadenas() for _ in COLUMNAS_TEXTO]
+        self.columnas = [array('i') for _ in range(CANTIDAD_COLUMNAS)]
+        self.indices_invertidos = {}
+        self.agregados = None
+        self.mapeo = None  # mmap del snapshot del que se leen las columnas, si lo hay
+        self.identificador = next(CONTADOR_ALMACENES)
+        self.version = 0  # Aumenta con cada llamada a agregar o agregar_varios
+
+    def __len__(self) -> int:
+        return len(self.columnas[0])
+
+    def __iter__(self):
+        nombres, alias, razas, generos = [diccionario.valores for diccionario in self.diccionarios]
+        for (codigo_nombre, codigo_alias, codigo_raza, codigo_genero,
+                poder, inteligencia, velocidad) in zip(*self.columnas):
+            yield (nombres[codigo_nombre], alias[codigo_alias], razas[codigo_raza],
+                generos[codigo_genero], poder, inteligencia, velocidad)
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self.fila(i) for i in range(*posicion.indices(len(self)))]
+        return self.fila(posicion)
+
+    def fila(self, posicion: int) -> tuple:
+        """
+        Reconstruye la fila de un personaje a partir de las columnas.
+
+        Args:
+            posicion (int): Indice del personaje (admite indices negativos).
+
+        Returns:
+            tuple: (nombre, alias, raza, genero, poder, inteligencia, velocidad).
+        """
+        fila = []
+        for indice in COLUMNAS_TEXTO:
+            fila.append(self.diccionarios[indice].valores[self.columnas[indice][posicion]])
+        for indice in COLUMNAS_NUMERICAS:
+            fila.append(self.columnas[indice][posicion])
+        return tuple(fila)
+
+    def filas(self, posiciones) -> list:
+        """
+        Reconstruye varias filas a la vez, recorriendo cada columna una sola vez.
+
+        Args:
+            posiciones (iterable): Indices de los personajes, en el orden deseado.
+
+        Returns:
+            list: Lista de tuplas (nombre, alias, raza, genero, poder, inteligencia, velocidad).
+        """
+        posiciones = list(posiciones)
+        if 4 * len(posiciones) > len(self):
+            # Con muchas posiciones en otro orden (ej: un ordenamiento) es mas rapido armar
+            # todas las filas de corrido y tomarlas por posicion que saltar por las columnas
+            todas = list(self)
+            return list(map(todas.__getitem__, posiciones))
+        columnas = []
+        for indice in COLUMNAS_TEXTO:
+            valores = self.diccionarios[indice].valores
+            codigos = self.columnas[indice]
+            columnas.append(list(map(valores.__getitem__, map(codigos.__getitem__, posiciones))))
+        for indice in COLUMNAS_NUMERICAS:
+            columnas.append(list(map(self.columnas[indice].__getitem__, posiciones)))
+        return list(zip(*columnas))
+
+    def agregar(self, personaje) -> None:
+        """
+        Agrega un personaje al final del almacen.
+
+        Args:
+            personaje (list | tuple): Datos [nombre, alias, raza, genero, poder, inteligencia, velocidad].
+
+        Returns:
+            None
+        """
+        # Convierte los stats antes de tocar las columnas, para no dejar una fila a medias
+        stats = array('i', [personaje[indice] for indice in COLUMNAS_NUMERICAS])
+        self.asegurar_escritura()
+        for indice in COLUMNAS_TEXTO:
+            self.columnas[indice].append(self.diccionarios[indice].codificar(personaje[indice]))
+        for indice, stat in zip(COLUMNAS_NUMERICAS, stats):
+            self.columnas[indice].append(stat)
+
+        self.registrar_nuevas_filas(len(self) - 1)
+
+    def agregar_varios(self, personajes) -> None:
+        """
+        Agrega varios personajes al final del almacen, extendiendo cada columna de una vez.
+
+        Args:
+            personajes (iterable): Personajes con estructura [nombre, alias, raza, genero,
+                                poder, inteligencia, velocidad].
+
+        Returns:
+            None
+        """
+        personajes = list(personajes)
+        inicio = len(self)
+        # Convierte los stats antes de tocar las columnas, para no dejar filas a medias
+        stats = [array('i', [personaje[indice] for personaje in personajes]) for indice in COLUMNAS_NUMERICAS]
+        self.asegurar_escritura()
+        for indice in COLUMNAS_TEXTO:
+            codificar = self.diccionarios[indice].codificar
+            self.columnas[indice].extend(array('i', [codificar(personaje[indice]) for personaje in personajes]))
+        for indice, columna_stats in zip(COLUMNAS_NUMERICAS, stats):
+            self.columnas[indice].extend(columna_stats)
+
+        self.registrar_nuevas_filas(inicio)
+
+    def asegurar_escritura(self) -> None:
+        """
+        Si las columnas se leen de un snapshot mapeado en memoria (solo lectura), las
+        copia a array('i') antes de la primera escritura (copia al escribir).
+
+        Returns:
+            None
+        """
+        if self.mapeo is None:
+            return
+        self.columnas = [array('i', columna) for columna in self.columnas]
+        for diccionario in self.diccionarios:
+            if not isinstance(diccionario.valores, list):
+                diccionario.valores = list(diccionario.valores)
+        try:
+            self.mapeo.close()
+        except BufferError:
+            pass  # Todavia hay vistas externas sobre el archivo; se libera al soltarlas
+        self.mapeo = None
+
+    def registrar_nuevas_filas(self, inicio: int) -> None:
+        """
+        Actualiza los indices invertidos y los agregados ya construidos con las filas
+        agregadas desde la posicion inicio.
+
+        Args:
+            inicio (int): Posicion de la primera fila nueva.
+
+        Returns:
+            None
+        """
+        self.version += 1
+        for indice_columna, indice_invertido in self.indices_invertidos.items():
+            codigos = self.columnas[indice_columna]
+            for posicion in range(inicio, len(self)):
+                codigo = codigos[posicion]
+                if codigo in indice_invertido:
+                    indice_invertido[codigo].append(posicion)
+                else:
+                    indice_invertido[codigo] = [posicion]
+
+        if self.agregados is not None:
+            for posicion in range(inicio, len(self)):
+                self.agregados.actualizar([columna[posicion] for columna in self.columnas], posicion)
+
+    def codigos(self, indice_columna: int) -> array:
+        """
+        Retorna la columna de codigos de un atributo de texto, sin decodificar.
+
+        Args:
+            indice_columna (int): Índice de la columna de texto (0 a 3).
+
+        Returns:
+            array: Codigos enteros de la columna, uno por personaje.
+        """
+        return self.columnas[indice_columna]
+
+    def codigos_coincidentes(self, indice_columna: int, predicado) -> set:
+        """
+        Evalua un predicado sobre los valores distintos de una columna de texto.
+        Permite filtrar por raza o genero comparando cada cadena distinta una sola vez.
+
+        Args:
+            indice_columna (int): Índice de la columna de texto (0 a 3).
+            predicado (callable): Funcion que recibe una cadena y retorna bool.
+
+        Returns:
+            set: Codigos de los valores que cumplen el predicado.
+        """
+        coincidentes = set()
+        for codigo, valor in enumerate(self.diccionarios[indice_columna].valores):
+            if predicado(valor):
+                coincidentes.add(codigo)
+        return coincidentes
+
+    def obtener_indice_invertido(self, indice_columna: int) -> dict:
+        """
+        Retorna el indice invertido de una columna de texto, construyendolo si hace falta.
+
+        Args:
+            indice_columna (int): Índice de la columna de texto (2 = raza, 3 = genero).
+
+        Returns:
+            dict: Diccionario {codigo: lista de posiciones en orden ascendente}.
+        """
+        indice_invertido = self.indices_invertidos.get(indice_columna)
+        if indice_invertido is None:
+            indice_invertido = {}
+            for posicion, codigo in enumerate(self.columnas[indice_columna]):
+                if codigo in indice_invertido:
+                    indice_invertido[codigo].append(posicion)
+                else:
+                    indice_invertido[codigo] = [posicion]
+            self.indices_invertidos[indice_columna] = indice_invertido
+        return indice_invertido
+
+    def posiciones_coincidentes(self, indice_columna: int, predicado) -> list:
+        """
+        Retorna las posiciones de los personajes cuyo valor en la columna cumple el predicado,
+        usando el indice invertido: solo se recorren las filas que coinciden.
+
+        Args:
+            indice_columna (int): Índice de la columna de texto (2 = raza, 3 = genero).
+            predicado (callable): Funcion que recibe una cadena y retorna bool.
+
+        Returns:
+            list: Posiciones en orden ascendente.
+        """
+        indice_invertido = self.obtener_indice_invertido(indice_columna)
+        listas = []
+        for codigo in self.codigos_coincidentes(indice_columna, predicado):
+            if codigo in indice_invertido:
+                listas.append(indice_invertido[codigo])
+        if len(listas) == 1:
+            return listas[0][:]
+        return list(heapq.merge(*listas))
+
+    def contar_coincidentes(self, indice_columna: int, predicado) -> int:
+        """
+        Cuenta los personajes cuyo valor en la columna cumple el predicado, sin recorrer filas.
+
+        Args:
+            indice_columna (int): Índice de la columna de texto (2 = raza, 3 = genero).
+            predicado (callable): Funcion que recibe una cadena y retorna bool.
+
+        Returns:
+            int: Cantidad de personajes que coinciden.
+        """
+        indice_invertido = self.obtener_indice_invertido(indice_columna)
+        cantidad = 0
+        for codigo in self.codigos_coincidentes(indice_columna, predicado):
+            cantidad += len(indice_invertido.get(codigo, ()))
+        return cantidad
+
+    def obtener_agregados(self) -> RegistroAgregados:
+        """
+        Retorna el registro de agregados de los stats, construyendolo si hace falta.
+
+        Returns:
+            RegistroAgregados: Registro actualizado con todas las filas del almacen.
+        """
+        if self.agregados is None:
+            agregados = RegistroAgregados()
+            for posicion, personaje_codificado in enumerate(zip(*self.columnas)):
+                agregados.actualizar(personaje_codificado, posicion)
+            self.agregados = agregados
+        return self.agregados
+
+    def agregado(self, indice_stat: int, indice_columna=None, predicado=None):
+        """
+        Retorna cantidad, suma, minimo, maximo y posiciones del maximo de un stat, sin
+        recorrer filas. Con indice_columna y predicado se limita a los personajes
+        cuyo valor de raza o genero cumple el predicado.
+
+        Args:
+            indice_stat (int): Índice del stat (4 = poder, 5 = inteligencia, 6 = velocidad).
+            indice_columna (int, opcional): 2 = raza, 3 = genero. None para todos.
+            predicado (callable, opcional): Funcion que recibe una cadena y retorna bool.
+
+        Returns:
+            Agregado: Agregado resultante. No debe modificarse.
+        """
+        agregados = self.obtener_agregados()
+        if indice_columna is None:
+            return agregados.consultar(indice_stat)
+        codigos = self.codigos_coincidentes(indice_columna, predicado)
+        return agregados.consultar(indice_stat, indice_columna, codigos)
+
+    def columna(self, indice_columna: int):
+        """
+        Retorna los valores de una columna.
+
+        Args:
+            indice_columna (int): Índice de la columna (0=nombre, 1=alias, 2=raza,
+                                3=genero, 4=poder, 5=inteligencia, 6=velocidad).
+
+        Returns:
+            list | array: Lista de cadenas decodificadas para columnas de texto, o el
+                array('i') de la columna para columnas numericas (un memoryview de
+                enteros si el almacen se abrio desde un snapshot).
+        """
+        if indice_columna in COLUMNAS_TEXTO:
+            valores = self.diccionarios[indice_columna].valores
+            return [valores[codigo] for codigo in self.columnas[indice_columna]]
+        return self.columnas[indice_columna]
+
+    def copiar(self) -> "AlmacenPersonajes":
+        """
+        Retorna una copia independiente del almacen.
+
+        Returns:
+            AlmacenPersonajes: Copia con sus propias columnas y diccionarios.
+        """
+        copia = AlmacenPersonajes()
+        copia.diccionarios = [diccionario.copiar() for diccionario in self.diccionarios]
+        copia.columnas = [array('i', columna) for columna in self.columnas]
+        copia.indices_invertidos = {}
+        for indice_columna, indice_invertido in self.indices_invertidos.items():
+            copia.indices_invertidos[indice_columna] = {
+                codigo: posiciones[:] for codigo, posiciones in indice_invertido.items()
+            }
+        if self.agregados is not None:
+            copia.agregados = self.agregados.copiar()
+        return copia
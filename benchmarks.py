@@ -0,0 +1,925 @@
+"""
+Benchmarks de las operaciones del programa sobre rosters sinteticos.
+
+Uso:
+    python benchmarks.py
+    python benchmarks.py --suite [--tamanos 1000 10000] [--umbral 1.25]
+
+La suite (--suite) mide todas las funciones de operaciones_datos, operaciones_estadisticas
+y operaciones_ordenamiento en varios tamaños, agrega la corrida a benchmarks_historial.jsonl
+y termina con codigo 1 si alguna funcion es mas lenta que la mediana de las ultimas corridas.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import consultas
+import estadisticas_vectorizadas
+import instrumentacion
+import operaciones_datos
+import operaciones_estadisticas
+import operaciones_ordenamiento
+import ordenamiento_externo
+from almacen_concurrente import AlmacenConcurrente
+from almacen_personajes import AlmacenPersonajes
+from personaje import Personaje
+
+RAZAS_SINTETICAS = ["Human", "Saiyan", "Kryptonian", "Android", "Half Saiyan", "Mutant", "Alien"]
+GENEROS_SINTETICOS = ["Masculino", "Femenino", "No-Binario"]
+
+
+def crear_selector(generador: random.Random, opciones, por_defecto: list):
+    """
+    Retorna una funcion sin argumentos que elige un valor al azar segun una distribucion.
+
+    Args:
+        generador (random.Random): Generador aleatorio a usar.
+        opciones (list | dict | None): Lista de valores equiprobables, diccionario
+                                    {valor: peso} o None para usar por_defecto.
+        por_defecto (list): Valores equiprobables si no se indican opciones.
+
+    Returns:
+        callable: Funcion que retorna un valor elegido.
+    """
+    if opciones is None:
+        opciones = por_defecto
+    if isinstance(opciones, dict):
+        valores, pesos = list(opciones), list(opciones.values())
+        return lambda: generador.choices(valores, pesos)[0]
+    valores = list(opciones)
+    return lambda: generador.choice(valores)
+
+
+def generar_personajes(cantidad: int, semilla: int = 42, razas=None, generos=None,
+                    rango_stats: tuple = (0, 1000)) -> list:
+    """
+    Genera una matriz de personajes sinteticos con la misma estructura que crear_matriz.
+
+    Args:
+        cantidad (int): Cantidad de personajes a generar.
+        semilla (int, opcional): Semilla del generador aleatorio, para resultados reproducibles.
+        razas (list | dict, opcional): Razas posibles, o {raza: peso} para una distribucion
+                                    no uniforme (ej: {"Human": 8, "Saiyan": 1}). None usa
+                                    RAZAS_SINTETICAS con igual probabilidad.
+        generos (list | dict, opcional): Igual que razas, para los generos.
+        rango_stats (tuple, opcional): (minimo, maximo) de poder, inteligencia y velocidad.
+
+    Returns:
+        list: Matriz de Personaje (nombre, alias, raza, genero, poder, inteligencia, velocidad).
+    """
+    generador = random.Random(semilla)
+    elegir_raza = crear_selector(generador, razas, RAZAS_SINTETICAS)
+    elegir_genero = crear_selector(generador, generos, GENEROS_SINTETICOS)
+    minimo, maximo = rango_stats
+    matriz = []
+    for i in range(cantidad):
+        matriz.append(Personaje(
+            f"Personaje {i}",
+            f"Alias {i}",
+            elegir_raza(),
+            elegir_genero(),
+            generador.randint(minimo, maximo),
+            generador.randint(minimo, maximo),
+            generador.randint(minimo, maximo),
+        ))
+    return matriz
+
+
+def generar_almacen(cantidad: int, semilla: int = 42) -> AlmacenPersonajes:
+    """
+    Genera los mismos personajes que generar_personajes, cargados en un AlmacenPersonajes.
+
+    Args:
+        cantidad (int): Cantidad de personajes a generar.
+        semilla (int, opcional): Semilla del generador aleatorio.
+
+    Returns:
+        AlmacenPersonajes: Almacen columnar con los personajes generados.
+    """
+    almacen = AlmacenPersonajes()
+    almacen.agregar_varios(generar_personajes(cantidad, semilla))
+    return almacen
+
+
+def medir(funcion, *args, **kwargs) -> float:
+    """
+    Mide el tiempo de pared de una llamada.
+
+    Args:
+        funcion (callable): Funcion a medir.
+        *args, **kwargs: Argumentos que se pasan a la funcion.
+
+    Returns:
+        float: Segundos transcurridos.
+    """
+    inicio = time.perf_counter()
+    funcion(*args, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def comparar_ordenamiento(tamanos: tuple = (10**3, 10**5, 10**6), max_filas_seleccion: int = 10**4) -> None:
+    """
+    Compara ordenar_por_stat con el motor por defecto contra el Selection Sort original.
+    Para tamaños mayores a max_filas_seleccion el Selection Sort no se ejecuta (tardaria
+    horas) y se muestra una estimacion cuadratica a partir de la ultima medicion.
+
+    Args:
+        tamanos (tuple, opcional): Cantidades de personajes a probar.
+        max_filas_seleccion (int, opcional): Tamaño maximo en el que se ejecuta el Selection Sort.
+
+    Returns:
+        None
+    """
+    print(f"{'Filas':>10} {'timsort (s)':>14} {'seleccion (s)':>16}")
+    referencia = None
+    for cantidad in tamanos:
+        matriz = generar_personajes(cantidad)
+        tiempo_timsort = medir(operaciones_ordenamiento.ordenar_por_stat, matriz, 4,
+                            descendente=True, excluir_raza="Human")
+        if cantidad <= max_filas_seleccion:
+            tiempo_seleccion = medir(operaciones_ordenamiento.ordenar_por_stat, matriz, 4,
+                                    descendente=True, excluir_raza="Human", motor="seleccion")
+            referencia = (cantidad, tiempo_seleccion)
+            texto_seleccion = f"{tiempo_seleccion:.4f}"
+        elif referencia is not None:
+            estimado = referencia[1] * (cantidad / referencia[0]) ** 2
+            texto_seleccion = f"~{estimado:.0f} (estimado)"
+        else:
+            texto_seleccion = "omitido"
+        print(f"{cantidad:>10} {tiempo_timsort:>14.4f} {texto_seleccion:>16}")
+
+
+FUNCIONES_ESTADISTICAS = {
+    "calcular_promedio": lambda matriz: operaciones_estadisticas.calcular_promedio(matriz, 4, "Saiyan"),
+    "filtrar_menos_velocidad": operaciones_estadisticas.filtrar_menos_velocidad,
+    "filtrar_debiles": operaciones_estadisticas.filtrar_debiles,
+    "calcular_promedio_android": operaciones_estadisticas.calcular_promedio_android,
+    "filtrar_kryptonian_poder": operaciones_estadisticas.filtrar_kryptonian_poder,
+    "filtrar_saiyan_poder": operaciones_estadisticas.filtrar_saiyan_poder,
+    "filtrar_no_binario_veloces": operaciones_estadisticas.filtrar_no_binario_veloces,
+}
+
+
+def normalizar_resultado(resultado):
+    """
+    Convierte filas y tuplas a listas para poder comparar resultados de distintos backends.
+
+    Args:
+        resultado: Valor retornado por una funcion de operaciones_estadisticas.
+
+    Returns:
+        El mismo resultado con todas las filas y tuplas convertidas a listas.
+    """
+    if isinstance(resultado, (list, tuple)):
+        return [normalizar_resultado(valor) if isinstance(valor, (list, tuple)) else valor
+                for valor in resultado]
+    return resultado
+
+
+def verificar_paridad_estadisticas(cantidad: int = 10**4, semilla: int = 42) -> bool:
+    """
+    Verifica que el backend vectorizado retorne los mismos resultados que el de Python puro,
+    tanto sobre una matriz de listas como sobre un AlmacenPersonajes.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        semilla (int, opcional): Semilla del generador aleatorio.
+
+    Returns:
+        bool: True si todos los resultados coinciden. False si NumPy no esta instalado
+            o si alguna funcion difiere (se informa cual).
+    """
+    if not operaciones_estadisticas.configurar_backend(True):
+        print("NumPy no esta instalado: no hay backend vectorizado para comparar.")
+        return False
+
+    coinciden = True
+    for matriz in (generar_personajes(cantidad, semilla), generar_almacen(cantidad, semilla)):
+        for nombre, funcion in FUNCIONES_ESTADISTICAS.items():
+            operaciones_estadisticas.configurar_backend(False)
+            esperado = normalizar_resultado(funcion(matriz))
+            operaciones_estadisticas.configurar_backend(True)
+            obtenido = normalizar_resultado(funcion(matriz))
+            if esperado != obtenido:
+                print(f"Diferencia en {nombre} ({type(matriz).__name__})")
+                coinciden = False
+    return coinciden
+
+
+def comparar_backends_estadisticas(cantidad: int = 10**6) -> None:
+    """
+    Mide cada funcion de operaciones_estadisticas con el backend de Python puro y con el
+    vectorizado, sobre un AlmacenPersonajes sintetico.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+
+    Returns:
+        None
+    """
+    almacen = generar_almacen(cantidad)
+    print(f"{'Funcion':<28} {'python (s)':>12} {'numpy (s)':>12}")
+    for nombre, funcion in FUNCIONES_ESTADISTICAS.items():
+        operaciones_estadisticas.configurar_backend(False)
+        tiempo_python = medir(funcion, almacen)
+        if operaciones_estadisticas.configurar_backend(True):
+            texto_numpy = f"{medir(funcion, almacen):.4f}"
+        else:
+            texto_numpy = "sin numpy"
+        print(f"{nombre:<28} {tiempo_python:>12.4f} {texto_numpy:>12}")
+
+
+class MatrizContada(list):
+    """
+    Matriz de listas que cuenta cuantas veces se la recorre completa.
+    """
+
+    def __init__(self, filas) -> None:
+        super().__init__(filas)
+        self.pasadas = 0
+
+    def __iter__(self):
+        self.pasadas += 1
+        return super().__iter__()
+
+
+def contar_pasadas_estadisticas(cantidad: int = 10**4) -> dict:
+    """
+    Cuenta cuantas pasadas completas por la matriz hace cada funcion de
+    operaciones_estadisticas (backend de Python puro, matriz de listas).
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+
+    Returns:
+        dict: Diccionario {nombre de funcion: cantidad de pasadas}.
+    """
+    backend_anterior = operaciones_estadisticas.BACKEND_VECTORIZADO
+    operaciones_estadisticas.configurar_backend(False)
+    pasadas = {}
+    for nombre, funcion in FUNCIONES_ESTADISTICAS.items():
+        matriz = MatrizContada(generar_personajes(cantidad))
+        funcion(matriz)
+        pasadas[nombre] = matriz.pasadas
+        print(f"{nombre:<28} {matriz.pasadas:>3} pasada(s)")
+    operaciones_estadisticas.configurar_backend(backend_anterior)
+    return pasadas
+
+
+def verificar_consultas_menu(cantidad: int = 10**4, semilla: int = 42) -> bool:
+    """
+    Verifica que las consultas de consultas.CONSULTAS_MENU den el mismo resultado que las
+    funciones que usa el menu (conteos, top-k y ordenamientos tienen su propia
+    implementacion), tanto sobre una matriz de listas como sobre un AlmacenPersonajes.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        semilla (int, opcional): Semilla del generador aleatorio.
+
+    Returns:
+        bool: True si todos los resultados coinciden (si no, se informa cual difiere).
+    """
+    esperados = {
+        3: lambda matriz: len(matriz),
+        4: lambda matriz: sum(1 for personaje in matriz if operaciones_datos.coincide_raza(personaje[2], "Human")),
+        5: lambda matriz: sum(1 for personaje in matriz if not operaciones_datos.coincide_raza(personaje[2], "Human")),
+        6: lambda matriz: list(matriz),
+        7: lambda matriz: [personaje for personaje in matriz if operaciones_datos.coincide_raza(personaje[2], "Saiyan")],
+        8: operaciones_datos.encontrar_personajes_mas_poderosos,
+        9: operaciones_datos.encontrar_personajes_mas_inteligente,
+        16: lambda matriz: operaciones_ordenamiento.ordenar_por_stat(matriz, 5, descendente=True),
+        17: lambda matriz: operaciones_ordenamiento.ordenar_por_stat(matriz, 5, descendente=False, excluir_raza="Human"),
+        18: lambda matriz: operaciones_ordenamiento.ordenar_por_stat(matriz, 4, descendente=True, excluir_raza="Human"),
+        19: lambda matriz: operaciones_ordenamiento.ordenar_por_stat(matriz, 6, descendente=True),
+        20: operaciones_ordenamiento.ordenar_personalizado,
+    }
+    coinciden = True
+    for matriz in (generar_personajes(cantidad, semilla), generar_almacen(cantidad, semilla)):
+        for opcion, funcion in esperados.items():
+            resultado = consultas.ejecutar_consulta(consultas.CONSULTAS_MENU[opcion], matriz)
+            obtenido = resultado.cantidad if resultado.filas is None else resultado.filas
+            if normalizar_resultado(obtenido) != normalizar_resultado(funcion(matriz)):
+                print(f"Diferencia en la opcion {opcion} ({type(matriz).__name__})")
+                coinciden = False
+    return coinciden
+
+
+def verificar_paridad_paralela(cantidad: int = 10**4, semilla: int = 42, procesos: int = 2) -> bool:
+    """
+    Verifica que el calculo en paralelo por particiones retorne los mismos resultados que
+    el calculo en serie, incluidos el orden de las filas y los empates en el maximo.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        semilla (int, opcional): Semilla del generador aleatorio.
+        procesos (int, opcional): Cantidad de procesos del pool.
+
+    Returns:
+        bool: True si todos los resultados coinciden (si no, se informa cual difiere).
+    """
+    funciones = dict(FUNCIONES_ESTADISTICAS)
+    funciones["encontrar_personajes_mas_poderosos"] = operaciones_datos.encontrar_personajes_mas_poderosos
+    funciones["encontrar_personajes_mas_inteligente"] = operaciones_datos.encontrar_personajes_mas_inteligente
+
+    backend_anterior = operaciones_estadisticas.BACKEND_VECTORIZADO
+    operaciones_estadisticas.configurar_backend(False)
+    almacen = generar_almacen(cantidad, semilla)
+    esperados = {nombre: normalizar_resultado(funcion(almacen)) for nombre, funcion in funciones.items()}
+    coinciden = True
+    try:
+        operaciones_estadisticas.configurar_paralelismo(procesos)
+        for nombre, funcion in funciones.items():
+            if normalizar_resultado(funcion(almacen)) != esperados[nombre]:
+                print(f"Diferencia en {nombre}")
+                coinciden = False
+    finally:
+        operaciones_estadisticas.configurar_paralelismo(None)
+        operaciones_estadisticas.configurar_backend(backend_anterior)
+    return coinciden
+
+
+def comparar_paralelismo(cantidad: int = 10**6, procesos=(1, 2, 4)) -> None:
+    """
+    Mide cada funcion de operaciones_estadisticas en serie (Python puro) y en paralelo con
+    distintas cantidades de procesos, sobre un AlmacenPersonajes sintetico. La primera
+    llamada en paralelo copia las columnas a memoria compartida y no se mide.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        procesos (tuple, opcional): Cantidades de procesos a medir.
+
+    Returns:
+        None
+    """
+    backend_anterior = operaciones_estadisticas.BACKEND_VECTORIZADO
+    operaciones_estadisticas.configurar_backend(False)
+    almacen = generar_almacen(cantidad)
+    tiempos = {nombre: [medir(funcion, almacen)] for nombre, funcion in FUNCIONES_ESTADISTICAS.items()}
+    for cantidad_procesos in procesos:
+        operaciones_estadisticas.configurar_paralelismo(cantidad_procesos)
+        operaciones_estadisticas.calcular_promedio(almacen, 4)
+        for nombre, funcion in FUNCIONES_ESTADISTICAS.items():
+            tiempos[nombre].append(medir(funcion, almacen))
+    operaciones_estadisticas.configurar_paralelismo(None)
+    operaciones_estadisticas.configurar_backend(backend_anterior)
+
+    cabecera = "".join(f"{f'{cantidad_procesos} proc (s)':>14}" for cantidad_procesos in procesos)
+    print(f"{'Funcion':<28} {'serie (s)':>12}{cabecera}")
+    for nombre, valores in tiempos.items():
+        print(f"{nombre:<28} {valores[0]:>12.4f}" + "".join(f"{valor:>14.4f}" for valor in valores[1:]))
+
+
+def verificar_orden_externo(cantidad: int = 10**4, semilla: int = 42, procesos: int = 2) -> bool:
+    """
+    Verifica que el ordenamiento externo (tramos chicos, varios procesos y varias pasadas
+    de combinacion) de el mismo orden que operaciones_ordenamiento.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        semilla (int, opcional): Semilla del generador aleatorio.
+        procesos (int, opcional): Cantidad de procesos del pool.
+
+    Returns:
+        bool: True si todos los ordenamientos coinciden (si no, se informa cual difiere).
+    """
+    matriz = generar_personajes(cantidad, semilla)
+    opciones = {"filas_por_tramo": max(1, cantidad // 100), "procesos": procesos}
+    casos = {
+        "por_stat_descendente": (
+            operaciones_ordenamiento.ordenar_por_stat(matriz, 5, descendente=True),
+            ordenamiento_externo.ordenar_externo_por_stat(matriz, 5, True, **opciones)),
+        "por_stat_ascendente_sin_human": (
+            operaciones_ordenamiento.ordenar_por_stat(matriz, 5, descendente=False, excluir_raza="Human"),
+            ordenamiento_externo.ordenar_externo_por_stat(matriz, 5, False, "Human", **opciones)),
+        "personalizado": (
+            operaciones_ordenamiento.ordenar_personalizado(matriz),
+            ordenamiento_externo.ordenar_externo_personalizado(matriz, **opciones)),
+    }
+    coinciden = True
+    for nombre, (esperado, obtenido) in casos.items():
+        if normalizar_resultado(esperado) != normalizar_resultado(list(obtenido)):
+            print(f"Diferencia en {nombre}")
+            coinciden = False
+    return coinciden
+
+
+def comparar_orden_externo(cantidad: int = 10**6, procesos=(1, 2, 4), filas_por_tramo: int = 10**5) -> None:
+    """
+    Mide el ordenamiento externo por poder con distintas cantidades de procesos, contra
+    operaciones_ordenamiento.ordenar_por_stat en memoria.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        procesos (tuple, opcional): Cantidades de procesos a medir.
+        filas_por_tramo (int, opcional): Personajes por tramo ordenado.
+
+    Returns:
+        None
+    """
+    matriz = generar_personajes(cantidad)
+    print(f"{'en memoria':<16} {medir(operaciones_ordenamiento.ordenar_por_stat, matriz, 4):>10.4f} s")
+    for cantidad_procesos in procesos:
+        tiempo = medir(lambda: sum(1 for _ in ordenamiento_externo.ordenar_externo_por_stat(
+            matriz, 4, filas_por_tramo=filas_por_tramo, procesos=cantidad_procesos)))
+        print(f"{f'{cantidad_procesos} proceso(s)':<16} {tiempo:>10.4f} s")
+
+
+def medir_sobrecarga_instrumentacion(cantidad: int = 2000, repeticiones: int = 5) -> dict:
+    """
+    Mide el ordenamiento por seleccion (un intercambiar_posicion por fila) con la
+    instrumentacion desactivada y activada, y muestra los contadores registrados.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        repeticiones (int, opcional): Repeticiones de cada medicion (se toma la mediana).
+
+    Returns:
+        dict: Segundos con la instrumentacion "desactivada" y "activada".
+    """
+    matriz = generar_personajes(cantidad)
+    tiempos = {}
+    for estado, activa in (("desactivada", False), ("activada", True)):
+        instrumentacion.configurar(activa)
+        instrumentacion.reiniciar()
+        muestras = []
+        for _ in range(repeticiones):
+            with instrumentacion.medir_operacion("seleccion"):
+                muestras.append(medir(operaciones_ordenamiento.ordenar_por_stat, matriz, 4, motor="seleccion"))
+        tiempos[estado] = statistics.median(muestras)
+        print(f"{estado:<12} {tiempos[estado]:.4f} s")
+    print(instrumentacion.exportar_json())
+    instrumentacion.configurar(False)
+    instrumentacion.reiniciar()
+    return tiempos
+
+
+def verificar_instantaneas(cantidad: int = 10**4, semilla: int = 42, tamano_lote: int = 97) -> bool:
+    """
+    Agrega personajes a un AlmacenConcurrente de a uno y en lotes, guarda instantaneas
+    intermedias y verifica que cada una de los mismos resultados que un AlmacenPersonajes
+    con las mismas filas, aunque despues se hayan agregado mas personajes.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+        semilla (int, opcional): Semilla del generador aleatorio.
+        tamano_lote (int, opcional): Personajes agregados entre instantaneas.
+
+    Returns:
+        bool: True si todos los resultados coinciden (si no, se informa cual difiere).
+    """
+    funciones = dict(FUNCIONES_ESTADISTICAS)
+    funciones["encontrar_personajes_mas_poderosos"] = operaciones_datos.encontrar_personajes_mas_poderosos
+    funciones["contar_personajes_raza"] = lambda matriz: operaciones_datos.contar_personajes_raza(matriz, "Human")
+    funciones["ordenar_por_stat"] = lambda matriz: operaciones_ordenamiento.ordenar_por_stat(matriz, 5, False, "Human")
+    funciones["ordenar_personalizado"] = operaciones_ordenamiento.ordenar_personalizado
+    funciones["filas"] = list
+
+    # Los stats se recortan para que muchas altas empaten el maximo: los agregados
+    # derivados comparten la lista de posiciones del maximo con las versiones anteriores
+    personajes = [personaje[:4] + tuple(min(valor, 990) for valor in personaje[4:])
+                for personaje in generar_personajes(cantidad, semilla)]
+    almacen = AlmacenConcurrente(personajes[:tamano_lote])
+    instantaneas = [almacen.instantanea()]
+    while len(almacen) < cantidad:
+        lote = personajes[len(almacen):len(almacen) + tamano_lote]
+        if len(instantaneas) % 2:
+            almacen.agregar_varios(lote)
+        else:
+            for personaje in lote:
+                operaciones_datos.agregar_personaje(almacen, personaje)
+        instantaneas.append(almacen.instantanea())
+
+    coinciden = True
+    for instantanea in instantaneas[::max(1, len(instantaneas) // 8)] + instantaneas[-1:]:
+        referencia = AlmacenPersonajes()
+        referencia.agregar_varios(personajes[:len(instantanea)])
+        for nombre, funcion in funciones.items():
+            if normalizar_resultado(funcion(instantanea)) != normalizar_resultado(funcion(referencia)):
+                print(f"Diferencia en {nombre} (instantanea de {len(instantanea)} personajes)")
+                coinciden = False
+    return coinciden
+
+
+def medir_lectores_concurrentes(cantidad: int = 10**5, hilos=(1, 2, 4, 8), segundos: float = 1.0) -> dict:
+    """
+    Mide cuantas lecturas por segundo completan varios hilos lectores sobre instantaneas
+    de un AlmacenConcurrente mientras otro hilo agrega personajes sin pausa. Cada lectura
+    toma una instantanea, calcula un promedio y un conteo por raza, y verifica que la
+    instantanea sea consistente (agregados e indices con la misma cantidad de filas).
+
+    Args:
+        cantidad (int, opcional): Personajes iniciales.
+        hilos (tuple, opcional): Cantidades de hilos lectores a medir.
+        segundos (float, opcional): Duracion de cada medicion.
+
+    Returns:
+        dict: {hilos: (lecturas por segundo, altas por segundo, lecturas inconsistentes)}.
+    """
+    personajes = generar_personajes(2 * cantidad)
+    resultados = {}
+    for cantidad_hilos in hilos:
+        almacen = AlmacenConcurrente(personajes[:cantidad])
+        detener = threading.Event()
+        lecturas = [0] * cantidad_hilos
+        inconsistentes = [0] * cantidad_hilos
+
+        def escribir() -> None:
+            for personaje in itertools.cycle(personajes[cantidad:]):
+                if detener.is_set():
+                    return
+                almacen.agregar(personaje)
+
+        def leer(numero: int) -> None:
+            while not detener.is_set():
+                instantanea = almacen.instantanea()
+                operaciones_estadisticas.calcular_promedio(instantanea, 4, "Saiyan")
+                humanos = operaciones_datos.contar_personajes_raza(instantanea, "Human")
+                filas = len(instantanea)
+                if (instantanea.agregado(4).cantidad != filas or humanos > filas
+                        or instantanea.contar_coincidentes(3, lambda genero: True) != filas):
+                    inconsistentes[numero] += 1
+                lecturas[numero] += 1
+
+        hilos_activos = [threading.Thread(target=escribir)]
+        hilos_activos += [threading.Thread(target=leer, args=(numero,)) for numero in range(cantidad_hilos)]
+        filas_iniciales = len(almacen)
+        inicio = time.perf_counter()
+        for hilo in hilos_activos:
+            hilo.start()
+        time.sleep(segundos)
+        detener.set()
+        for hilo in hilos_activos:
+            hilo.join()
+        transcurrido = time.perf_counter() - inicio
+
+        resultados[cantidad_hilos] = (sum(lecturas) / transcurrido, (len(almacen) - filas_iniciales) / transcurrido,
+                                    sum(inconsistentes))
+        print(f"{cantidad_hilos} lector(es): {resultados[cantidad_hilos][0]:>10.0f} lecturas/s "
+            f"{resultados[cantidad_hilos][1]:>10.0f} altas/s {sum(inconsistentes)} inconsistentes")
+    return resultados
+
+
+def medir_memoria_filas(cantidad: int = 10**5) -> dict:
+    """
+    Mide con tracemalloc los bytes por fila de una matriz de listas, de una matriz de
+    Personaje y de un AlmacenPersonajes con los mismos datos. Las cadenas y los enteros
+    se crean antes de medir, por lo que solo se cuenta lo que agrega cada representacion.
+
+    Args:
+        cantidad (int, opcional): Cantidad de personajes sinteticos.
+
+    Returns:
+        dict: Bytes por fila de cada representacion ("list", "Personaje", "AlmacenPersonajes").
+    """
+    import tracemalloc
+    datos = [tuple(personaje) for personaje in generar_personajes(cantidad)]
+    representaciones = {
+        "list": lambda: [list(personaje) for personaje in datos],
+        "Personaje": lambda: operaciones_datos.agregar_personajes([], datos),
+        "AlmacenPersonajes": lambda: operaciones_datos.agregar_personajes(AlmacenPersonajes(), datos),
+    }
+    resultados = {}
+    for nombre, construir in representaciones.items():
+        tracemalloc.start()
+        matriz = construir()
+        resultados[nombre] = tracemalloc.get_traced_memory()[0] / cantidad
+        tracemalloc.stop()
+        del matriz
+        print(f"{nombre:<18} {resultados[nombre]:>8.1f} bytes por fila")
+    return resultados
+
+
+HISTORIAL_BENCHMARKS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks_historial.jsonl")
+TAMANOS_SUITE = (10**3, 10**4, 10**5)
+MAX_FILAS_CUADRATICAS = 10**4  # Los casos O(n²) no se ejecutan con mas filas
+UMBRAL_REGRESION = 1.25  # Un caso es una regresion si tarda 25% mas que la referencia...
+PISO_REGRESION = 0.001  # ...y al menos 1 ms mas (debajo de eso es ruido de medicion)
+VENTANA_REFERENCIA = 5  # Corridas anteriores cuya mediana es la referencia
+
+# Casos de la suite: nombre -> (preparar, ejecutar, es_cuadratico). preparar recibe los
+# datos de un tamaño (ver preparar_datos_suite) y retorna los argumentos de ejecutar; solo
+# se mide ejecutar. Cubre todas las funciones de operaciones_datos, operaciones_estadisticas
+# y operaciones_ordenamiento salvo las que piden datos por teclado o configuran el modulo.
+CASOS_SUITE = {
+    "operaciones_datos.crear_matriz": (lambda datos: datos["columnas"], operaciones_datos.crear_matriz, False),
+    "operaciones_datos.crear_almacen": (lambda datos: datos["columnas"], operaciones_datos.crear_almacen, False),
+    "operaciones_datos.coincide_raza": (
+        lambda datos: (datos["columnas"][2],),
+        lambda razas: sum(operaciones_datos.coincide_raza(raza, "Human") for raza in razas), False),
+    "operaciones_datos.filtrar_personajes_raza": (
+        lambda datos: (datos["matriz"], "Saiyan"), operaciones_datos.filtrar_personajes_raza, False),
+    "operaciones_datos.contar_personajes_raza": (
+        lambda datos: (datos["matriz"], "Human"), operaciones_datos.contar_personajes_raza, False),
+    "operaciones_datos.encontrar_personajes_maximo": (
+        lambda datos: (datos["matriz"], 6), operaciones_datos.encontrar_personajes_maximo, False),
+    "operaciones_datos.encontrar_personajes_mas_poderosos": (
+        lambda datos: (datos["matriz"],), operaciones_datos.encontrar_personajes_mas_poderosos, False),
+    "operaciones_datos.encontrar_personajes_mas_inteligente": (
+        lambda datos: (datos["matriz"],), operaciones_datos.encontrar_personajes_mas_inteligente, False),
+    "operaciones_datos.agregar_personaje": (
+        lambda datos: ([], datos["matriz"]),
+        lambda matriz, nuevos: [operaciones_datos.agregar_personaje(matriz, nuevo) for nuevo in nuevos], False),
+    "operaciones_datos.agregar_personajes": (
+        lambda datos: ([], datos["matriz"]), operaciones_datos.agregar_personajes, False),
+    "operaciones_estadisticas.calcular_agregados": (
+        lambda datos: (datos["matriz"], [4, 5, 6], "Saiyan"), operaciones_estadisticas.calcular_agregados, False),
+    "operaciones_estadisticas.calcular_promedio": (
+        lambda datos: (datos["matriz"], 4, "Saiyan"), operaciones_estadisticas.calcular_promedio, False),
+    "operaciones_estadisticas.filtrar_menos_velocidad": (
+        lambda datos: (datos["matriz"],), operaciones_estadisticas.filtrar_menos_velocidad, False),
+    "operaciones_estadisticas.filtrar_debiles": (
+        lambda datos: (datos["matriz"],), operaciones_estadisticas.filtrar_debiles, False),
+    "operaciones_estadisticas.calcular_promedio_android": (
+        lambda datos: (datos["matriz"],), operaciones_estadisticas.calcular_promedio_android, False),
+    "operaciones_estadisticas.filtrar_kryptonian_poder": (
+        lambda datos: (datos["matriz"],), operaciones_estadisticas.filtrar_kryptonian_poder, False),
+    "operaciones_estadisticas.filtrar_saiyan_poder": (
+        lambda datos: (datos["matriz"],), operaciones_estadisticas.filtrar_saiyan_poder, False),
+    "operaciones_estadisticas.filtrar_no_binario_veloces": (
+        lambda datos: (datos["matriz"],), operaciones_estadisticas.filtrar_no_binario_veloces, False),
+    "operaciones_ordenamiento.intercambiar_posicion": (
+        lambda datos: (list(datos["matriz"]),),
+        lambda matriz: [operaciones_ordenamiento.intercambiar_posicion(matriz, i, -1 - i) for i in range(len(matriz))], False),
+    "operaciones_ordenamiento.obtener_columna": (
+        lambda datos: (datos["matriz"], 4), operaciones_ordenamiento.obtener_columna, False),
+    "operaciones_ordenamiento.trasponer_matriz": (
+        lambda datos: (datos["matriz"],), lambda matriz: [list(columna) for columna in operaciones_ordenamiento.trasponer_matriz(matriz)], False),
+    "operaciones_ordenamiento.obtener_razas_unicas": (
+        lambda datos: (datos["matriz"],), operaciones_ordenamiento.obtener_razas_unicas, False),
+    "operaciones_ordenamiento.agrupar_por_columna": (
+        lambda datos: (datos["matriz"], 2), operaciones_ordenamiento.agrupar_por_columna, False),
+    "operaciones_ordenamiento.filtrar_por_raza_exacta": (
+        lambda datos: (datos["matriz"], "Human"), operaciones_ordenamiento.filtrar_por_raza_exacta, False),
+    "operaciones_ordenamiento.ordenar_por_mas_poder": (
+        lambda datos: (datos["matriz"],), operaciones_ordenamiento.ordenar_por_mas_poder, False),
+    "operaciones_ordenamiento.agregar_grupo_a_matriz": (
+        lambda datos: ([], datos["matriz"]), operaciones_ordenamiento.agregar_grupo_a_matriz, False),
+    "operaciones_ordenamiento.ordenar_por_criterios": (
+        lambda datos: (datos["matriz"], [(2, False), (4, True)]), operaciones_ordenamiento.ordenar_por_criterios, False),
+    "operaciones_ordenamiento.ordenar_personalizado": (
+        lambda datos: (datos["matriz"],), operaciones_ordenamiento.ordenar_personalizado, False),
+    "operaciones_ordenamiento.encontrar_extremo": (
+        lambda datos: (datos["matriz"], 0, 4), operaciones_ordenamiento.encontrar_extremo, False),
+    "operaciones_ordenamiento.ordenar_indices_timsort": (
+        lambda datos: (datos["columnas"][4], range(len(datos["matriz"])), True), operaciones_ordenamiento.ordenar_indices_timsort, False),
+    "operaciones_ordenamiento.ordenar_indices_seleccion": (
+        lambda datos: (datos["columnas"][4], list(range(len(datos["matriz"]))), True), operaciones_ordenamiento.ordenar_indices_seleccion, True),
+    "operaciones_ordenamiento.ordenar_indices_por_stat": (
+        lambda datos: (datos["matriz"], 4, True, "Human"), operaciones_ordenamiento.ordenar_indices_por_stat, False),
+    "operaciones_ordenamiento.seleccionar_top_k": (
+        lambda datos: (datos["matriz"], 4, 10), operaciones_ordenamiento.seleccionar_top_k, False),
+    "operaciones_ordenamiento.ordenar_por_stat": (
+        lambda datos: (datos["matriz"], 4, True, "Human"), operaciones_ordenamiento.ordenar_por_stat, False),
+    "operaciones_ordenamiento.ordenar_por_stat[seleccion]": (
+        lambda datos: (datos["matriz"], 4, True, "Human", "seleccion"), operaciones_ordenamiento.ordenar_por_stat, True),
+    "operaciones_ordenamiento.ordenar_por_stat_con_limite": (
+        lambda datos: (datos["matriz"], 4, True, "Human", 10), operaciones_ordenamiento.ordenar_por_stat_con_limite, False),
+}
+
+
+def preparar_datos_suite(cantidad: int, semilla: int = 42, **distribucion) -> dict:
+    """
+    Genera los datos de un tamaño de la suite.
+
+    Args:
+        cantidad (int): Cantidad de personajes sinteticos.
+        semilla (int, opcional): Semilla del generador aleatorio.
+        **distribucion: razas, generos y rango_stats de generar_personajes.
+
+    Returns:
+        dict: "matriz" (lista de personajes) y "columnas" (una lista por atributo).
+    """
+    matriz = generar_personajes(cantidad, semilla, **distribucion)
+    return {"matriz": matriz, "columnas": [list(columna) for columna in zip(*matriz)] or [[] for _ in range(7)]}
+
+
+def ejecutar_suite(tamanos: tuple = TAMANOS_SUITE, repeticiones: int = 3, semilla: int = 42,
+                casos=None, **distribucion) -> dict:
+    """
+    Mide cada caso de CASOS_SUITE en cada tamaño, con el backend de Python puro y sin
+    paralelismo, para que los resultados sean comparables entre maquinas y corridas.
+
+    Args:
+        tamanos (tuple, opcional): Cantidades de personajes a probar.
+        repeticiones (int, opcional): Mediciones por caso; se guarda la mediana.
+        semilla (int, opcional): Semilla del generador aleatorio.
+        casos (iterable, opcional): Nombres de los casos a medir. None mide todos.
+        **distribucion: razas, generos y rango_stats de generar_personajes.
+
+    Returns:
+        dict: {"caso@tamaño": segundos}. Los casos O(n²) se omiten con mas de
+            MAX_FILAS_CUADRATICAS filas.
+    """
+    backend_anterior = operaciones_estadisticas.BACKEND_VECTORIZADO
+    operaciones_estadisticas.configurar_backend(False)
+    nombres = list(CASOS_SUITE) if casos is None else list(casos)
+    resultados = {}
+    try:
+        for cantidad in tamanos:
+            datos = preparar_datos_suite(cantidad, semilla, **distribucion)
+            for nombre in nombres:
+                preparar, ejecutar, es_cuadratico = CASOS_SUITE[nombre]
+                if es_cuadratico and cantidad > MAX_FILAS_CUADRATICAS:
+                    continue
+                muestras = [medir(ejecutar, *preparar(datos)) for _ in range(repeticiones)]
+                resultados[f"{nombre}@{cantidad}"] = statistics.median(muestras)
+                print(f"{nombre:<62} {cantidad:>8} {resultados[f'{nombre}@{cantidad}']:>10.5f} s")
+    finally:
+        operaciones_estadisticas.configurar_backend(backend_anterior)
+    return resultados
+
+
+def leer_historial(ruta: str = HISTORIAL_BENCHMARKS) -> list:
+    """
+    Lee el historial de corridas de la suite (JSON Lines, una corrida por linea).
+
+    Args:
+        ruta (str, opcional): Archivo del historial.
+
+    Returns:
+        list: Corridas en orden cronologico. Vacia si el archivo no existe.
+    """
+    if not os.path.exists(ruta):
+        return []
+    with open(ruta, encoding="utf-8") as archivo:
+        return [json.loads(linea) for linea in archivo if linea.strip()]
+
+
+def guardar_corrida(resultados: dict, ruta: str = HISTORIAL_BENCHMARKS, **datos_corrida) -> dict:
+    """
+    Agrega una corrida al historial, con la fecha, la version de Python, la plataforma y
+    el commit actual (si el programa esta en un repositorio git).
+
+    Args:
+        resultados (dict): Resultado de ejecutar_suite.
+        ruta (str, opcional): Archivo del historial.
+        **datos_corrida: Otros datos a guardar (ej: semilla, repeticiones).
+
+    Returns:
+        dict: La corrida guardada.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    corrida = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "commit": commit,
+        **datos_corrida,
+        "resultados": resultados,
+    }
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        archivo.write(json.dumps(corrida) + "\n")
+    return corrida
+
+
+def buscar_regresiones(resultados: dict, historial: list, umbral: float = UMBRAL_REGRESION,
+                    piso: float = PISO_REGRESION, ventana: int = VENTANA_REFERENCIA) -> list:
+    """
+    Compara una corrida contra la mediana de las ultimas corridas del historial.
+
+    Args:
+        resultados (dict): Resultado de ejecutar_suite.
+        historial (list): Corridas anteriores (leer_historial).
+        umbral (float, opcional): Cociente actual / referencia a partir del cual hay regresion.
+        piso (float, opcional): Diferencia minima en segundos para considerar una regresion.
+        ventana (int, opcional): Cantidad de corridas anteriores que forman la referencia.
+
+    Returns:
+        list: Tuplas (caso, segundos de referencia, segundos actuales) de las regresiones,
+            de la peor a la mejor. Los casos sin historial no se comparan.
+    """
+    regresiones = []
+    for caso, segundos in resultados.items():
+        anteriores = [corrida["resultados"][caso] for corrida in historial[-ventana:] if caso in corrida["resultados"]]
+        if not anteriores:
+            continue
+        referencia = statistics.median(anteriores)
+        if segundos > referencia * umbral and segundos - referencia > piso:
+            regresiones.append((caso, referencia, segundos))
+    regresiones.sort(key=lambda regresion: regresion[2] / regresion[1] if regresion[1] else float("inf"), reverse=True)
+    return regresiones
+
+
+def ejecutar_suite_con_control(tamanos: tuple = TAMANOS_SUITE, repeticiones: int = 3, semilla: int = 42,
+                            ruta_historial: str = HISTORIAL_BENCHMARKS, umbral: float = UMBRAL_REGRESION,
+                            guardar: bool = True) -> bool:
+    """
+    Ejecuta la suite, la compara con el historial y la agrega al historial.
+
+    Returns:
+        bool: True si no hubo regresiones (si las hubo, se informan).
+    """
+    historial = leer_historial(ruta_historial)
+    resultados = ejecutar_suite(tamanos, repeticiones, semilla)
+    regresiones = buscar_regresiones(resultados, historial, umbral)
+    if guardar:
+        guardar_corrida(resultados, ruta_historial, semilla=semilla, repeticiones=repeticiones)
+    for caso, referencia, segundos in regresiones:
+        print(f"REGRESION {caso}: {referencia:.5f} s -> {segundos:.5f} s ({segundos / referencia:.2f}x)")
+    if not historial:
+        print("Sin corridas anteriores: esta corrida queda como referencia.")
+    return not regresiones
+
+
+CODIGO_PRIMER_MENU = "import core, menu; menu.mostrar_menu_principal()"
+
+
+def desglosar_imports(codigo: str = CODIGO_PRIMER_MENU) -> list:
+    """
+    Ejecuta codigo en un proceso nuevo con python -X importtime y retorna el costo de
+    cada modulo importado.
+
+    Args:
+        codigo (str, opcional): Codigo a ejecutar. Por defecto importa core y muestra el menu.
+
+    Returns:
+        list: Tuplas (modulo, microsegundos acumulados), de la mas lenta a la mas rapida.
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                            cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    costos = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, modulo = linea[len("import time:"):].split("|")
+        costos.append((modulo.strip(), int(acumulado)))
+    costos.sort(key=lambda costo: costo[1], reverse=True)
+    return costos
+
+
+def medir_arranque(presupuesto_ms: float = 200.0, repeticiones: int = 5) -> bool:
+    """
+    Mide el tiempo hasta el primer menu (arranque del interprete, imports y dibujo del
+    menu) en procesos nuevos y lo compara con un presupuesto.
+
+    Args:
+        presupuesto_ms (float, opcional): Tiempo maximo aceptable, en milisegundos.
+        repeticiones (int, opcional): Cantidad de arranques a medir; se usa la mediana.
+
+    Returns:
+        bool: True si la mediana queda dentro del presupuesto.
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", CODIGO_PRIMER_MENU],
+                    cwd=os.path.dirname(os.path.abspath(__file__)),
+                    stdout=subprocess.DEVNULL, check=True)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    mediana = statistics.median(tiempos)
+
+    print(f"Tiempo hasta el primer menu: {mediana:.1f} ms (presupuesto {presupuesto_ms:.0f} ms)")
+    for modulo, microsegundos in desglosar_imports()[:5]:
+        print(f"    {modulo:<30} {microsegundos / 1000:>8.2f} ms")
+    return mediana <= presupuesto_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del programa. Sin opciones ejecuta todas las comparaciones.")
+    parser.add_argument("--suite", action="store_true", help="Ejecutar la suite reproducible y controlar regresiones contra el historial.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS_SUITE), help="Cantidades de personajes de la suite.")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Mediciones por caso (se usa la mediana).")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador de personajes.")
+    parser.add_argument("--historial", default=HISTORIAL_BENCHMARKS, help="Archivo JSON Lines con las corridas anteriores.")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION, help="Cociente de tiempo que se considera regresion.")
+    parser.add_argument("--no-guardar", action="store_true", help="No agregar esta corrida al historial.")
+    opciones = parser.parse_args()
+    if opciones.suite:
+        sin_regresiones = ejecutar_suite_con_control(tuple(opciones.tamanos), opciones.repeticiones, opciones.semilla,
+                                                    opciones.historial, opciones.umbral, not opciones.no_guardar)
+        sys.exit(0 if sin_regresiones else 1)
+
+    # Las verificaciones, las lecturas inconsistentes y un arranque fuera del presupuesto
+    # hacen fallar la corrida. La paridad con NumPy solo cuenta si esta instalado (es
+    # una dependencia opcional)
+    verificaciones = []
+    comparar_ordenamiento()
+    paridad_numpy = verificar_paridad_estadisticas()
+    verificaciones.append(paridad_numpy or not estadisticas_vectorizadas.NUMPY_DISPONIBLE)
+    comparar_backends_estadisticas()
+    contar_pasadas_estadisticas()
+    verificaciones.append(verificar_consultas_menu())
+    verificaciones.append(verificar_paridad_paralela())
+    comparar_paralelismo()
+    verificaciones.append(verificar_orden_externo())
+    comparar_orden_externo()
+    medir_sobrecarga_instrumentacion()
+    verificaciones.append(verificar_instantaneas())
+    lectores = medir_lectores_concurrentes()
+    verificaciones.append(all(inconsistentes == 0 for _, _, inconsistentes in lectores.values()))
+    medir_memoria_filas()
+    verificaciones.append(medir_arranque())
+    sys.exit(0 if all(verificaciones) else 1)
@@ -0,0 +1,207 @@
+"""
+Cache de resultados de las operaciones del menu.
+
+Guarda el resultado de cada operacion junto con la funcion, sus parametros y la
+version del almacen sobre el que se calculo. Mientras no se agreguen personajes,
+repetir una opcion (ordenamientos, filtros, conteos) retorna el resultado guardado
+en O(1). Al agregar un personaje cambia la version del almacen, y las entradas de
+versiones anteriores se descartan.
+
+Los resultados se comparten entre llamadas, por lo que no deben modificarse.
+Solo se cachean operaciones sobre un AlmacenPersonajes: una lista de personajes no
+tiene version y puede cambiar sin aviso.
+
+La cache se puede usar desde varios hilos (ej: el pool de servidor.py); si dos hilos
+calculan a la vez el mismo resultado, se guarda el ultimo.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from almacen_personajes import AlmacenPersonajes
+
+MEMORIA_MAXIMA = 64 * 1024 * 1024  # Bytes estimados que puede ocupar la cache
+MUESTRA_TAMANO = 32  # Elementos que se miden para estimar el tamaño de una lista
+
+
+def estimar_tamano(valor) -> int:
+    """
+    Estima los bytes que ocupa un resultado. En listas largas mide una muestra de
+    elementos y extrapola. Las cadenas no se cuentan: las filas de un almacen reusan
+    las cadenas de sus diccionarios.
+
+    Args:
+        valor: Resultado a medir (listas y tuplas de filas, numeros, cadenas,
+               diccionarios u objetos con atributos, como consultas.ResultadoConsulta).
+
+    Returns:
+        int: Tamaño estimado en bytes.
+    """
+    if isinstance(valor, str):
+        return 0
+    tamano = sys.getsizeof(valor)
+    if isinstance(valor, (list, tuple)) and valor:
+        muestra = valor[:MUESTRA_TAMANO]
+        tamano_muestra = sum(estimar_tamano(elemento) for elemento in muestra)
+        tamano += tamano_muestra * len(valor) // len(muestra)
+    elif isinstance(valor, dict):
+        tamano += sum(estimar_tamano(elemento) for elemento in valor.values())
+    elif hasattr(valor, "__dict__"):
+        # Un objeto que envuelve el resultado (ej: las filas de un ResultadoConsulta)
+        tamano += estimar_tamano(vars(valor))
+    return tamano
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados con limite de memoria y contadores de aciertos y fallos.
+    """
+
+    def __init__(self, memoria_maxima: int = MEMORIA_MAXIMA) -> None:
+        self.memoria_maxima = memoria_maxima
+        self.entradas = OrderedDict()  # clave -> (resultado, tamaño); la ultima es la mas reciente
+        self.memoria_usada = 0
+        self.versiones = {}  # identificador de almacen -> ultima version vista
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.cerrojo = threading.Lock()
+
+    def obtener(self, clave: tuple) -> tuple:
+        """
+        Busca un resultado y, si esta, lo marca como el mas reciente.
+
+        Args:
+            clave (tuple): Clave armada por clave_operacion.
+
+        Returns:
+            tuple: (encontrado, resultado). resultado es None si no se encontro.
+        """
+        with self.cerrojo:
+            entrada = self.entradas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                return False, None
+            self.entradas.move_to_end(clave)
+            self.aciertos += 1
+            return True, entrada[0]
+
+    def guardar(self, clave: tuple, resultado) -> None:
+        """
+        Guarda un resultado. Si la clave corresponde a una version mas nueva del almacen,
+        descarta primero las entradas de sus versiones anteriores. Luego desaloja las
+        entradas menos usadas hasta respetar el limite de memoria.
+
+        Args:
+            clave (tuple): Clave armada por clave_operacion.
+            resultado: Resultado a guardar.
+
+        Returns:
+            None
+        """
+        tamano = estimar_tamano(resultado)
+        identificador, version = clave[0], clave[1]
+        with self.cerrojo:
+            if self.versiones.get(identificador, version) > version:
+                return  # Se calculo sobre una version que ya fue reemplazada
+            if self.versiones.get(identificador, version) < version:
+                self.descartar_entradas(identificador)
+            self.versiones[identificador] = version
+
+            if tamano > self.memoria_maxima:
+                return  # No entra ni vaciando la cache
+            if clave in self.entradas:
+                self.memoria_usada -= self.entradas.pop(clave)[1]
+            self.entradas[clave] = (resultado, tamano)
+            self.memoria_usada += tamano
+            while self.memoria_usada > self.memoria_maxima:
+                _, (_, tamano_desalojado) = self.entradas.popitem(last=False)
+                self.memoria_usada -= tamano_desalojado
+                self.desalojos += 1
+
+    def descartar_almacen(self, identificador: int) -> None:
+        """
+        Elimina todas las entradas de un almacen.
+
+        Args:
+            identificador (int): Identificador del almacen.
+
+        Returns:
+            None
+        """
+        with self.cerrojo:
+            self.descartar_entradas(identificador)
+
+    def descartar_entradas(self, identificador: int) -> None:
+        """
+        Elimina las entradas de un almacen. Se llama con el cerrojo tomado.
+
+        Returns:
+            None
+        """
+        for clave in [clave for clave in self.entradas if clave[0] == identificador]:
+            self.memoria_usada -= self.entradas.pop(clave)[1]
+
+    def limpiar(self) -> None:
+        """
+        Vacia la cache y reinicia los contadores.
+
+        Returns:
+            None
+        """
+        self.__init__(self.memoria_maxima)
+
+    def estadisticas(self) -> dict:
+        """
+        Retorna los contadores de la cache.
+
+        Returns:
+            dict: aciertos, fallos, desalojos, entradas, memoria_usada y tasa_aciertos.
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "entradas": len(self.entradas),
+            "memoria_usada": self.memoria_usada,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+
+CACHE = CacheResultados()
+
+
+def clave_operacion(funcion, almacen: AlmacenPersonajes, args: tuple, kwargs: dict) -> tuple:
+    """
+    Arma la clave de cache de una llamada: almacen, version, funcion y parametros.
+
+    Returns:
+        tuple: Clave hashable (los parametros deben ser hashables).
+    """
+    return (almacen.identificador, almacen.version, funcion.__module__, funcion.__qualname__,
+            args, tuple(sorted(kwargs.items())))
+
+
+def ejecutar_con_cache(funcion, matriz, *args, **kwargs):
+    """
+    Ejecuta funcion(matriz, *args, **kwargs) o retorna su resultado guardado si ya se
+    calculo con los mismos parametros sobre la misma version del almacen.
+
+    Args:
+        funcion (callable): Operacion a ejecutar (ej: operaciones_ordenamiento.ordenar_por_stat).
+        matriz (list | AlmacenPersonajes): Matriz de personajes. Las listas no se cachean.
+        *args, **kwargs: Parametros de la operacion.
+
+    Returns:
+        El resultado de la operacion. No debe modificarse.
+    """
+    if not isinstance(matriz, AlmacenPersonajes):
+        return funcion(matriz, *args, **kwargs)
+
+    clave = clave_operacion(funcion, matriz, args, kwargs)
+    encontrado, resultado = CACHE.obtener(clave)
+    if not encontrado:
+        resultado = funcion(matriz, *args, **kwargs)
+        CACHE.guardar(clave, resultado)
+    return resultado
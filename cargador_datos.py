@@ -0,0 +1,240 @@
+"""
+Carga masiva de personajes desde archivos CSV, JSON Lines o Parquet.
+
+Los archivos se leen por bloques, se validan con las reglas de
+utils.validar_personaje_completo y se agregan directamente a la matriz, sin
+cargar el archivo completo en memoria.
+"""
+import csv
+import json
+import os
+import time
+
+import operaciones_datos
+import utils
+from almacen_personajes import AlmacenPersonajes
+
+COLUMNAS = ("nombre", "alias", "raza", "genero", "poder", "inteligencia", "velocidad")
+INDICES_NUMERICOS = (4, 5, 6)
+TAMANO_BLOQUE = 10_000
+MAXIMO_ERRORES_REPORTADOS = 20
+
+
+class FilaInvalida:
+    """
+    Fila que el lector no pudo interpretar (por ejemplo, una linea que no es JSON).
+    preparar_bloque la descarta con su mensaje, como a cualquier otra fila invalida.
+    """
+
+    def __init__(self, mensaje: str) -> None:
+        self.mensaje = mensaje
+
+
+def leer_csv(ruta: str, tamano_bloque: int = TAMANO_BLOQUE):
+    """
+    Lee un CSV de personajes por bloques. La primera fila se ignora si es el encabezado
+    (nombre, alias, raza, genero, poder, inteligencia, velocidad).
+
+    Args:
+        ruta (str): Ruta del archivo CSV.
+        tamano_bloque (int, opcional): Cantidad de filas por bloque.
+
+    Yields:
+        list: Bloques de filas sin convertir (listas de cadenas).
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.reader(archivo)
+        bloque = []
+        for numero_fila, fila in enumerate(lector):
+            if numero_fila == 0 and tuple(valor.strip().lower() for valor in fila) == COLUMNAS:
+                continue
+            bloque.append(fila)
+            if len(bloque) == tamano_bloque:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
+
+
+def leer_jsonl(ruta: str, tamano_bloque: int = TAMANO_BLOQUE):
+    """
+    Lee un archivo JSON Lines de personajes por bloques. Cada linea puede ser un objeto
+    con las claves de COLUMNAS o una lista con los siete datos en orden.
+
+    Args:
+        ruta (str): Ruta del archivo .jsonl.
+        tamano_bloque (int, opcional): Cantidad de filas por bloque.
+
+    Yields:
+        list: Bloques de filas sin convertir.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        bloque = []
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            try:
+                dato = json.loads(linea)
+            except json.JSONDecodeError as error:
+                dato = FilaInvalida(f"Error: La linea no es JSON valido ({error.msg}).")
+            if isinstance(dato, dict):
+                dato = [dato.get(columna) for columna in COLUMNAS]
+            elif not isinstance(dato, (list, FilaInvalida)):
+                dato = FilaInvalida("Error: Cada linea debe ser una lista con los 7 datos o un objeto con sus claves.")
+            bloque.append(dato)
+            if len(bloque) == tamano_bloque:
+                yield bloque
+                bloque = []
+        if bloque:
+            yield bloque
+
+
+def leer_parquet(ruta: str, tamano_bloque: int = TAMANO_BLOQUE):
+    """
+    Lee un archivo Parquet de personajes por bloques. Requiere pyarrow, que es opcional.
+
+    Args:
+        ruta (str): Ruta del archivo .parquet.
+        tamano_bloque (int, opcional): Cantidad de filas por bloque.
+
+    Yields:
+        list: Bloques de filas sin convertir.
+
+    Raises:
+        ValueError: Si pyarrow no esta instalado.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ValueError("Para leer archivos Parquet se necesita instalar pyarrow.") from error
+
+    archivo = pq.ParquetFile(ruta)
+    for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=list(COLUMNAS)):
+        columnas = lote.to_pydict()
+        yield [list(fila) for fila in zip(*(columnas[columna] for columna in COLUMNAS))]
+
+
+LECTORES = {
+    ".csv": leer_csv,
+    ".jsonl": leer_jsonl,
+    ".ndjson": leer_jsonl,
+    ".parquet": leer_parquet,
+}
+
+
+def preparar_bloque(bloque: list) -> tuple:
+    """
+    Valida un bloque de filas con las reglas de utils.validar_personaje_completo (sin
+    imprimir un mensaje por fila) y convierte los stats con utils.convertir_stat. Una
+    fila que no se puede leer, que no es una lista o cuyos stats no son enteros entre 0
+    y utils.MAXIMO_STAT se descarta con su mensaje; nunca corta la carga.
+
+    Args:
+        bloque (list): Filas sin convertir.
+
+    Returns:
+        tuple: Tupla que contiene:
+            - list: Personajes validos, listos para agregar a la matriz.
+            - list: Tuplas (posicion en el bloque, mensaje de error) de las filas descartadas.
+    """
+    personajes = []
+    invalidos = []
+    for posicion, fila in enumerate(bloque):
+        if isinstance(fila, FilaInvalida):
+            error = fila.mensaje
+        else:
+            error = utils.obtener_error_personaje(fila)
+        if error is None:
+            try:
+                personaje = list(fila)
+                for indice in INDICES_NUMERICOS:
+                    personaje[indice] = utils.convertir_stat(personaje[indice])
+                personajes.append(personaje)
+            except ValueError as excepcion:
+                error = str(excepcion)
+        if error is not None:
+            invalidos.append((posicion, error))
+    return personajes, invalidos
+
+
+def cargar_archivo(ruta: str, matriz=None, tamano_bloque: int = TAMANO_BLOQUE) -> tuple:
+    """
+    Carga los personajes de un archivo por bloques y los agrega a la matriz.
+    El formato se deduce de la extension (.csv, .jsonl/.ndjson o .parquet).
+
+    Args:
+        ruta (str): Ruta del archivo a cargar.
+        matriz (list | AlmacenPersonajes, opcional): Matriz a la que se agregan los personajes.
+                                                    None crea un AlmacenPersonajes nuevo.
+        tamano_bloque (int, opcional): Cantidad de filas que se leen y validan por vez.
+
+    Returns:
+        tuple: Tupla que contiene:
+            - AlmacenPersonajes | list: La matriz con los personajes cargados.
+            - dict: Reporte con filas_cargadas, filas_invalidas, segundos, filas_por_segundo
+                y los primeros errores encontrados (numero de fila, mensaje).
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in LECTORES:
+        raise ValueError(f"Formato no soportado: {extension}. Use .csv, .jsonl o .parquet.")
+    if matriz is None:
+        matriz = AlmacenPersonajes()
+
+    reporte = {"filas_cargadas": 0, "filas_invalidas": 0, "errores": []}
+    inicio = time.perf_counter()
+    filas_leidas = 0
+
+    for bloque in LECTORES[extension](ruta, tamano_bloque):
+        personajes, invalidos = preparar_bloque(bloque)
+        operaciones_datos.agregar_personajes(matriz, personajes)
+        reporte["filas_cargadas"] += len(personajes)
+        reporte["filas_invalidas"] += len(invalidos)
+        for posicion, error in invalidos:
+            if len(reporte["errores"]) < MAXIMO_ERRORES_REPORTADOS:
+                reporte["errores"].append((filas_leidas + posicion + 1, error))
+        filas_leidas += len(bloque)
+
+    segundos = time.perf_counter() - inicio
+    reporte["segundos"] = segundos
+    reporte["filas_por_segundo"] = filas_leidas / segundos if segundos > 0 else 0.0
+    return matriz, reporte
+
+
+def cargar_dataset_utn() -> AlmacenPersonajes:
+    """
+    Carga el dataset de personajes de utn_fra en un AlmacenPersonajes. El paquete se
+    importa recien al llamar a esta funcion, para no pagar su costo en cada arranque.
+
+    Returns:
+        AlmacenPersonajes: Almacen con los personajes del dataset.
+    """
+    from utn_fra.datasets import (
+        lista_nombre_heroes_pp, lista_alias_pp,
+        lista_razas_pp, lista_generos_pp,
+        lista_poderes_pp, lista_inteligencias_pp,
+        lista_velocidades_pp
+    )
+
+    return operaciones_datos.crear_almacen(
+        lista_nombre_heroes_pp, lista_alias_pp,
+        lista_razas_pp, lista_generos_pp,
+        lista_poderes_pp, lista_inteligencias_pp,
+        lista_velocidades_pp
+    )
+
+
+def mostrar_reporte_carga(reporte: dict) -> None:
+    """
+    Muestra en pantalla el resumen de una carga hecha con cargar_archivo.
+
+    Args:
+        reporte (dict): Reporte retornado por cargar_archivo.
+
+    Returns:
+        None
+    """
+    print(f"Personajes cargados: {reporte['filas_cargadas']}")
+    print(f"Filas descartadas: {reporte['filas_invalidas']}")
+    print(f"Tiempo: {reporte['segundos']:.2f} s ({reporte['filas_por_segundo']:.0f} filas/segundo)")
+    for numero_fila, error in reporte["errores"]:
+        print(f"    Fila {numero_fila}: {error}")
@@ -0,0 +1,347 @@
+"""
+Modo por linea de comandos (sin menu) del programa de análisis de superhéroes y villanos.
+
+Ejecuta cualquiera de las 22 opciones del menu, o un script con varias, sin pedir
+datos ni limpiar la pantalla, y escribe un objeto JSON por operacion (JSON Lines)
+en la salida estandar. Usa las mismas funciones operaciones_* que el menu.
+
+Ejemplos:
+    python cli.py 3 8 16
+    python cli.py --datos personajes.csv --script consultas.txt
+    python cli.py --datos personajes.pjs "2:Zed,Z,Human,Masculino,10,10,10" 3
+
+Cada operacion es el numero de la opcion del menu. La opcion 2 recibe el personaje
+a agregar despues de ":" con sus siete datos separados por comas. En un script va
+una operacion por linea; las lineas vacias o que empiezan con "#" se ignoran.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+import cache_resultados
+import consultas
+import instrumentacion
+import operaciones_datos
+import operaciones_estadisticas
+import operaciones_ordenamiento
+import persistencia
+import registro_cambios
+import utils
+from almacen_concurrente import AlmacenConcurrente
+
+NOMBRES_OPERACIONES = {
+    1: "crear_matriz",
+    2: "agregar_personaje",
+    3: "cantidad_personajes",
+    4: "cantidad_human",
+    5: "cantidad_no_human",
+    6: "detalle_personajes",
+    7: "saiyan",
+    8: "mas_poderosos",
+    9: "mas_inteligentes",
+    10: "menor_velocidad",
+    11: "debiles",
+    12: "no_binario_veloces",
+    13: "promedios_android",
+    14: "kryptonian",
+    15: "saiyan_power",
+    16: "ordenar_mas_inteligente",
+    17: "ordenar_menos_inteligente",
+    18: "ordenar_mas_poder",
+    19: "ordenar_mas_velocidad",
+    20: "ordenar_personalizado",
+    21: "trasponer",
+    22: "salir",
+}
+
+# Opciones que el menu no ejecuta sobre una matriz vacia
+OPCIONES_REQUIEREN_DATOS = set(range(8, 22)) | {2}
+
+
+class SesionCli:
+    """
+    Estado de una ejecucion por linea de comandos: la matriz cargada y, si los datos
+    son un snapshot, su registro de cambios.
+    """
+
+    def __init__(self, ruta_datos: Optional[str] = None, concurrente: bool = False) -> None:
+        """
+        Args:
+            ruta_datos (str, opcional): Archivo de datos. None usa el dataset de utn_fra.
+            concurrente (bool, opcional): True para guardar la matriz en un AlmacenConcurrente:
+                                        cada operacion lee una instantanea y las altas no
+                                        esperan a las lecturas en curso (ver servidor.py).
+        """
+        self.ruta_datos = ruta_datos
+        self.usa_snapshot = ruta_datos is not None and ruta_datos.endswith(persistencia.EXTENSION_SNAPSHOT)
+        self.concurrente = concurrente
+        self.matriz = []
+        self.registro = None
+        # False: las altas no esperan el fsync del registro; hay que llamar a sincronizar()
+        self.esperar_registro = True
+
+    def cargar(self) -> dict:
+        """
+        Carga la matriz igual que la opcion 1 del menu.
+
+        Returns:
+            dict: Cantidad de personajes cargados y, si se leyo un archivo, el reporte de carga.
+                  Si el archivo no existe o no se puede leer, {"error": mensaje} y la matriz
+                  anterior queda como estaba.
+        """
+        import cargador_datos
+        resultado = {}
+        try:
+            if self.usa_snapshot:
+                if self.registro is not None:
+                    self.registro.cerrar()
+                    self.registro = None
+                ruta_registro = self.ruta_datos + registro_cambios.EXTENSION_REGISTRO
+                self.matriz = registro_cambios.recuperar(self.ruta_datos, ruta_registro)
+                self.registro = registro_cambios.RegistroEscritura(ruta_registro)
+            elif self.ruta_datos is not None:
+                self.matriz, reporte = cargador_datos.cargar_archivo(self.ruta_datos)
+                resultado["reporte"] = reporte
+            else:
+                self.matriz = cargador_datos.cargar_dataset_utn()
+        except (OSError, ValueError) as error:
+            return {"error": f"No se pudo cargar {self.ruta_datos}: {error}"}
+        if self.concurrente:
+            self.matriz = AlmacenConcurrente(self.matriz)
+        resultado["cantidad"] = len(self.matriz)
+        return resultado
+
+    def matriz_actual(self):
+        """
+        Retorna la matriz sobre la que leer: una instantanea si el almacen es concurrente.
+
+        Returns:
+            list | AlmacenPersonajes: Matriz de personajes.
+        """
+        if isinstance(self.matriz, AlmacenConcurrente):
+            return self.matriz.instantanea()
+        return self.matriz
+
+    def agregar(self, argumento: Optional[str]) -> dict:
+        """
+        Agrega un personaje igual que la opcion 2 del menu.
+
+        Args:
+            argumento (str): Los siete datos del personaje separados por comas.
+
+        Returns:
+            dict: Personaje agregado, o el error de validacion.
+        """
+        campos = [] if argumento is None else [campo.strip() for campo in argumento.split(",")]
+        try:
+            personaje = utils.convertir_personaje(campos)
+        except ValueError as error:
+            return {"error": str(error)}
+        if self.registro is not None:
+            self.registro.registrar(personaje, len(self.matriz), self.esperar_registro)
+        self.matriz = operaciones_datos.agregar_personaje(self.matriz, personaje)
+        return {"personaje": personaje}
+
+    def sincronizar(self) -> None:
+        """
+        Espera a que las altas registradas esten en disco (ver esperar_registro).
+
+        Returns:
+            None
+        """
+        registro = self.registro
+        if registro is not None:
+            registro.sincronizar()
+
+    def cerrar(self) -> None:
+        """
+        Guarda en el snapshot las altas del registro de cambios, igual que la opcion 22.
+
+        Returns:
+            None
+        """
+        if self.registro is not None:
+            if self.registro.tamano() > 0:
+                self.registro.compactar(self.matriz_actual(), self.ruta_datos).join()
+            self.registro.cerrar()
+            self.registro = None
+
+    def ejecutar(self, opcion: int, argumento: Optional[str] = None) -> dict:
+        """
+        Ejecuta una opcion del menu y retorna su resultado como datos.
+
+        Args:
+            opcion (int): Numero de opcion (1 a 22).
+            argumento (str, opcional): Datos del personaje para la opcion 2.
+
+        Returns:
+            dict: Resultado de la operacion (personajes como listas, cantidades, promedios)
+                o {"error": mensaje} si no se pudo realizar.
+        """
+        matriz = self.matriz_actual()
+        if opcion in OPCIONES_REQUIEREN_DATOS and not matriz:
+            return {"error": "No se puede realizar la operacion porque la matriz esta vacia."}
+
+        match opcion:
+            case 1:
+                return self.cargar()
+            case 2:
+                return self.agregar(argumento)
+            case 3 | 4 | 5:
+                return {"cantidad": cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, opcion).cantidad}
+            case 6 | 7 | 8 | 9 | 16 | 17 | 18 | 19 | 20:
+                return {"personajes": cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, opcion).filas}
+            case 10:
+                personajes, promedio = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_menos_velocidad, matriz)
+                return {"promedio_velocidad": promedio, "personajes": personajes}
+            case 11:
+                personajes, poder_minimo = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_debiles, matriz)
+                return {"poder_minimo_saiyan": poder_minimo, "personajes": personajes}
+            case 12:
+                personajes, max_velocidad = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_no_binario_veloces, matriz)
+                return {"maxima_velocidad": max_velocidad, "personajes": personajes}
+            case 13:
+                promedio_inteligencia, promedio_poder = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.calcular_promedio_android, matriz)
+                return {"promedio_inteligencia": promedio_inteligencia, "promedio_poder": promedio_poder}
+            case 14:
+                personajes, promedio = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_kryptonian_poder, matriz)
+                return {"promedio_poder_kryptonian": promedio, "personajes": personajes}
+            case 15:
+                personajes, indice_ataque = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_saiyan_poder, matriz)
+                return {"indice_ataque_saiyan": indice_ataque, "personajes": personajes}
+            case 21:
+                return {"columnas": operaciones_ordenamiento.trasponer_matriz(matriz)}
+            case 22:
+                self.cerrar()
+                return {}
+        return {"error": f"Opcion invalida: {opcion}. Debe estar entre 1 y 22."}
+
+
+def interpretar_operacion(texto: str) -> tuple:
+    """
+    Separa una operacion escrita como "opcion" u "opcion:argumento".
+
+    Args:
+        texto (str): Operacion tal como se escribio en la linea de comandos o el script.
+
+    Returns:
+        tuple: (opcion, argumento). La opcion es None si no es un numero.
+    """
+    opcion, separador, argumento = texto.strip().partition(":")
+    try:
+        return int(opcion), argumento if separador else None
+    except ValueError:
+        return None, None
+
+
+def leer_script(ruta: str) -> list:
+    """
+    Lee las operaciones de un script, una por linea.
+
+    Args:
+        ruta (str): Ruta del script ("-" lee la entrada estandar).
+
+    Returns:
+        list: Operaciones en el orden del script.
+    """
+    archivo = sys.stdin if ruta == "-" else open(ruta, encoding="utf-8")
+    with archivo:
+        return [linea.strip() for linea in archivo if linea.strip() and not linea.lstrip().startswith("#")]
+
+
+def ejecutar_operaciones(sesion: SesionCli, operaciones: list, salida=None) -> int:
+    """
+    Ejecuta una lista de operaciones y escribe un JSON por linea con cada resultado.
+    Se detiene en la opcion 22, igual que el menu.
+
+    Args:
+        sesion (SesionCli): Sesion con la matriz cargada.
+        operaciones (list): Operaciones como texto ("3", "2:Zed,Z,Human,...").
+        salida (file, opcional): Donde escribir. None usa la salida estandar.
+
+    Returns:
+        int: Cantidad de operaciones que terminaron con error.
+    """
+    salida = sys.stdout if salida is None else salida
+    errores = 0
+    for texto in operaciones:
+        opcion, argumento = interpretar_operacion(texto)
+        inicio = time.perf_counter()
+        if opcion is None:
+            resultado = {"error": f"Operacion invalida: {texto}"}
+        else:
+            try:
+                with instrumentacion.medir_operacion(opcion):
+                    resultado = sesion.ejecutar(opcion, argumento)
+            except Exception as error:  # Un error en una operacion no debe cortar el resto
+                resultado = {"error": f"{type(error).__name__}: {error}"}
+        registro = {"opcion": opcion, "operacion": NOMBRES_OPERACIONES.get(opcion)}
+        registro.update(resultado)
+        registro["segundos"] = time.perf_counter() - inicio
+        if "error" in resultado:
+            errores += 1
+        # default=list convierte el almacen, sus filas y columnas (array/memoryview) a listas
+        salida.write(json.dumps(registro, ensure_ascii=False, default=list) + "\n")
+        if opcion == 22:
+            break
+    salida.flush()
+    return errores
+
+
+def main(argumentos: Optional[list] = None) -> int:
+    """
+    Punto de entrada del modo por linea de comandos.
+
+    Args:
+        argumentos (list, opcional): Argumentos a interpretar. None usa sys.argv.
+
+    Returns:
+        int: Codigo de salida (0 si todas las operaciones terminaron sin error, 1 si no).
+    """
+    parser = argparse.ArgumentParser(description="Ejecuta opciones del menu sin interaccion y muestra el resultado en JSON.")
+    parser.add_argument("operaciones", nargs="*", help='Opciones a ejecutar (1-22); la 2 como "2:nombre,alias,raza,genero,poder,inteligencia,velocidad".')
+    parser.add_argument("--datos", help="Archivo CSV, JSON Lines, Parquet o snapshot (.pjs). Por defecto, el dataset de utn_fra.")
+    parser.add_argument("--script", help='Archivo con una operacion por linea ("-" para la entrada estandar).')
+    parser.add_argument("--sin-carga", action="store_true", help="No cargar los datos antes de empezar (como si no se usara la opcion 1).")
+    parser.add_argument("--estadisticas-cache", action="store_true", help="Al final, escribir los aciertos y fallos de la cache de resultados.")
+    parser.add_argument("--procesos", type=int, help="Calcular las estadisticas en paralelo con esta cantidad de procesos (0 = uno por CPU).")
+    parser.add_argument("--metricas", help="Medir cada operacion y guardar las metricas en este archivo (.prom para Prometheus, si no JSON).")
+    parser.add_argument("--perfilar", metavar="DIRECTORIO", help="Guardar un perfil de cProfile por operacion (perfil_<opcion>.pstats) en este directorio.")
+    parser.add_argument("--medir-memoria", action="store_true", help="Incluir en las metricas el pico de memoria de cada operacion (tracemalloc).")
+    opciones = parser.parse_args(argumentos)
+
+    operaciones = list(opciones.operaciones)
+    if opciones.script:
+        operaciones.extend(leer_script(opciones.script))
+
+    if opciones.procesos is not None:
+        operaciones_estadisticas.configurar_paralelismo(opciones.procesos)
+    if opciones.metricas or opciones.perfilar or opciones.medir_memoria:
+        instrumentacion.configurar(True, perfilar=opciones.perfilar is not None, medir_memoria=opciones.medir_memoria)
+    sesion = SesionCli(opciones.datos)
+    try:
+        if not opciones.sin_carga:
+            resultado = sesion.cargar()
+            if "error" in resultado:
+                print(json.dumps({"opcion": 1, "operacion": NOMBRES_OPERACIONES.get(1), **resultado}, ensure_ascii=False))
+                return 1
+        errores = ejecutar_operaciones(sesion, operaciones)
+    finally:
+        sesion.cerrar()
+        operaciones_estadisticas.configurar_paralelismo(None)
+    if opciones.estadisticas_cache:
+        print(json.dumps({"cache": cache_resultados.CACHE.estadisticas()}))
+    if opciones.metricas:
+        instrumentacion.guardar_metricas(opciones.metricas)
+    if opciones.perfilar:
+        os.makedirs(opciones.perfilar, exist_ok=True)
+        for opcion in instrumentacion.PERFILES:
+            instrumentacion.guardar_perfil(opcion, os.path.join(opciones.perfilar, f"perfil_{opcion}.pstats"))
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Cliente de carga para servidor.py.
+
+Abre varias conexiones en paralelo. Cada una envia solicitudes con pipelining (hasta
+una profundidad fija de solicitudes sin respuesta) y mide la latencia de cada una,
+desde que se envia hasta que llega su respuesta. Al final informa en JSON la cantidad
+de solicitudes, los errores, el rendimiento y las latencias p50 y p99.
+
+Ejemplo:
+    python cliente_carga.py --puerto 8765 --clientes 8 --solicitudes 500 --operaciones 3 4 8 13 16
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import deque
+from typing import Optional
+
+import servidor
+
+OPERACIONES_POR_DEFECTO = ("3", "4", "5", "8", "9", "12", "13", "16", "20")
+
+
+async def ejecutar_cliente(operaciones: list, solicitudes: int, profundidad: int, host: str, puerto: int,
+                        ruta_socket: Optional[str], latencias: list) -> int:
+    """
+    Envia solicitudes por una conexion, rotando entre las operaciones, y agrega la
+    latencia de cada una (en segundos) a latencias.
+
+    Returns:
+        int: Cantidad de respuestas con error.
+    """
+    if ruta_socket is not None:
+        reader, writer = await asyncio.open_unix_connection(ruta_socket, limit=2**26)
+    else:
+        reader, writer = await asyncio.open_connection(host, puerto, limit=2**26)
+    envios = deque()
+    cupo = asyncio.Semaphore(profundidad)
+    errores = 0
+
+    async def enviar() -> None:
+        for numero in range(solicitudes):
+            await cupo.acquire()
+            solicitud = {"id": numero, "operacion": operaciones[numero % len(operaciones)]}
+            envios.append(time.perf_counter())
+            writer.write((json.dumps(solicitud) + "\n").encode("utf-8"))
+            await writer.drain()
+
+    envio = asyncio.create_task(enviar())
+    for _ in range(solicitudes):
+        linea = await reader.readline()
+        latencias.append(time.perf_counter() - envios.popleft())
+        cupo.release()
+        if not linea or "error" in json.loads(linea):
+            errores += 1
+    await envio
+    writer.close()
+    await writer.wait_closed()
+    return errores
+
+
+async def medir_carga(operaciones=OPERACIONES_POR_DEFECTO, clientes: int = 8, solicitudes: int = 200,
+                    profundidad: int = 8, host: str = "127.0.0.1", puerto: int = servidor.PUERTO_POR_DEFECTO,
+                    ruta_socket: Optional[str] = None) -> dict:
+    """
+    Ejecuta varios clientes a la vez contra el servidor.
+
+    Args:
+        operaciones (iterable, opcional): Operaciones a enviar, en rotacion ("3", "16", ...).
+        clientes (int, opcional): Conexiones simultaneas.
+        solicitudes (int, opcional): Solicitudes por conexion.
+        profundidad (int, opcional): Solicitudes sin respuesta por conexion (pipelining).
+        host (str, opcional): Direccion TCP del servidor.
+        puerto (int, opcional): Puerto TCP del servidor.
+        ruta_socket (str, opcional): Socket Unix del servidor (en lugar de TCP).
+
+    Returns:
+        dict: solicitudes, errores, segundos, solicitudes_por_segundo, p50_ms y p99_ms.
+    """
+    operaciones = list(operaciones)
+    latencias = []
+    inicio = time.perf_counter()
+    errores = await asyncio.gather(*(
+        ejecutar_cliente(operaciones, solicitudes, profundidad, host, puerto, ruta_socket, latencias)
+        for _ in range(clientes)))
+    segundos = time.perf_counter() - inicio
+    percentiles = statistics.quantiles(latencias, n=100) if len(latencias) > 1 else latencias * 99
+    return {
+        "solicitudes": len(latencias),
+        "errores": sum(errores),
+        "segundos": segundos,
+        "solicitudes_por_segundo": len(latencias) / segundos if segundos > 0 else 0.0,
+        "p50_ms": statistics.median(latencias) * 1000 if latencias else 0.0,
+        "p99_ms": percentiles[98] * 1000 if latencias else 0.0,
+    }
+
+
+def main(argumentos: Optional[list] = None) -> int:
+    """
+    Punto de entrada del cliente de carga.
+
+    Args:
+        argumentos (list, opcional): Argumentos a interpretar. None usa sys.argv.
+
+    Returns:
+        int: Codigo de salida (1 si alguna respuesta tuvo error).
+    """
+    parser = argparse.ArgumentParser(description="Prueba de carga contra servidor.py.")
+    parser.add_argument("--host", default="127.0.0.1", help="Direccion TCP del servidor.")
+    parser.add_argument("--puerto", type=int, default=servidor.PUERTO_POR_DEFECTO, help="Puerto TCP del servidor.")
+    parser.add_argument("--socket", help="Socket Unix del servidor (en lugar de TCP).")
+    parser.add_argument("--clientes", type=int, default=8, help="Conexiones simultaneas.")
+    parser.add_argument("--solicitudes", type=int, default=200, help="Solicitudes por conexion.")
+    parser.add_argument("--profundidad", type=int, default=8, help="Solicitudes sin respuesta por conexion.")
+    parser.add_argument("--operaciones", nargs="+", default=list(OPERACIONES_POR_DEFECTO), help="Operaciones a enviar en rotacion.")
+    opciones = parser.parse_args(argumentos)
+
+    reporte = asyncio.run(medir_carga(opciones.operaciones, opciones.clientes, opciones.solicitudes,
+                                    opciones.profundidad, opciones.host, opciones.puerto, opciones.socket))
+    print(json.dumps(reporte))
+    return 1 if reporte["errores"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
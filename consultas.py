@@ -0,0 +1,610 @@
+"""
+Motor de consultas sobre las siete columnas de los personajes.
+
+Una Consulta describe, en lugar de programar un recorrido a mano:
+    - agregaciones: valores calculados antes de filtrar (ej: promedio de poder de
+      los Kryptonian), que los filtros pueden usar como umbral por nombre.
+    - filtros: condiciones de texto (raza, genero, ...) y comparaciones numericas,
+      que deben cumplirse todas.
+    - orden y limite de las filas resultantes.
+    - seleccion: filas, solo la cantidad, o ninguna (solo agregaciones).
+
+El planificador decide como ejecutarla: las agregaciones con los mismos filtros se
+calculan juntas en una sola pasada (o salen del registro de agregados del almacen),
+las condiciones de texto se evaluan una vez por valor distinto y, si alguna es
+positiva, el recorrido se limita a las posiciones de su indice invertido. Las filas
+se generan de forma diferida, por lo que un limite sin orden corta el recorrido.
+
+Las opciones 3 a 20 del menu estan definidas como consultas en CONSULTAS_MENU. El menu
+y la linea de comandos ejecutan las opciones 3 a 9 y 16 a 20 con ejecutar_opcion_menu;
+las 10 a 15 pasan por operaciones_estadisticas, que usa las mismas consultas.
+"""
+import operator
+from itertools import compress, islice, repeat
+
+import instrumentacion
+from agregados import Agregado, COLUMNAS_STATS
+from almacen_personajes import AlmacenPersonajes, COLUMNAS_TEXTO
+from vistas_columnas import VistaColumna, filas_en_posiciones
+
+OPERADORES = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+FUNCIONES_AGREGACION = ("promedio", "minimo", "maximo", "suma", "cantidad")
+SELECCIONES = ("filas", "cantidad", "ninguna")
+
+
+def coincide_palabra(texto: str, palabra: str) -> bool:
+    """
+    Indica si la palabra aparece en el texto seguida de un espacio o al final
+    (ej: "Saiyan" coincide con "Half Saiyan" pero no con "Saiyan-Kree").
+
+    Args:
+        texto (str): Texto donde buscar (ej: la raza de un personaje).
+        palabra (str): Palabra a buscar.
+
+    Returns:
+        bool: True si hay coincidencia.
+    """
+    return f"{palabra} " in f" {texto} "
+
+
+class CondicionTexto:
+    """
+    Condicion sobre una columna de texto: "contiene" (subcadena), "palabra"
+    (ver coincide_palabra) o "igual".
+    """
+
+    def __init__(self, indice_columna: int, modo: str, valor: str, negada: bool = False) -> None:
+        if indice_columna not in COLUMNAS_TEXTO:
+            raise ValueError(f"La columna {indice_columna} no es de texto.")
+        if modo not in ("contiene", "palabra", "igual"):
+            raise ValueError(f"Modo de condicion invalido: {modo}")
+        self.indice_columna = indice_columna
+        self.modo = modo
+        self.valor = valor
+        self.negada = negada
+
+    def evaluar(self, texto: str) -> bool:
+        """
+        Evalua la condicion sobre un valor de la columna.
+
+        Args:
+            texto (str): Valor de la columna.
+
+        Returns:
+            bool: True si el valor cumple la condicion.
+        """
+        if self.modo == "contiene":
+            cumple = self.valor in texto
+        elif self.modo == "palabra":
+            cumple = coincide_palabra(texto, self.valor)
+        else:
+            cumple = texto == self.valor
+        return cumple != self.negada
+
+    def clave(self) -> tuple:
+        return ("texto", self.indice_columna, self.modo, self.valor, self.negada)
+
+
+class Comparacion:
+    """
+    Compara un stat (o el promedio de varios stats de la misma fila) contra un umbral.
+    El umbral puede ser un numero o el nombre de una agregacion de la consulta.
+    """
+
+    def __init__(self, columnas, operador: str, umbral) -> None:
+        self.columnas = (columnas,) if isinstance(columnas, int) else tuple(columnas)
+        if any(indice not in COLUMNAS_STATS for indice in self.columnas):
+            raise ValueError(f"Solo se pueden comparar stats numericos: {self.columnas}")
+        if operador not in OPERADORES:
+            raise ValueError(f"Operador invalido: {operador}")
+        self.operador = operador
+        self.umbral = umbral
+
+    def resolver_umbral(self, valores: dict):
+        """
+        Retorna el umbral numerico, buscandolo en las agregaciones si es un nombre.
+
+        Args:
+            valores (dict): Valores de las agregaciones ya calculadas.
+
+        Returns:
+            int | float | None: Umbral, o None si la agregacion no tuvo filas.
+        """
+        if isinstance(self.umbral, str):
+            return valores[self.umbral]
+        return self.umbral
+
+    def clave(self) -> tuple:
+        return ("comparacion", self.columnas, self.operador, self.umbral)
+
+
+def contiene(indice_columna: int, valor: str) -> CondicionTexto:
+    """Condicion: la columna contiene el texto (ej: contiene(2, "Saiyan"))."""
+    return CondicionTexto(indice_columna, "contiene", valor)
+
+
+def contiene_palabra(indice_columna: int, valor: str) -> CondicionTexto:
+    """Condicion: la columna contiene la palabra (ver coincide_palabra)."""
+    return CondicionTexto(indice_columna, "palabra", valor)
+
+
+def igual(indice_columna: int, valor: str) -> CondicionTexto:
+    """Condicion: la columna es igual al texto."""
+    return CondicionTexto(indice_columna, "igual", valor)
+
+
+def negar(condicion: CondicionTexto) -> CondicionTexto:
+    """Retorna la condicion de texto opuesta."""
+    return CondicionTexto(condicion.indice_columna, condicion.modo, condicion.valor, not condicion.negada)
+
+
+class Agregacion:
+    """
+    Valor calculado sobre los personajes que cumplen sus filtros. Con varias columnas
+    y funcion "promedio" es el promedio de los promedios de cada columna.
+    """
+
+    def __init__(self, columnas, funcion: str = "promedio", filtros=(), si_vacio=None) -> None:
+        """
+        Args:
+            columnas (int | tuple): Stat o stats a agregar (4, 5, 6).
+            funcion (str, opcional): Una de FUNCIONES_AGREGACION.
+            filtros (iterable, opcional): Condiciones de texto o comparaciones con umbral numerico.
+            si_vacio (opcional): Valor informado si ningun personaje cumple los filtros
+                                (el promedio de un conjunto vacio ya es 0).
+        """
+        self.columnas = (columnas,) if isinstance(columnas, int) else tuple(columnas)
+        if funcion not in FUNCIONES_AGREGACION:
+            raise ValueError(f"Funcion de agregacion invalida: {funcion}")
+        self.funcion = funcion
+        self.filtros = tuple(filtros)
+        self.si_vacio = si_vacio
+
+    def calcular(self, agregados: dict):
+        """
+        Obtiene el valor de la agregacion a partir de los Agregado de sus columnas.
+
+        Args:
+            agregados (dict): {indice_stat: Agregado} calculados con los filtros de la agregacion.
+
+        Returns:
+            int | float | None: Valor resultante (None si no hubo personajes y no es promedio).
+        """
+        resultados = []
+        for indice_stat in self.columnas:
+            agregado = agregados[indice_stat]
+            if self.funcion == "promedio":
+                resultados.append(agregado.promedio())
+            elif self.funcion == "minimo":
+                resultados.append(agregado.minimo)
+            elif self.funcion == "maximo":
+                resultados.append(agregado.maximo)
+            elif self.funcion == "suma":
+                resultados.append(agregado.suma)
+            else:
+                resultados.append(agregado.cantidad)
+        if len(resultados) == 1:
+            return resultados[0]
+        if None in resultados:
+            return None
+        return sum(resultados) / len(resultados)
+
+
+class Consulta:
+    """
+    Definicion declarativa de una consulta: agregaciones, filtros, orden, limite y seleccion.
+    """
+
+    def __init__(self, filtros=(), agregaciones=None, orden=(), limite=None, seleccion: str = "filas") -> None:
+        """
+        Args:
+            filtros (iterable, opcional): Condiciones que deben cumplirse todas.
+            agregaciones (dict, opcional): {nombre: Agregacion}, calculadas antes de filtrar.
+            orden (iterable, opcional): Tuplas (indice_columna, descendente) en orden de
+                                        prioridad. El orden es estable.
+            limite (int, opcional): Cantidad maxima de filas.
+            seleccion (str, opcional): "filas", "cantidad" o "ninguna".
+        """
+        if seleccion not in SELECCIONES:
+            raise ValueError(f"Seleccion invalida: {seleccion}")
+        self.filtros = tuple(filtros)
+        self.agregaciones = dict(agregaciones or {})
+        self.orden = tuple(orden)
+        self.limite = limite
+        self.seleccion = seleccion
+
+
+class ResultadoConsulta:
+    """
+    Resultado de ejecutar una Consulta.
+    """
+
+    def __init__(self, valores: dict, filas=None, cantidad=None) -> None:
+        self.valores = valores
+        self.filas = filas
+        self.cantidad = cantidad
+
+
+def clave_filtros(filtros: tuple) -> tuple:
+    """
+    Retorna una clave hashable que identifica un conjunto de filtros.
+    """
+    return tuple(sorted(filtro.clave() for filtro in filtros))
+
+
+def es_filtro_de_registro(matriz, filtros: tuple) -> bool:
+    """
+    Indica si los agregados con estos filtros pueden salir del registro de agregados
+    del almacen: sin filtros, o con una unica condicion de texto sobre raza o genero.
+    """
+    if not isinstance(matriz, AlmacenPersonajes):
+        return False
+    if not filtros:
+        return True
+    return len(filtros) == 1 and isinstance(filtros[0], CondicionTexto) and filtros[0].indice_columna in (2, 3)
+
+
+def planificar(consulta: Consulta, matriz) -> dict:
+    """
+    Arma el plan de ejecucion de una consulta sobre una matriz.
+
+    Args:
+        consulta (Consulta): Consulta a planificar.
+        matriz (list | AlmacenPersonajes): Matriz de personajes.
+
+    Returns:
+        dict: Plan con:
+            - "grupos_agregados": lista de (filtros, stats, estrategia), una entrada por
+              conjunto distinto de filtros; estrategia es "registro" o "pasada".
+            - "candidatos": "indice" (posiciones del indice invertido de la primera
+              condicion de texto positiva), "conteo" (la cantidad sale del indice),
+              "maximo" (ver abajo) o "recorrido".
+            - "condicion_indice": la condicion usada para el indice, o None.
+            - "agregacion_maximo": si la consulta pide las filas empatadas en el maximo de
+              una agregacion con sus mismos filtros (ej: los mas poderosos), el nombre de
+              esa agregacion. Sus posiciones salen del mismo Agregado, sin otra pasada.
+    """
+    grupos = {}
+    for agregacion in consulta.agregaciones.values():
+        filtros, stats = grupos.setdefault(clave_filtros(agregacion.filtros), (agregacion.filtros, set()))
+        stats.update(agregacion.columnas)
+
+    grupos_agregados = []
+    for filtros, stats in grupos.values():
+        estrategia = "registro" if es_filtro_de_registro(matriz, filtros) else "pasada"
+        grupos_agregados.append((filtros, sorted(stats), estrategia))
+
+    candidatos = "recorrido"
+    condicion_indice = None
+    if isinstance(matriz, AlmacenPersonajes):
+        for filtro in consulta.filtros:
+            if isinstance(filtro, CondicionTexto) and not filtro.negada and filtro.indice_columna in (2, 3):
+                condicion_indice = filtro
+                candidatos = "indice"
+                break
+        if (consulta.seleccion == "cantidad" and len(consulta.filtros) == 1
+                and condicion_indice is not None):
+            candidatos = "conteo"
+
+    agregacion_maximo = None
+    if consulta.seleccion == "filas" and not consulta.orden:
+        for filtro in consulta.filtros:
+            if not (isinstance(filtro, Comparacion) and filtro.operador == "==" and isinstance(filtro.umbral, str)):
+                continue
+            agregacion = consulta.agregaciones[filtro.umbral]
+            resto = tuple(otro for otro in consulta.filtros if otro is not filtro)
+            if (agregacion.funcion == "maximo" and len(agregacion.columnas) == 1
+                    and agregacion.columnas == filtro.columnas
+                    and clave_filtros(resto) == clave_filtros(agregacion.filtros)):
+                agregacion_maximo = filtro.umbral
+                candidatos = "maximo"
+                break
+
+    return {
+        "grupos_agregados": grupos_agregados,
+        "candidatos": candidatos,
+        "condicion_indice": condicion_indice,
+        "agregacion_maximo": agregacion_maximo,
+    }
+
+
+def calcular_grupo_agregados(matriz, filtros: tuple, stats: list, estrategia: str) -> dict:
+    """
+    Calcula los Agregado de varios stats para los personajes que cumplen los filtros,
+    todos en la misma pasada.
+
+    Returns:
+        dict: {indice_stat: Agregado}.
+    """
+    if estrategia == "registro":
+        if not filtros:
+            return {indice_stat: matriz.agregado(indice_stat) for indice_stat in stats}
+        condicion = filtros[0]
+        return {indice_stat: matriz.agregado(indice_stat, condicion.indice_columna, condicion.evaluar)
+                for indice_stat in stats}
+
+    agregados = {indice_stat: Agregado() for indice_stat in stats}
+    posiciones = generar_posiciones(matriz, filtros, {}, planificar(Consulta(filtros), matriz))
+    if isinstance(matriz, AlmacenPersonajes):
+        for posicion in posiciones:
+            for indice_stat, agregado in agregados.items():
+                agregado.actualizar(matriz.columnas[indice_stat][posicion], posicion)
+    else:
+        for posicion in posiciones:
+            personaje = matriz[posicion]
+            for indice_stat, agregado in agregados.items():
+                agregado.actualizar(personaje[indice_stat], posicion)
+    return agregados
+
+
+def calcular_agregaciones(consulta: Consulta, matriz, plan: dict) -> tuple:
+    """
+    Calcula las agregaciones de la consulta, una pasada (o consulta al registro) por
+    cada conjunto distinto de filtros.
+
+    Returns:
+        tuple: (valores, umbrales). Ambos son {nombre: valor}; en valores se reemplazan
+            los None por el si_vacio de cada agregacion, en umbrales no. Si el plan usa
+            "agregacion_maximo", guarda en plan["posiciones_maximo"] sus posiciones.
+    """
+    agregados_por_filtros = {}
+    for filtros, stats, estrategia in plan["grupos_agregados"]:
+        agregados_por_filtros[clave_filtros(filtros)] = calcular_grupo_agregados(matriz, filtros, stats, estrategia)
+
+    valores = {}
+    umbrales = {}
+    for nombre, agregacion in consulta.agregaciones.items():
+        valor = agregacion.calcular(agregados_por_filtros[clave_filtros(agregacion.filtros)])
+        umbrales[nombre] = valor
+        valores[nombre] = agregacion.si_vacio if valor is None else valor
+        if nombre == plan["agregacion_maximo"]:
+            agregados = agregados_por_filtros[clave_filtros(agregacion.filtros)]
+            plan["posiciones_maximo"] = agregados[agregacion.columnas[0]].posiciones_maximo
+    return valores, umbrales
+
+
+def generar_posiciones(matriz, filtros: tuple, umbrales: dict, plan: dict):
+    """
+    Genera, en orden ascendente y de forma diferida, las posiciones de los personajes
+    que cumplen todos los filtros.
+
+    Yields:
+        int: Posicion de cada personaje que cumple los filtros.
+    """
+    if plan["candidatos"] == "maximo":
+        yield from plan["posiciones_maximo"]
+        return
+
+    comparaciones = []
+    for filtro in filtros:
+        if isinstance(filtro, Comparacion):
+            umbral = filtro.resolver_umbral(umbrales)
+            if umbral is None:
+                return  # El umbral salio de una agregacion sin filas: nadie lo cumple
+            comparaciones.append((filtro.columnas, OPERADORES[filtro.operador], umbral))
+    condiciones = [filtro for filtro in filtros if isinstance(filtro, CondicionTexto)]
+
+    if isinstance(matriz, AlmacenPersonajes):
+        # Cada condicion de texto se evalua una vez por valor distinto y queda como conjunto de codigos
+        codigos = []
+        for condicion in condiciones:
+            if condicion is not plan["condicion_indice"]:
+                codigos.append((matriz.codigos(condicion.indice_columna),
+                                matriz.codigos_coincidentes(condicion.indice_columna, condicion.evaluar)))
+
+        if plan["condicion_indice"] is not None:
+            # Pocas filas candidatas: se verifica cada una por posicion
+            condicion = plan["condicion_indice"]
+            candidatas = matriz.posiciones_coincidentes(condicion.indice_columna, condicion.evaluar)
+            if instrumentacion.ACTIVA:
+                instrumentacion.contar("filas_recorridas", len(candidatas))
+            for posicion in candidatas:
+                if all(columna[posicion] in coincidentes for columna, coincidentes in codigos) and all(
+                        cumple_comparacion([matriz.columnas[indice][posicion] for indice in indices], operador, umbral)
+                        for indices, operador, umbral in comparaciones):
+                    yield posicion
+            return
+
+        if instrumentacion.ACTIVA:
+            instrumentacion.contar("filas_recorridas", len(matriz))
+        # Recorrido completo: cada filtro es un iterador de bools sobre su columna, combinados
+        # con map/zip/compress para que el ciclo por fila no pase por codigo Python
+        pruebas = [map(coincidentes.__contains__, columna) for columna, coincidentes in codigos]
+        for indices, operador, umbral in comparaciones:
+            if len(indices) == 1:
+                valores = matriz.columnas[indices[0]]
+            else:
+                valores = map(promediar, *(matriz.columnas[indice] for indice in indices))
+            pruebas.append(map(operador, valores, repeat(umbral)))
+        if not pruebas:
+            yield from range(len(matriz))
+        elif len(pruebas) == 1:
+            yield from compress(range(len(matriz)), pruebas[0])
+        else:
+            yield from compress(range(len(matriz)), map(all, zip(*pruebas)))
+        return
+
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("filas_recorridas", len(matriz))
+    for posicion, personaje in enumerate(matriz):
+        if not all(condicion.evaluar(personaje[condicion.indice_columna]) for condicion in condiciones):
+            continue
+        if all(cumple_comparacion([personaje[indice] for indice in indices], operador, umbral)
+                for indices, operador, umbral in comparaciones):
+            yield posicion
+
+
+def promediar(*valores) -> float:
+    """
+    Retorna el promedio de los stats de una fila (ej: (poder + inteligencia + velocidad) / 3).
+    """
+    return sum(valores) / len(valores)
+
+
+def cumple_comparacion(valores: list, operador, umbral) -> bool:
+    """
+    Compara un stat, o el promedio de varios stats de una fila, contra el umbral.
+    """
+    if len(valores) == 1:
+        return operador(valores[0], umbral)
+    return operador(promediar(*valores), umbral)
+
+
+def ordenar_posiciones(matriz, posiciones: list, orden: tuple) -> list:
+    """
+    Ordena posiciones por varias columnas con sorts estables sucesivos, del criterio
+    menos importante al mas importante.
+    """
+    for indice_columna, descendente in reversed(orden):
+        if isinstance(matriz, AlmacenPersonajes) and indice_columna in COLUMNAS_TEXTO:
+            # Compara el lugar de cada codigo en el orden alfabetico de sus cadenas, sin
+            # decodificar la columna: ordenar enteros es mas rapido que ordenar cadenas
+            valores = matriz.diccionarios[indice_columna].valores
+            rangos = [0] * len(valores)
+            for rango, codigo in enumerate(sorted(range(len(valores)), key=valores.__getitem__)):
+                rangos[codigo] = rango
+            claves = list(map(rangos.__getitem__, matriz.columnas[indice_columna]))
+        else:
+            claves = VistaColumna(matriz, indice_columna).valores()
+        posiciones.sort(key=claves.__getitem__, reverse=descendente)
+    return posiciones
+
+
+def iterar_posiciones(consulta: Consulta, matriz, umbrales: dict, plan: dict):
+    """
+    Retorna las posiciones resultantes de la consulta, ya ordenadas y limitadas. Sin orden
+    es un generador: el recorrido avanza solo a medida que se consumen las posiciones.
+    """
+    posiciones = generar_posiciones(matriz, consulta.filtros, umbrales, plan)
+    if consulta.orden:
+        posiciones = ordenar_posiciones(matriz, list(posiciones), consulta.orden)
+    if consulta.limite is not None:
+        posiciones = islice(posiciones, consulta.limite)
+    return posiciones
+
+
+def ejecutar_consulta(consulta: Consulta, matriz) -> ResultadoConsulta:
+    """
+    Ejecuta una consulta sobre la matriz.
+
+    Args:
+        consulta (Consulta): Consulta a ejecutar.
+        matriz (list | AlmacenPersonajes): Matriz de personajes.
+
+    Returns:
+        ResultadoConsulta: valores de las agregaciones y, segun la seleccion, la lista
+            de filas y/o la cantidad de personajes que cumplen los filtros.
+    """
+    plan = planificar(consulta, matriz)
+    valores, umbrales = calcular_agregaciones(consulta, matriz, plan)
+
+    if consulta.seleccion == "ninguna":
+        return ResultadoConsulta(valores)
+    if consulta.seleccion == "cantidad":
+        if plan["candidatos"] == "conteo":
+            condicion = plan["condicion_indice"]
+            cantidad = matriz.contar_coincidentes(condicion.indice_columna, condicion.evaluar)
+        elif not consulta.filtros:
+            cantidad = len(matriz)
+        else:
+            cantidad = sum(1 for _ in generar_posiciones(matriz, consulta.filtros, umbrales, plan))
+        if consulta.limite is not None:
+            cantidad = min(cantidad, consulta.limite)
+        return ResultadoConsulta(valores, cantidad=cantidad)
+
+    posiciones = list(iterar_posiciones(consulta, matriz, umbrales, plan))
+    filas = filas_en_posiciones(matriz, posiciones)
+    return ResultadoConsulta(valores, filas, len(filas))
+
+
+# Opciones del menu expresadas como consultas
+NO_HUMAN = negar(contiene(2, "Human"))
+
+CONSULTA_CANTIDAD = Consulta(seleccion="cantidad")
+CONSULTA_CANTIDAD_HUMAN = Consulta([contiene_palabra(2, "Human")], seleccion="cantidad")
+CONSULTA_CANTIDAD_NO_HUMAN = Consulta([negar(contiene_palabra(2, "Human"))], seleccion="cantidad")
+CONSULTA_TODOS = Consulta()
+CONSULTA_SAIYAN = Consulta([contiene_palabra(2, "Saiyan")])
+CONSULTA_MAS_PODEROSOS = Consulta(
+    [Comparacion(4, "==", "maximo")],
+    {"maximo": Agregacion(4, "maximo")},
+)
+CONSULTA_MAS_INTELIGENTES = Consulta(
+    [Comparacion(5, "==", "maximo")],
+    {"maximo": Agregacion(5, "maximo")},
+)
+CONSULTA_MENOS_VELOCIDAD = Consulta(
+    [Comparacion(6, "<", "promedio")],
+    {"promedio": Agregacion(6)},
+)
+CONSULTA_DEBILES = Consulta(
+    [Comparacion(4, "<", "poder_minimo_saiyan")],
+    {"poder_minimo_saiyan": Agregacion(4, "minimo", [contiene(2, "Saiyan")], si_vacio=0)},
+)
+CONSULTA_NO_BINARIO_VELOCES = Consulta(
+    [igual(3, "No-Binario"), Comparacion(6, "==", "maxima_velocidad")],
+    {"maxima_velocidad": Agregacion(6, "maximo", [igual(3, "No-Binario")])},
+)
+CONSULTA_PROMEDIOS_ANDROID = Consulta(
+    agregaciones={
+        "promedio_inteligencia": Agregacion(5, filtros=[contiene(2, "Android")]),
+        "promedio_poder": Agregacion(4, filtros=[contiene(2, "Android")]),
+    },
+    seleccion="ninguna",
+)
+CONSULTA_KRYPTONIAN = Consulta(
+    [negar(contiene(2, "Kryptonian")), Comparacion(4, ">", "promedio_poder_kryptonian")],
+    {"promedio_poder_kryptonian": Agregacion(4, filtros=[contiene(2, "Kryptonian")])},
+)
+CONSULTA_SAIYAN_POWER = Consulta(
+    [negar(contiene(2, "Saiyan")), Comparacion((4, 5, 6), "<", "indice_ataque_saiyan")],
+    {"indice_ataque_saiyan": Agregacion((4, 5, 6), filtros=[contiene(2, "Saiyan")])},
+)
+CONSULTA_MAS_INTELIGENTE = Consulta(orden=[(5, True)])
+CONSULTA_MENOS_INTELIGENTE_NO_HUMAN = Consulta([NO_HUMAN], orden=[(5, False)])
+CONSULTA_MAS_PODER_NO_HUMAN = Consulta([NO_HUMAN], orden=[(4, True)])
+CONSULTA_MAS_VELOCIDAD = Consulta(orden=[(6, True)])
+CONSULTA_PERSONALIZADA = Consulta(orden=[(2, False), (4, True)])
+
+CONSULTAS_MENU = {
+    3: CONSULTA_CANTIDAD,
+    4: CONSULTA_CANTIDAD_HUMAN,
+    5: CONSULTA_CANTIDAD_NO_HUMAN,
+    6: CONSULTA_TODOS,
+    7: CONSULTA_SAIYAN,
+    8: CONSULTA_MAS_PODEROSOS,
+    9: CONSULTA_MAS_INTELIGENTES,
+    10: CONSULTA_MENOS_VELOCIDAD,
+    11: CONSULTA_DEBILES,
+    12: CONSULTA_NO_BINARIO_VELOCES,
+    13: CONSULTA_PROMEDIOS_ANDROID,
+    14: CONSULTA_KRYPTONIAN,
+    15: CONSULTA_SAIYAN_POWER,
+    16: CONSULTA_MAS_INTELIGENTE,
+    17: CONSULTA_MENOS_INTELIGENTE_NO_HUMAN,
+    18: CONSULTA_MAS_PODER_NO_HUMAN,
+    19: CONSULTA_MAS_VELOCIDAD,
+    20: CONSULTA_PERSONALIZADA,
+}
+
+
+def ejecutar_opcion_menu(matriz, opcion: int) -> ResultadoConsulta:
+    """
+    Ejecuta la consulta de una opcion del menu (3 a 20). Recibe primero la matriz para
+    poder usarse con cache_resultados.ejecutar_con_cache.
+
+    Args:
+        matriz (list | AlmacenPersonajes): Matriz de personajes.
+        opcion (int): Numero de opcion en CONSULTAS_MENU.
+
+    Returns:
+        ResultadoConsulta: Resultado de la consulta de la opcion.
+    """
+    return ejecutar_consulta(CONSULTAS_MENU[opcion], matriz)
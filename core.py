@@ -1,153 +1,192 @@
 """
 Modulo principal del programa.
 """
+from typing import Optional
 
-from utn_fra.datasets import (
-lista_nombre_heroes_pp, lista_alias_pp,
-    lista_razas_pp, lista_generos_pp,
-    lista_poderes_pp, lista_inteligencias_pp,
-lista_velocidades_pp
-)
-
+import cache_resultados
+import consultas
+import instrumentacion
 import menu
 import operaciones_datos
 import operaciones_estadisticas
 import operaciones_ordenamiento
+import persistencia
+import registro_cambios
 import utils
 
-def ejecutar_programa() -> None:
+def ejecutar_programa(ruta_datos: Optional[str] = None, ruta_metricas: Optional[str] = None) -> None:
     """
     Función principal que ejecuta el programa de análisis de datos de superhéroes y villanos.
     
     Args:
-        Ninguno
+        ruta_datos (str, opcional): Archivo CSV, JSON Lines, Parquet o snapshot (.pjs) con
+                                los personajes que carga la opcion 1. None usa el dataset
+                                de utn_fra. Si es un snapshot, los personajes agregados se
+                                anotan en su registro de cambios (ruta + ".wal") y se
+                                compactan en el snapshot al salir.
+        ruta_metricas (str, opcional): Si se indica, se mide cada opcion (ver instrumentacion)
+                                    y al salir se guardan las metricas en este archivo
+                                    (.prom para Prometheus, cualquier otra extension para JSON).
         
     Returns:
         None
     """
     matriz = []
+    registro = None
+    compactacion = None
+    usa_snapshot = ruta_datos is not None and ruta_datos.endswith(persistencia.EXTENSION_SNAPSHOT)
+    if ruta_metricas is not None:
+        instrumentacion.configurar(True)
 
     print("¡Bienvenido a la aplicacion de analisis de datos de superheroes y villanos!")
     input("Presione Enter para continuar...")
 
     while True:
         opcion = menu.pedir_opcion()
-        match opcion:
-            case 1:
-                matriz = operaciones_datos.crear_matriz(
-                    lista_nombre_heroes_pp, lista_alias_pp,
-                    lista_razas_pp, lista_generos_pp,
-                    lista_poderes_pp, lista_inteligencias_pp,
-                    lista_velocidades_pp
-                )
-                print(f"Matriz cargada con {len(matriz)} personajes.\n")
-                input("Presione Enter para continuar...")
-            case 2:
-                if utils.verificar_matriz_vacia(matriz, "agregar personaje"):   
-                    continue
-                nuevo_personaje = menu.pedir_datos_personaje()
-                if utils.validar_personaje_completo(nuevo_personaje):
-                    matriz = operaciones_datos.agregar_personaje(matriz, nuevo_personaje)
-                    print(f"Personaje {nuevo_personaje[0]} agregado exitosamente.")
-                else:
-                    print("No se pudo agregar el personaje. Datos incompletos.")
-                input("Presione Enter para continuar...")
-            case 3:
-                cantidad = operaciones_datos.mostrar_cantidad_personajes(len(matriz))
-            case 4:
-                personajes_human = operaciones_datos.filtrar_personajes_raza(matriz, "Human")
-                print(f"Cantidad de personajes Human: {len(personajes_human)}")
-                input("Presione Enter para continuar...")
-            case 5:
-                personajes_human = operaciones_datos.filtrar_personajes_raza(matriz, "Human")
-                cantidad_no_human = len(matriz) - len(personajes_human)
-                print(f"Cantidad de personajes que no son Human: {cantidad_no_human}")
-                input("Presione Enter para continuar...")
-            case 6:
-                menu.mostrar_detalle_personajes(matriz)
-            case 7:
-                saiyans = operaciones_datos.filtrar_personajes_raza(matriz, "Saiyan")
-                menu.mostrar_detalle_personajes(saiyans, "PERSONAJES DE RAZA SAIYAN")
-            case 8:
-                if utils.verificar_matriz_vacia(matriz, "encontrar personajes mas poderosos"):
-                    continue
-                mas_poderosos = operaciones_datos.encontrar_personajes_mas_poderosos(matriz)
-                menu.mostrar_detalle_personajes(mas_poderosos, "PERSONAJES MAS PODEROSOS")
-            case 9:
-                if utils.verificar_matriz_vacia(matriz, "encontrar personajes mas inteligentes"):
-                    continue
-                mas_inteligentes = operaciones_datos.encontrar_personajes_mas_inteligente(matriz)
-                menu.mostrar_detalle_personajes(mas_inteligentes, "PERSONAJES MAS INTELIGENTES")
-            case 10:
-                if utils.verificar_matriz_vacia(matriz, "filtrar por velocidad"):
-                    continue
-                personajes_filtrados, promedio = operaciones_estadisticas.filtrar_menos_velocidad(matriz)
-                print(f"Promedio de Velocidad: {promedio:.2f}")
-                menu.mostrar_detalle_personajes(personajes_filtrados, "PERSONAJES CON VELOCIDAD MENOR AL PROMEDIO")
-            case 11:
-                if utils.verificar_matriz_vacia(matriz, "filtrar personajes debiles"):
-                    continue
-                personajes, poder_min_saiyan = operaciones_estadisticas.filtrar_debiles(matriz)
-                print(f"Poder minimo entre Saiyan: {poder_min_saiyan}")
-                menu.mostrar_detalle_personajes(personajes, "PERSONAJES MAS DEBILES QUE LOS SAIYAN")
-            case 12:
-                if utils.verificar_matriz_vacia(matriz, "filtrar no-binario veloces"):
-                    continue
-                personajes, max_velocidad = operaciones_estadisticas.filtrar_no_binario_veloces(matriz)
-                print(f"Maxima Velocidad No-Binario: {max_velocidad:.2f}")
-                menu.mostrar_detalle_personajes(personajes, "PERSONAJES NO-BINARIO CON VELOCIDAD MAXIMA")
-            case 13:
-                if utils.verificar_matriz_vacia(matriz, "calcular promedios de inteligencia"):
-                    continue
-                promedio_inteligencia, promedio_poder = operaciones_estadisticas.calcular_promedio_android(matriz)
-                print(f"Promedio de Inteligencia de Android: {promedio_inteligencia:.2f}")
-                print(f"Promedio de Poder de Android: {promedio_poder:.2f}")
-                input("Presione Enter para continuar...")
-            case 14:
-                if utils.verificar_matriz_vacia(matriz, "filtrar personajes Kryptonian"):
-                    continue
-                personajes, promedio_poder_kryptonian = operaciones_estadisticas.filtrar_kryptonian_poder(matriz)
-                print(f"Promedio de Poder de Kryptonian: {promedio_poder_kryptonian:.2f}")
-                menu.mostrar_detalle_personajes(personajes, "PERSONAJES NO KRYPTONIAN CON PODER SUPERIOR AL PROMEDIO DE KRYPTONIAN")
-            case 15:
-                if utils.verificar_matriz_vacia(matriz, "filtrar personajes Saiyan Power"):
-                    continue
-                personajes, poder_minimo_saiyan = operaciones_estadisticas.filtrar_saiyan_poder(matriz)
-                print(f"Indice de Ataque Saiyan: {poder_minimo_saiyan:.2f}")
-                menu.mostrar_detalle_personajes(personajes, "PERSONAJES NO SAIYAN CON STATS POR DEBAJO DEL INDICE DE ATAQUE SAIYAN")
-            case 16:
-                if utils.verificar_matriz_vacia(matriz, "ordenar personajes por inteligencia"):
-                    continue
-                matriz_ordenada = operaciones_ordenamiento.ordenar_por_stat(matriz, 5, descendente=True)
-                menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES ORDENADOS POR MAS INTELIGENTE (DESCENDENTE)")
-            case 17:
-                if utils.verificar_matriz_vacia(matriz, "ordenar personajes por menos inteligencia"):
-                    continue
-                matriz_ordenada = operaciones_ordenamiento.ordenar_por_stat(matriz, 5, descendente=False, excluir_raza="Human")
-                menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES (MENOS HUMAN) ORDENADOS POR MENOS INTELIGENTE (ASCENDENTE)")
-            case 18:
-                if utils.verificar_matriz_vacia(matriz, "ordenar personajes por poder"):
-                    continue
-                matriz_ordenada = operaciones_ordenamiento.ordenar_por_stat(matriz, 4, descendente=True, excluir_raza="Human")
-                menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES (MENOS HUMAN) ORDENADOS POR MAS PODER (DESCENDENTE)")
-            case 19:
-                if utils.verificar_matriz_vacia(matriz, "ordenar personajes por velocidad"):
-                    continue
-                matriz_ordenada = operaciones_ordenamiento.ordenar_por_stat(matriz, 6, descendente=True)
-                menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES ORDENADOS POR MAS VELOCIDAD (DESCENDENTE)")
-            case 20:
-                if utils.verificar_matriz_vacia(matriz, "ordenar personajes por criterio personalizado"):
-                    continue
-                matriz_ordenada = operaciones_ordenamiento.ordenar_personalizado(matriz)
-                menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES ORDENADOS ALFABETICAMENTE POR RAZA (PODER DESCENDENTE)")
-            case 21:
-                if utils.verificar_matriz_vacia(matriz, "trasponer datos"):
-                    continue
-                matriz_traspuesta = operaciones_ordenamiento.trasponer_matriz(matriz)
-                menu.mostrar_matriz_traspuesta(matriz_traspuesta)
-            case 22:
-                print("¡Hasta luego!")
-                break
-
-
-
+        with instrumentacion.medir_operacion(opcion):
+            match opcion:
+                case 1:
+                    # Import diferido: el cargador y el dataset solo se necesitan en esta opcion
+                    import cargador_datos
+                    try:
+                        if usa_snapshot:
+                            if registro is not None:
+                                registro.cerrar()
+                                registro = None
+                            ruta_registro = ruta_datos + registro_cambios.EXTENSION_REGISTRO
+                            matriz = registro_cambios.recuperar(ruta_datos, ruta_registro)
+                            registro = registro_cambios.RegistroEscritura(ruta_registro)
+                        elif ruta_datos is not None:
+                            matriz, reporte = cargador_datos.cargar_archivo(ruta_datos)
+                            cargador_datos.mostrar_reporte_carga(reporte)
+                        else:
+                            matriz = cargador_datos.cargar_dataset_utn()
+                    except (OSError, ValueError) as error:
+                        # La matriz anterior queda como estaba
+                        print(f"Error: No se pudo cargar {ruta_datos}: {error}\n")
+                    else:
+                        print(f"Matriz cargada con {len(matriz)} personajes.\n")
+                    instrumentacion.pedir_entrada("Presione Enter para continuar...")
+                case 2:
+                    if utils.verificar_matriz_vacia(matriz, "agregar personaje"):   
+                        continue
+                    nuevo_personaje = menu.pedir_datos_personaje()
+                    if utils.validar_personaje_completo(nuevo_personaje):
+                        if registro is not None:
+                            # Primero queda en disco y recien despues se aplica a la matriz
+                            registro.registrar(nuevo_personaje, len(matriz))
+                        matriz = operaciones_datos.agregar_personaje(matriz, nuevo_personaje)
+                        if registro is not None and registro.tamano() > registro_cambios.UMBRAL_COMPACTACION:
+                            if compactacion is None or not compactacion.is_alive():
+                                compactacion = registro.compactar(matriz, ruta_datos)
+                        print(f"Personaje {nuevo_personaje[0]} agregado exitosamente.")
+                    else:
+                        print("No se pudo agregar el personaje. Datos incompletos.")
+                    instrumentacion.pedir_entrada("Presione Enter para continuar...")
+                case 3:
+                    cantidad = operaciones_datos.mostrar_cantidad_personajes(consultas.ejecutar_opcion_menu(matriz, 3).cantidad)
+                case 4:
+                    cantidad_human = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 4).cantidad
+                    print(f"Cantidad de personajes Human: {cantidad_human}")
+                    instrumentacion.pedir_entrada("Presione Enter para continuar...")
+                case 5:
+                    cantidad_no_human = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 5).cantidad
+                    print(f"Cantidad de personajes que no son Human: {cantidad_no_human}")
+                    instrumentacion.pedir_entrada("Presione Enter para continuar...")
+                case 6:
+                    menu.mostrar_detalle_personajes(consultas.ejecutar_opcion_menu(matriz, 6).filas)
+                case 7:
+                    saiyans = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 7).filas
+                    menu.mostrar_detalle_personajes(saiyans, "PERSONAJES DE RAZA SAIYAN")
+                case 8:
+                    if utils.verificar_matriz_vacia(matriz, "encontrar personajes mas poderosos"):
+                        continue
+                    mas_poderosos = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 8).filas
+                    menu.mostrar_detalle_personajes(mas_poderosos, "PERSONAJES MAS PODEROSOS")
+                case 9:
+                    if utils.verificar_matriz_vacia(matriz, "encontrar personajes mas inteligentes"):
+                        continue
+                    mas_inteligentes = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 9).filas
+                    menu.mostrar_detalle_personajes(mas_inteligentes, "PERSONAJES MAS INTELIGENTES")
+                case 10:
+                    if utils.verificar_matriz_vacia(matriz, "filtrar por velocidad"):
+                        continue
+                    personajes_filtrados, promedio = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_menos_velocidad, matriz)
+                    print(f"Promedio de Velocidad: {promedio:.2f}")
+                    menu.mostrar_detalle_personajes(personajes_filtrados, "PERSONAJES CON VELOCIDAD MENOR AL PROMEDIO")
+                case 11:
+                    if utils.verificar_matriz_vacia(matriz, "filtrar personajes debiles"):
+                        continue
+                    personajes, poder_min_saiyan = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_debiles, matriz)
+                    print(f"Poder minimo entre Saiyan: {poder_min_saiyan}")
+                    menu.mostrar_detalle_personajes(personajes, "PERSONAJES MAS DEBILES QUE LOS SAIYAN")
+                case 12:
+                    if utils.verificar_matriz_vacia(matriz, "filtrar no-binario veloces"):
+                        continue
+                    personajes, max_velocidad = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_no_binario_veloces, matriz)
+                    if max_velocidad is None:
+                        print("No hay personajes No-Binario.")
+                    else:
+                        print(f"Maxima Velocidad No-Binario: {max_velocidad:.2f}")
+                    menu.mostrar_detalle_personajes(personajes, "PERSONAJES NO-BINARIO CON VELOCIDAD MAXIMA")
+                case 13:
+                    if utils.verificar_matriz_vacia(matriz, "calcular promedios de inteligencia"):
+                        continue
+                    promedio_inteligencia, promedio_poder = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.calcular_promedio_android, matriz)
+                    print(f"Promedio de Inteligencia de Android: {promedio_inteligencia:.2f}")
+                    print(f"Promedio de Poder de Android: {promedio_poder:.2f}")
+                    instrumentacion.pedir_entrada("Presione Enter para continuar...")
+                case 14:
+                    if utils.verificar_matriz_vacia(matriz, "filtrar personajes Kryptonian"):
+                        continue
+                    personajes, promedio_poder_kryptonian = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_kryptonian_poder, matriz)
+                    print(f"Promedio de Poder de Kryptonian: {promedio_poder_kryptonian:.2f}")
+                    menu.mostrar_detalle_personajes(personajes, "PERSONAJES NO KRYPTONIAN CON PODER SUPERIOR AL PROMEDIO DE KRYPTONIAN")
+                case 15:
+                    if utils.verificar_matriz_vacia(matriz, "filtrar personajes Saiyan Power"):
+                        continue
+                    personajes, poder_minimo_saiyan = cache_resultados.ejecutar_con_cache(operaciones_estadisticas.filtrar_saiyan_poder, matriz)
+                    print(f"Indice de Ataque Saiyan: {poder_minimo_saiyan:.2f}")
+                    menu.mostrar_detalle_personajes(personajes, "PERSONAJES NO SAIYAN CON STATS POR DEBAJO DEL INDICE DE ATAQUE SAIYAN")
+                case 16:
+                    if utils.verificar_matriz_vacia(matriz, "ordenar personajes por inteligencia"):
+                        continue
+                    matriz_ordenada = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 16).filas
+                    menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES ORDENADOS POR MAS INTELIGENTE (DESCENDENTE)")
+                case 17:
+                    if utils.verificar_matriz_vacia(matriz, "ordenar personajes por menos inteligencia"):
+                        continue
+                    matriz_ordenada = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 17).filas
+                    menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES (MENOS HUMAN) ORDENADOS POR MENOS INTELIGENTE (ASCENDENTE)")
+                case 18:
+                    if utils.verificar_matriz_vacia(matriz, "ordenar personajes por poder"):
+                        continue
+                    matriz_ordenada = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 18).filas
+                    menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES (MENOS HUMAN) ORDENADOS POR MAS PODER (DESCENDENTE)")
+                case 19:
+                    if utils.verificar_matriz_vacia(matriz, "ordenar personajes por velocidad"):
+                        continue
+                    matriz_ordenada = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 19).filas
+                    menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES ORDENADOS POR MAS VELOCIDAD (DESCENDENTE)")
+                case 20:
+                    if utils.verificar_matriz_vacia(matriz, "ordenar personajes por criterio personalizado"):
+                        continue
+                    matriz_ordenada = cache_resultados.ejecutar_con_cache(consultas.ejecutar_opcion_menu, matriz, 20).filas
+                    menu.mostrar_detalle_personajes(matriz_ordenada, "PERSONAJES ORDENADOS ALFABETICAMENTE POR RAZA (PODER DESCENDENTE)")
+                case 21:
+                    if utils.verificar_matriz_vacia(matriz, "trasponer datos"):
+                        continue
+                    matriz_traspuesta = operaciones_ordenamiento.trasponer_matriz(matriz)
+                    menu.mostrar_matriz_traspuesta(matriz_traspuesta)
+                case 22:
+                    if registro is not None:
+                        if compactacion is not None:
+                            compactacion.join()
+                        if registro.tamano() > 0:
+                            registro.compactar(matriz, ruta_datos).join()
+                            print(f"Cambios guardados en {ruta_datos}.")
+                        registro.cerrar()
+                    print("¡Hasta luego!")
+                    break
+    if ruta_metricas is not None:
+        instrumentacion.guardar_metricas(ruta_metricas)
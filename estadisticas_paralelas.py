@@ -0,0 +1,350 @@
+"""
+Ejecucion particionada y en paralelo de las funciones de operaciones_estadisticas.
+
+Un EjecutorParalelo copia una vez las columnas de raza, genero y stats del almacen a
+bloques de memoria compartida (multiprocessing.shared_memory) y reparte el almacen
+en particiones entre un pool de procesos. Cada proceso lee su particion directamente
+de la memoria compartida, sin que se serialicen filas, y retorna agregados parciales
+(cantidad, suma, minimo, maximo y posiciones del maximo) o las posiciones que cumplen
+un filtro. El proceso principal combina los parciales con agregados.combinar_agregados
+y arma las filas resultantes.
+
+Los resultados son identicos a los del camino serial: las sumas son enteras, los
+promedios se calculan con la misma division y las posiciones (incluidas las de los
+empates en el maximo) se combinan en orden ascendente.
+"""
+import operator
+import os
+import threading
+from array import array
+from itertools import compress, repeat
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Tuple
+
+from agregados import Agregado, combinar_agregados, COLUMNAS_STATS
+from almacen_personajes import AlmacenPersonajes
+from vistas_columnas import filas_en_posiciones
+
+COLUMNAS_COMPARTIDAS = (2, 3, 4, 5, 6)  # Raza, genero, poder, inteligencia, velocidad
+PARTICIONES_POR_PROCESO = 4
+OPERADORES = {"<": operator.lt, ">": operator.gt, "==": operator.eq}
+
+# Bloques de memoria compartida ya abiertos en cada proceso del pool, por nombre. Solo
+# guarda los de la version del almacen que uso la ultima tarea
+bloques_abiertos = {}
+
+
+def cerrar_bloques_anteriores(nombres: dict) -> None:
+    """
+    Cierra en el proceso los bloques abiertos que no son de la version que usa la tarea.
+    El proceso principal ya les hizo unlink() al exportar otra version, pero el sistema
+    no libera la memoria mientras algun proceso la siga teniendo abierta.
+
+    Args:
+        nombres (dict): Nombres de los bloques de la tarea, por indice de columna.
+
+    Returns:
+        None
+    """
+    vigentes = set(nombres.values())
+    for nombre in [nombre for nombre in bloques_abiertos if nombre not in vigentes]:
+        bloques_abiertos.pop(nombre).close()
+
+
+def abrir_columna(nombre: str, cantidad: int) -> memoryview:
+    """
+    Abre (una sola vez por proceso) un bloque de memoria compartida y lo retorna como
+    columna de enteros.
+
+    Args:
+        nombre (str): Nombre del bloque.
+        cantidad (int): Cantidad de enteros de la columna.
+
+    Returns:
+        memoryview: Vista de enteros (int32) sobre el bloque.
+    """
+    bloque = bloques_abiertos.get(nombre)
+    if bloque is None:
+        # Los procesos del pool comparten el resource_tracker del proceso principal, que
+        # es quien libera el bloque con unlink(); aca solo se abre
+        bloque = SharedMemory(name=nombre)
+        bloques_abiertos[nombre] = bloque
+    return bloque.buf.cast('i')[:cantidad]
+
+
+def agregar_particion(tarea: tuple) -> dict:
+    """
+    Calcula los agregados de varios stats en una particion. Se ejecuta en el pool.
+
+    Args:
+        tarea (tuple): (nombres de los bloques, cantidad total, inicio, fin, indices_stat,
+                    indice de la columna a filtrar o None, codigos aceptados).
+
+    Returns:
+        dict: {indice_stat: (cantidad, suma, minimo, maximo, posiciones_maximo)}.
+    """
+    nombres, cantidad, inicio, fin, indices_stat, indice_filtro, codigos = tarea
+    cerrar_bloques_anteriores(nombres)
+    posiciones = range(inicio, fin)
+    if indice_filtro is not None:
+        filtro = abrir_columna(nombres[indice_filtro], cantidad)
+        posiciones = list(compress(posiciones, map(codigos.__contains__, filtro[inicio:fin])))
+
+    parciales = {}
+    for indice_stat in indices_stat:
+        columna = abrir_columna(nombres[indice_stat], cantidad)
+        if indice_filtro is None:
+            valores = columna[inicio:fin].tolist()
+        else:
+            valores = list(map(columna.__getitem__, posiciones))
+        if not valores:
+            parciales[indice_stat] = (0, 0, None, None, [])
+            continue
+        maximo = max(valores)
+        posiciones_maximo = list(compress(posiciones, map(maximo.__eq__, valores)))
+        parciales[indice_stat] = (len(valores), sum(valores), min(valores), maximo, posiciones_maximo)
+    return parciales
+
+
+def filtrar_particion(tarea: tuple) -> list:
+    """
+    Retorna las posiciones de una particion que cumplen un filtro. Se ejecuta en el pool.
+    El filtro es: raza fuera de los codigos excluidos (si se indican) y el stat, o el
+    promedio de varios stats de la fila, comparado contra un umbral.
+
+    Args:
+        tarea (tuple): (nombres de los bloques, cantidad total, inicio, fin, codigos de raza
+                    excluidos o None, indices de los stats, operador "<", ">" o "==", umbral).
+
+    Returns:
+        list: Posiciones que cumplen el filtro, en orden ascendente.
+    """
+    nombres, cantidad, inicio, fin, razas_excluidas, indices_stat, operador, umbral = tarea
+    cerrar_bloques_anteriores(nombres)
+    columnas = [abrir_columna(nombres[indice], cantidad)[inicio:fin].tolist() for indice in indices_stat]
+    if len(columnas) == 1:
+        valores = columnas[0]
+    else:
+        valores = map(promediar_fila, *columnas)
+
+    cumplen = compress(range(inicio, fin), map(OPERADORES[operador], valores, repeat(umbral)))
+    if razas_excluidas is None:
+        return list(cumplen)
+    razas = abrir_columna(nombres[2], cantidad)
+    return [posicion for posicion in cumplen if razas[posicion] not in razas_excluidas]
+
+
+def promediar_fila(*valores) -> float:
+    """
+    Retorna el promedio de los stats de una fila, igual que consultas.promediar.
+    """
+    return sum(valores) / len(valores)
+
+
+class EjecutorParalelo:
+    """
+    Pool de procesos y memoria compartida para calcular estadisticas por particiones.
+    Se usa como context manager o cerrandolo con cerrar().
+    """
+
+    def __init__(self, procesos: Optional[int] = None) -> None:
+        """
+        Args:
+            procesos (int, opcional): Cantidad de procesos del pool. None usa os.cpu_count().
+        """
+        self.procesos = procesos or os.cpu_count() or 1
+        resource_tracker.ensure_running()  # Antes del pool, para que los procesos lo hereden
+        self.pool = Pool(self.procesos)
+        self.bloques = {}
+        self.almacen = None
+        self.clave_almacen = None
+        # Exportar una version libera los bloques de la anterior: un hilo no puede
+        # exportar mientras las tareas de otro leen los bloques (ej: el pool de servidor.py)
+        self.cerrojo = threading.Lock()
+
+    def __enter__(self) -> "EjecutorParalelo":
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    def liberar_bloques(self) -> None:
+        """
+        Libera los bloques de memoria compartida del almacen exportado.
+
+        Returns:
+            None
+        """
+        for bloque in self.bloques.values():
+            bloque.close()
+            bloque.unlink()
+        self.bloques = {}
+        self.clave_almacen = None
+
+    def cerrar(self) -> None:
+        """
+        Detiene el pool y libera la memoria compartida.
+
+        Returns:
+            None
+        """
+        with self.cerrojo:
+            self.pool.terminate()
+            self.pool.join()
+            self.liberar_bloques()
+
+    def preparar(self, matriz) -> AlmacenPersonajes:
+        """
+        Copia las columnas del almacen a memoria compartida, salvo que ya esten copiadas
+        para esta misma version del almacen. Se llama con el cerrojo tomado, hasta que
+        terminen las tareas que leen los bloques.
+
+        Args:
+            matriz (list | AlmacenPersonajes): Matriz de personajes. Una lista se convierte
+                                            antes a AlmacenPersonajes.
+
+        Returns:
+            AlmacenPersonajes: El almacen exportado.
+        """
+        if not isinstance(matriz, AlmacenPersonajes):
+            almacen = AlmacenPersonajes()
+            almacen.agregar_varios(matriz)
+            matriz = almacen
+        clave = (matriz.identificador, matriz.version)
+        if clave == self.clave_almacen:
+            return self.almacen
+
+        self.liberar_bloques()
+        for indice in COLUMNAS_COMPARTIDAS:
+            datos = array('i', matriz.columnas[indice])
+            bloque = SharedMemory(create=True, size=max(len(datos) * datos.itemsize, 1))
+            bloque.buf[:len(datos) * datos.itemsize] = datos.tobytes()
+            self.bloques[indice] = bloque
+        self.almacen = matriz
+        self.clave_almacen = clave
+        return matriz
+
+    def particiones(self, cantidad: int) -> list:
+        """
+        Divide el rango [0, cantidad) en particiones contiguas.
+
+        Returns:
+            list: Tuplas (inicio, fin).
+        """
+        if cantidad == 0:
+            return []
+        cantidad_particiones = max(1, min(cantidad, self.procesos * PARTICIONES_POR_PROCESO))
+        tamano = -(-cantidad // cantidad_particiones)
+        return [(inicio, min(inicio + tamano, cantidad)) for inicio in range(0, cantidad, tamano)]
+
+    def agregados(self, matriz, indices_stat: list, indice_filtro=None, predicado=None) -> dict:
+        """
+        Calcula en paralelo los agregados de varios stats, opcionalmente solo para los
+        personajes cuya raza o genero cumple un predicado.
+
+        Args:
+            matriz (list | AlmacenPersonajes): Matriz de personajes.
+            indices_stat (list): Stats a agregar (4, 5, 6).
+            indice_filtro (int, opcional): 2 = raza, 3 = genero.
+            predicado (callable, opcional): Funcion que recibe el texto y retorna bool.
+
+        Returns:
+            dict: {indice_stat: Agregado} con las posiciones del maximo en orden ascendente.
+        """
+        with self.cerrojo:
+            almacen = self.preparar(matriz)
+            codigos = None
+            if indice_filtro is not None:
+                codigos = almacen.codigos_coincidentes(indice_filtro, predicado)
+            nombres = {indice: bloque.name for indice, bloque in self.bloques.items()}
+            tareas = [(nombres, len(almacen), inicio, fin, tuple(indices_stat), indice_filtro, codigos)
+                    for inicio, fin in self.particiones(len(almacen))]
+            resultados = self.pool.map(agregar_particion, tareas)
+
+        parciales = {indice_stat: [] for indice_stat in indices_stat}
+        for resultado in resultados:
+            for indice_stat, (cantidad, suma, minimo, maximo, posiciones_maximo) in resultado.items():
+                agregado = Agregado()
+                agregado.cantidad, agregado.suma = cantidad, suma
+                agregado.minimo, agregado.maximo = minimo, maximo
+                agregado.posiciones_maximo = posiciones_maximo
+                parciales[indice_stat].append(agregado)
+        return {indice_stat: combinar_agregados(lista) for indice_stat, lista in parciales.items()}
+
+    def filtrar(self, matriz, indices_stat: tuple, operador: str, umbral, raza_excluida=None) -> list:
+        """
+        Retorna en paralelo las filas cuyo stat (o promedio de stats) cumple la comparacion.
+
+        Args:
+            matriz (list | AlmacenPersonajes): Matriz de personajes.
+            indices_stat (tuple): Stat o stats a comparar.
+            operador (str): "<", ">" o "==".
+            umbral (int | float): Valor contra el que se compara.
+            raza_excluida (str, opcional): Excluye las razas que contienen este texto.
+
+        Returns:
+            list: Filas de la matriz recibida que cumplen, en su orden original.
+        """
+        with self.cerrojo:
+            almacen = self.preparar(matriz)
+            excluidas = None
+            if raza_excluida is not None:
+                excluidas = almacen.codigos_coincidentes(2, lambda raza: raza_excluida in raza)
+            nombres = {indice: bloque.name for indice, bloque in self.bloques.items()}
+            tareas = [(nombres, len(almacen), inicio, fin, excluidas, tuple(indices_stat), operador, umbral)
+                    for inicio, fin in self.particiones(len(almacen))]
+            parciales = self.pool.map(filtrar_particion, tareas)
+
+        posiciones = []
+        for parcial in parciales:
+            posiciones.extend(parcial)
+        return filas_en_posiciones(matriz, posiciones)
+
+    # Equivalentes de las funciones de operaciones_estadisticas y operaciones_datos
+
+    def calcular_promedio(self, matriz, indice_stat: int, filtro_raza: Optional[str] = None) -> float:
+        """Equivale a operaciones_estadisticas.calcular_promedio."""
+        if filtro_raza is None:
+            return self.agregados(matriz, [indice_stat])[indice_stat].promedio()
+        return self.agregados(matriz, [indice_stat], 2, lambda raza: filtro_raza in raza)[indice_stat].promedio()
+
+    def filtrar_menos_velocidad(self, matriz) -> Tuple[list, float]:
+        """Equivale a operaciones_estadisticas.filtrar_menos_velocidad."""
+        promedio = self.calcular_promedio(matriz, 6)  # Indice 6 = velocidad
+        return self.filtrar(matriz, (6,), "<", promedio), promedio
+
+    def filtrar_debiles(self, matriz) -> Tuple[list, float]:
+        """Equivale a operaciones_estadisticas.filtrar_debiles."""
+        poder_minimo_saiyan = self.agregados(matriz, [4], 2, lambda raza: "Saiyan" in raza)[4].minimo
+        if poder_minimo_saiyan is None:
+            poder_minimo_saiyan = 0  # No hay Saiyans en la matriz
+        return self.filtrar(matriz, (4,), "<", poder_minimo_saiyan), poder_minimo_saiyan
+
+    def calcular_promedio_android(self, matriz) -> Tuple[float, float]:
+        """Equivale a operaciones_estadisticas.calcular_promedio_android."""
+        agregados = self.agregados(matriz, [5, 4], 2, lambda raza: "Android" in raza)
+        return agregados[5].promedio(), agregados[4].promedio()
+
+    def filtrar_kryptonian_poder(self, matriz) -> Tuple[list, float]:
+        """Equivale a operaciones_estadisticas.filtrar_kryptonian_poder."""
+        promedio = self.calcular_promedio(matriz, 4, filtro_raza="Kryptonian")  # Indice 4 = poder
+        return self.filtrar(matriz, (4,), ">", promedio, raza_excluida="Kryptonian"), promedio
+
+    def filtrar_saiyan_poder(self, matriz) -> Tuple[list, float]:
+        """Equivale a operaciones_estadisticas.filtrar_saiyan_poder."""
+        agregados = self.agregados(matriz, list(COLUMNAS_STATS), 2, lambda raza: "Saiyan" in raza)
+        indice_ataque_saiyan = (agregados[4].promedio() + agregados[5].promedio() + agregados[6].promedio()) / 3
+        return self.filtrar(matriz, COLUMNAS_STATS, "<", indice_ataque_saiyan, raza_excluida="Saiyan"), indice_ataque_saiyan
+
+    def filtrar_no_binario_veloces(self, matriz) -> Tuple[list, Optional[float]]:
+        """Equivale a operaciones_estadisticas.filtrar_no_binario_veloces; los empates se retornan en orden de aparicion."""
+        agregado = self.agregados(matriz, [6], 3, lambda genero: genero == "No-Binario")[6]
+        if agregado.cantidad == 0:
+            return [], None  # No hay personajes de genero no-Binario
+        return filas_en_posiciones(matriz, agregado.posiciones_maximo), agregado.maximo
+
+    def encontrar_personajes_maximo(self, matriz, indice_stat: int) -> list:
+        """Equivale a operaciones_datos.encontrar_personajes_maximo; los empates se retornan en orden de aparicion."""
+        agregado = self.agregados(matriz, [indice_stat])[indice_stat]
+        return filas_en_posiciones(matriz, agregado.posiciones_maximo)
@@ -0,0 +1,183 @@
+"""
+Backend vectorizado (NumPy) de operaciones_estadisticas.
+
+Cada funcion replica a su equivalente de operaciones_estadisticas usando mascaras
+booleanas y reducciones sobre columnas numericas, y retorna los mismos resultados.
+NumPy es opcional: si no esta instalado NUMPY_DISPONIBLE es False y
+operaciones_estadisticas usa su implementacion en Python puro.
+"""
+import importlib
+import importlib.util
+from typing import Optional, Tuple
+
+from almacen_personajes import AlmacenPersonajes
+
+# Solo se verifica que NumPy este instalado; se importa recien al primer uso
+# para no sumar su tiempo de carga al arranque del programa.
+NUMPY_DISPONIBLE = importlib.util.find_spec("numpy") is not None
+
+
+def obtener_numpy():
+    """
+    Importa NumPy la primera vez que se necesita y retorna el modulo.
+
+    Returns:
+        module: El modulo numpy.
+    """
+    return importlib.import_module("numpy")
+
+
+def obtener_columna_numerica(matriz, indice_stat: int):
+    """
+    Retorna una columna numerica como arreglo de NumPy. Sobre un AlmacenPersonajes
+    no copia datos: el arreglo comparte memoria con el array('i') de la columna.
+
+    Args:
+        matriz (list | AlmacenPersonajes): Matriz con los datos de los personajes.
+        indice_stat (int): Índice de la columna (4 = poder, 5 = inteligencia, 6 = velocidad).
+
+    Returns:
+        numpy.ndarray: Valores de la columna, uno por personaje.
+    """
+    np = obtener_numpy()
+    if isinstance(matriz, AlmacenPersonajes):
+        columna = matriz.columna(indice_stat)
+        return np.frombuffer(columna, dtype=np.dtype(f"i{columna.itemsize}"))
+    return np.fromiter((personaje[indice_stat] for personaje in matriz), dtype=np.int64, count=len(matriz))
+
+
+def crear_mascara(matriz, indice_columna: int, predicado):
+    """
+    Evalua un predicado sobre una columna de texto y retorna la mascara resultante.
+    Sobre un AlmacenPersonajes el predicado se evalua una vez por valor distinto.
+
+    Args:
+        matriz (list | AlmacenPersonajes): Matriz con los datos de los personajes.
+        indice_columna (int): Índice de la columna de texto (2 = raza, 3 = genero).
+        predicado (callable): Funcion que recibe el valor de la columna y retorna bool.
+
+    Returns:
+        numpy.ndarray: Arreglo booleano, True en las filas que cumplen el predicado.
+    """
+    np = obtener_numpy()
+    if isinstance(matriz, AlmacenPersonajes):
+        codigos = matriz.codigos(indice_columna)
+        codigos = np.frombuffer(codigos, dtype=np.dtype(f"i{codigos.itemsize}"))
+        coincidentes = matriz.codigos_coincidentes(indice_columna, predicado)
+        return np.isin(codigos, np.fromiter(coincidentes, dtype=codigos.dtype, count=len(coincidentes)))
+    return np.fromiter((predicado(personaje[indice_columna]) for personaje in matriz),
+                    dtype=bool, count=len(matriz))
+
+
+def seleccionar_filas(matriz, mascara) -> list:
+    """
+    Retorna las filas de la matriz donde la mascara es True, en su orden original.
+
+    Args:
+        matriz (list | AlmacenPersonajes): Matriz con los datos de los personajes.
+        mascara (numpy.ndarray): Arreglo booleano con una posicion por personaje.
+
+    Returns:
+        list: Personajes seleccionados.
+    """
+    np = obtener_numpy()
+    posiciones = np.flatnonzero(mascara).tolist()
+    if isinstance(matriz, AlmacenPersonajes):
+        return matriz.filas(posiciones)
+    return [matriz[i] for i in posiciones]
+
+
+def calcular_promedio(matriz, indice_stat: int, filtro_raza: Optional[str] = None) -> float:
+    """
+    Version vectorizada de operaciones_estadisticas.calcular_promedio.
+    """
+    columna = obtener_columna_numerica(matriz, indice_stat)
+    if filtro_raza is not None:
+        columna = columna[crear_mascara(matriz, 2, lambda raza: filtro_raza in raza)]
+    if columna.size == 0:
+        return 0
+    return int(columna.sum()) / int(columna.size)
+
+
+def filtrar_menos_velocidad(matriz) -> Tuple[list, float]:
+    """
+    Version vectorizada de operaciones_estadisticas.filtrar_menos_velocidad.
+    """
+    promedio = calcular_promedio(matriz, 6)  # Indice 6 = velocidad
+    velocidades = obtener_columna_numerica(matriz, 6)
+    return seleccionar_filas(matriz, velocidades < promedio), promedio
+
+
+def filtrar_debiles(matriz) -> Tuple[list, float]:
+    """
+    Version vectorizada de operaciones_estadisticas.filtrar_debiles.
+    """
+    poderes = obtener_columna_numerica(matriz, 4)  # Indice 4 = poder
+    poderes_saiyan = poderes[crear_mascara(matriz, 2, lambda raza: "Saiyan" in raza)]
+    if poderes_saiyan.size == 0:
+        return [], 0  # No hay Saiyans en la matriz
+
+    poder_minimo_saiyan = int(poderes_saiyan.min())
+    return seleccionar_filas(matriz, poderes < poder_minimo_saiyan), poder_minimo_saiyan
+
+
+def calcular_promedio_android(matriz) -> Tuple[float, float]:
+    """
+    Version vectorizada de operaciones_estadisticas.calcular_promedio_android.
+    """
+    promedio_inteligencia = calcular_promedio(matriz, 5, filtro_raza="Android")  # Indice 5 = inteligencia
+    promedio_poder = calcular_promedio(matriz, 4, filtro_raza="Android")  # Indice 4 = poder
+    return promedio_inteligencia, promedio_poder
+
+
+def filtrar_kryptonian_poder(matriz) -> Tuple[list, float]:
+    """
+    Version vectorizada de operaciones_estadisticas.filtrar_kryptonian_poder.
+    """
+    poderes = obtener_columna_numerica(matriz, 4)  # Indice 4 = poder
+    mascara_kryptonian = crear_mascara(matriz, 2, lambda raza: "Kryptonian" in raza)
+    if mascara_kryptonian.any():
+        promedio_poder_kryptonian = int(poderes[mascara_kryptonian].sum()) / int(mascara_kryptonian.sum())
+    else:
+        promedio_poder_kryptonian = 0
+
+    mascara = ~mascara_kryptonian & (poderes > promedio_poder_kryptonian)
+    return seleccionar_filas(matriz, mascara), promedio_poder_kryptonian
+
+
+def filtrar_saiyan_poder(matriz) -> Tuple[list, float]:
+    """
+    Version vectorizada de operaciones_estadisticas.filtrar_saiyan_poder.
+    """
+    np = obtener_numpy()
+    poderes = obtener_columna_numerica(matriz, 4)  # Indice 4 = poder
+    inteligencias = obtener_columna_numerica(matriz, 5)  # Indice 5 = inteligencia
+    velocidades = obtener_columna_numerica(matriz, 6)  # Indice 6 = velocidad
+    mascara_saiyan = crear_mascara(matriz, 2, lambda raza: "Saiyan" in raza)
+
+    promedios = []
+    cantidad_saiyan = int(mascara_saiyan.sum())
+    for columna in (poderes, inteligencias, velocidades):
+        if cantidad_saiyan == 0:
+            promedios.append(0)
+        else:
+            promedios.append(int(columna[mascara_saiyan].sum()) / cantidad_saiyan)
+    indice_ataque_saiyan = (promedios[0] + promedios[1] + promedios[2]) / 3
+
+    suma_stats = poderes.astype(np.int64) + inteligencias + velocidades
+    mascara = ~mascara_saiyan & (suma_stats / 3 < indice_ataque_saiyan)
+    return seleccionar_filas(matriz, mascara), indice_ataque_saiyan
+
+
+def filtrar_no_binario_veloces(matriz) -> Tuple[list, Optional[float]]:
+    """
+    Version vectorizada de operaciones_estadisticas.filtrar_no_binario_veloces.
+    """
+    velocidades = obtener_columna_numerica(matriz, 6)  # Indice 6 = velocidad
+    mascara_no_binario = crear_mascara(matriz, 3, lambda genero: genero == "No-Binario")
+    if not mascara_no_binario.any():
+        return [], None  # No hay personajes de genero no-Binario
+
+    max_velocidad = int(velocidades[mascara_no_binario].max())
+    mascara = mascara_no_binario & (velocidades == max_velocidad)
+    return seleccionar_filas(matriz, mascara), max_velocidad
@@ -0,0 +1,261 @@
+"""
+Instrumentacion de las operaciones del menu.
+
+Mide cada operacion (tiempo de pared, tiempo de CPU, llamadas) y acumula los contadores
+que informan las funciones mientras se ejecuta: filas recorridas, comparaciones e
+intercambios. El tiempo que el programa pasa esperando al usuario (las pausas de
+"Presione Enter") se descuenta del tiempo de pared si se pide con pedir_entrada.
+
+Opcionalmente captura un perfil de cProfile y el pico de memoria de tracemalloc por
+operacion. Las metricas se exportan como JSON o en el formato de texto de Prometheus.
+
+Esta desactivada por defecto. Desactivada, medir_operacion retorna un context manager
+vacio y las funciones instrumentadas solo consultan la variable ACTIVA, sin medir nada:
+
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("comparaciones", cantidad)
+"""
+import json
+import time
+from contextlib import nullcontext
+
+ACTIVA = False
+PERFILAR = False  # Captura un perfil de cProfile por operacion
+MEDIR_MEMORIA = False  # Mide el pico de memoria (tracemalloc) por operacion
+CONTADORES = ("filas_recorridas", "comparaciones", "intercambios")
+
+# Metricas acumuladas por operacion: {operacion: {"llamadas": ..., "segundos_pared": ..., ...}}
+METRICAS = {}
+PERFILES = {}  # {operacion: pstats.Stats}
+medicion_actual = None  # Medicion en curso, o None
+
+
+class Medicion:
+    """
+    Context manager que mide una ejecucion de una operacion y la acumula en METRICAS.
+    """
+
+    def __init__(self, operacion) -> None:
+        """
+        Args:
+            operacion: Identificador de la operacion (ej: el numero de opcion del menu).
+        """
+        self.operacion = operacion
+        self.contadores = dict.fromkeys(CONTADORES, 0)
+        self.segundos_espera = 0.0
+        self.anterior = None
+        self.perfil = None
+
+    def __enter__(self) -> "Medicion":
+        global medicion_actual
+        self.anterior = medicion_actual
+        medicion_actual = self
+        if MEDIR_MEMORIA:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self.memoria_inicial = tracemalloc.get_traced_memory()[0]
+        if PERFILAR and self.anterior is None:
+            import cProfile
+            self.perfil = cProfile.Profile()
+            self.perfil.enable()
+        self.inicio_cpu = time.process_time()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        global medicion_actual
+        segundos_pared = time.perf_counter() - self.inicio - self.segundos_espera
+        segundos_cpu = time.process_time() - self.inicio_cpu
+        if self.perfil is not None:
+            self.perfil.disable()
+            acumular_perfil(self.operacion, self.perfil)
+        medicion_actual = self.anterior
+
+        metricas = METRICAS.setdefault(self.operacion, {
+            "llamadas": 0, "segundos_pared": 0.0, "segundos_cpu": 0.0, "segundos_espera": 0.0,
+            **dict.fromkeys(CONTADORES, 0),
+        })
+        metricas["llamadas"] += 1
+        metricas["segundos_pared"] += segundos_pared
+        metricas["segundos_cpu"] += segundos_cpu
+        metricas["segundos_espera"] += self.segundos_espera
+        for nombre, cantidad in self.contadores.items():
+            metricas[nombre] = metricas.get(nombre, 0) + cantidad
+        if MEDIR_MEMORIA:
+            import tracemalloc
+            pico = tracemalloc.get_traced_memory()[1] - self.memoria_inicial
+            metricas["memoria_pico_bytes"] = max(metricas.get("memoria_pico_bytes", 0), pico)
+
+        if self.anterior is not None:
+            # Una operacion dentro de otra: sus contadores y esperas tambien son de la externa
+            for nombre, cantidad in self.contadores.items():
+                self.anterior.contadores[nombre] = self.anterior.contadores.get(nombre, 0) + cantidad
+            self.anterior.segundos_espera += self.segundos_espera
+
+
+def configurar(activa: bool = True, perfilar: bool = False, medir_memoria: bool = False) -> None:
+    """
+    Activa o desactiva la instrumentacion.
+
+    Args:
+        activa (bool, opcional): True para medir las operaciones.
+        perfilar (bool, opcional): True para capturar un perfil de cProfile por operacion.
+        medir_memoria (bool, opcional): True para medir el pico de memoria con tracemalloc.
+
+    Returns:
+        None
+    """
+    global ACTIVA, PERFILAR, MEDIR_MEMORIA
+    ACTIVA = activa
+    PERFILAR = activa and perfilar
+    MEDIR_MEMORIA = activa and medir_memoria
+    if not MEDIR_MEMORIA:
+        import sys
+        if "tracemalloc" in sys.modules and sys.modules["tracemalloc"].is_tracing():
+            sys.modules["tracemalloc"].stop()
+
+
+def reiniciar() -> None:
+    """
+    Descarta las metricas y perfiles acumulados.
+
+    Returns:
+        None
+    """
+    METRICAS.clear()
+    PERFILES.clear()
+
+
+def medir_operacion(operacion):
+    """
+    Retorna el context manager que mide una operacion, o uno vacio si la
+    instrumentacion esta desactivada.
+
+    Args:
+        operacion: Identificador de la operacion (ej: el numero de opcion del menu).
+
+    Returns:
+        Medicion | nullcontext: Context manager para usar con "with".
+    """
+    if not ACTIVA:
+        return nullcontext()
+    return Medicion(operacion)
+
+
+def contar(nombre: str, cantidad: int = 1) -> None:
+    """
+    Suma a un contador de la operacion en curso. Solo debe llamarse si ACTIVA es True.
+
+    Args:
+        nombre (str): Contador (ej: "comparaciones").
+        cantidad (int, opcional): Cantidad a sumar.
+
+    Returns:
+        None
+    """
+    if medicion_actual is not None:
+        medicion_actual.contadores[nombre] = medicion_actual.contadores.get(nombre, 0) + cantidad
+
+
+def pedir_entrada(mensaje: str = "") -> str:
+    """
+    Igual que input(), pero el tiempo de espera no se cuenta en la operacion en curso.
+
+    Args:
+        mensaje (str, opcional): Mensaje a mostrar.
+
+    Returns:
+        str: Texto ingresado.
+    """
+    if medicion_actual is None:
+        return input(mensaje)
+    inicio = time.perf_counter()
+    try:
+        return input(mensaje)
+    finally:
+        medicion_actual.segundos_espera += time.perf_counter() - inicio
+
+
+def acumular_perfil(operacion, perfil) -> None:
+    """
+    Agrega un perfil de cProfile a los perfiles acumulados de la operacion.
+
+    Returns:
+        None
+    """
+    import pstats
+    if operacion in PERFILES:
+        PERFILES[operacion].add(perfil)
+    else:
+        PERFILES[operacion] = pstats.Stats(perfil)
+
+
+def guardar_perfil(operacion, ruta: str) -> None:
+    """
+    Guarda el perfil acumulado de una operacion en el formato de pstats (se puede abrir
+    con python -m pstats o snakeviz).
+
+    Args:
+        operacion: Identificador de la operacion.
+        ruta (str): Archivo a crear.
+
+    Returns:
+        None
+    """
+    PERFILES[operacion].dump_stats(ruta)
+
+
+def exportar_json() -> str:
+    """
+    Retorna las metricas acumuladas como JSON.
+
+    Returns:
+        str: Objeto {operacion: {metrica: valor}}.
+    """
+    return json.dumps({str(operacion): metricas for operacion, metricas in METRICAS.items()}, indent=2)
+
+
+def exportar_prometheus(prefijo: str = "menu_operacion") -> str:
+    """
+    Retorna las metricas acumuladas en el formato de texto de Prometheus, una serie por
+    metrica con la operacion como etiqueta.
+
+    Args:
+        prefijo (str, opcional): Prefijo de los nombres de las metricas.
+
+    Returns:
+        str: Texto listo para servir en /metrics o escribir en un archivo .prom.
+    """
+    nombres = []
+    for metricas in METRICAS.values():
+        for nombre in metricas:
+            if nombre not in nombres:
+                nombres.append(nombre)
+
+    lineas = []
+    for nombre in nombres:
+        tipo = "gauge" if nombre == "memoria_pico_bytes" else "counter"
+        serie = f"{prefijo}_{nombre}" + ("_total" if tipo == "counter" else "")
+        lineas.append(f"# TYPE {serie} {tipo}")
+        for operacion, metricas in METRICAS.items():
+            if nombre in metricas:
+                lineas.append(f'{serie}{{operacion="{operacion}"}} {metricas[nombre]}')
+    return "\n".join(lineas) + "\n"
+
+
+def guardar_metricas(ruta: str) -> None:
+    """
+    Guarda las metricas acumuladas. El formato se deduce de la extension: .prom para
+    Prometheus y cualquier otra para JSON.
+
+    Args:
+        ruta (str): Archivo a crear.
+
+    Returns:
+        None
+    """
+    texto = exportar_prometheus() if ruta.endswith(".prom") else exportar_json()
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write(texto)
@@ -5,9 +5,13 @@ Autor: [Vitali Mariano]
 Versión: 1.0
 """
 
+import sys
+
 from core import ejecutar_programa
 
 
 
 if __name__ == "__main__":
-    ejecutar_programa()
\ No newline at end of file
+    # Opcional: python main.py personajes.csv [metricas.json | metricas.prom]
+    ejecutar_programa(sys.argv[1] if len(sys.argv) > 1 else None,
+                    sys.argv[2] if len(sys.argv) > 2 else None)
\ No newline at end of file
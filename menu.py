@@ -2,7 +2,10 @@
 Manejo del menu del programa (imprimir, opciones, etc).
 """
 import os
+from typing import Optional
 
+import instrumentacion
+import renderizado
 import utils
 
 def limpiar_consola() -> None:
@@ -80,7 +83,8 @@ def pedir_opcion() -> int:
             input("Presione Enter para continuar...")
 
 
-def mostrar_detalle_personajes(matriz: list, titulo: str = "DETALLE DE TODOS LOS PERSONAJES") -> None:
+def mostrar_detalle_personajes(matriz: list, titulo: str = "DETALLE DE TODOS LOS PERSONAJES",
+                            limite: Optional[int] = None, lineas_por_pagina: Optional[int] = None) -> None:
     """
     Muestra en pantalla el detalle completo de todos los personajes contenidos en la matriz.
     Presenta la información en formato de tabla con columnas para nombre, alias, raza, 
@@ -90,32 +94,18 @@ def mostrar_detalle_personajes(matriz: list, titulo: str = "DETALLE DE TODOS LOS
         matriz (list): Lista de listas donde cada sublista representa un personaje con 
                     sus atributos [nombre, alias, raza, genero, poder, inteligencia, velocidad].
         titulo (str, opcional): Título a mostrar en la cabecera del reporte. 
-                            Por defecto: "DETALLE DE TODOS LOS PERSONAJES".                             
+                            Por defecto: "DETALLE DE TODOS LOS PERSONAJES".
+        limite (int, opcional): Cantidad maxima de personajes a mostrar. None muestra todos.
+        lineas_por_pagina (int, opcional): Si se indica, muestra la tabla por paginas y
+                                        espera Enter entre una y otra.
     Returns:
         None:
     """
-    print(titulo)
+    bloques = renderizado.generar_detalle(matriz, titulo, limite)
+    mostrar_bloques(bloques, lineas_por_pagina)
 
-    print("\n" + "="*100)
-    print(f"{'Nombre':<15} {'Alias':<15} {'Raza':<15} {'Genero':<12} {'Inteligencia':<12} {'Poder':<8} {'Velocidad':<10}")
-    print("="*100)
-
-    for personaje in matriz:
-        nombre = personaje[0]
-        alias = personaje[1][:15]
-        raza = personaje[2]
-        genero = personaje[3]
-        poder = personaje[4]
-        inteligencia = personaje[5]
-        velocidad = personaje[6]
-
-        print(f"{nombre:<15} {alias:<15} {raza:<15} {genero:<12} {inteligencia:<12} {poder:<8} {velocidad:<10}")
-
-        print("="*100)
-    input("Presione Enter para continuar...")
-    limpiar_consola()
-
-def mostrar_matriz_traspuesta(matriz_traspuesta: list) -> None:
+def mostrar_matriz_traspuesta(matriz_traspuesta: list, limite: Optional[int] = None,
+                            lineas_por_pagina: Optional[int] = None) -> None:
     """
     Muestra en pantalla la matriz traspuesta de personajes de forma organizada.
     Presenta cada personaje numerado con todos sus atributos en formato vertical,
@@ -124,25 +114,34 @@ def mostrar_matriz_traspuesta(matriz_traspuesta: list) -> None:
     Args:
         matriz_traspuesta (list): Lista de listas donde cada sublista contiene todos los valores
                                 de un mismo atributo para todos los personajes. Estructura:
-                                [nombres[], alias[], razas[], generos[], poderes[], velocidades[]].                                
+                                [nombres[], alias[], razas[], generos[], poderes[], velocidades[]].
+        limite (int, opcional): Cantidad maxima de personajes a mostrar. None muestra todos.
+        lineas_por_pagina (int, opcional): Si se indica, muestra el listado por paginas y
+                                        espera Enter entre una y otra.
     Returns:
         None:
     """
-    numero_personajes = len(matriz_traspuesta[0])
-    print("MATRIZ TRASPUESTA")
-    for i in range(numero_personajes):
-        print("="*100)
-        print(f"Personaje {i + 1}:")
-        print("="*100)
-        print(f"    Nombre: {matriz_traspuesta[0][i]}")
-        print(f"    Alias: {matriz_traspuesta[1][i]}")
-        print(f"    Raza: {matriz_traspuesta[2][i]}")
-        print(f"    Genero: {matriz_traspuesta[3][i]}")
-        print(f"    Poder: {matriz_traspuesta[4][i]}")
-        print(f"    Inteligencia: {matriz_traspuesta[5][i]}")
-        print(f"    Velocidad: {matriz_traspuesta[6][i]}")
-    print("="*100)
-    input("Presione Enter para continuar...")
+    bloques = renderizado.generar_traspuesta(matriz_traspuesta, limite)
+    mostrar_bloques(bloques, lineas_por_pagina)
+
+def mostrar_bloques(bloques, lineas_por_pagina: Optional[int] = None) -> None:
+    """
+    Escribe en pantalla los bloques generados por renderizado, opcionalmente por paginas,
+    y espera Enter antes de limpiar la consola.
+
+    Args:
+        bloques (iterable): Bloques de texto a mostrar.
+        lineas_por_pagina (int, opcional): Lineas por pagina. None muestra todo seguido.
+
+    Returns:
+        None
+    """
+    if lineas_por_pagina is None:
+        renderizado.escribir(bloques)
+    else:
+        paginas = renderizado.paginar(bloques, lineas_por_pagina)
+        renderizado.escribir(paginas, pausar=lambda: instrumentacion.pedir_entrada("Presione Enter para ver mas ('q' para terminar)...").strip().lower() != "q")
+    instrumentacion.pedir_entrada("Presione Enter para continuar...")
     limpiar_consola()
 
 def pedir_datos_personaje() -> list:
@@ -1,13 +1,14 @@
 """
 Modulo para ooperaciones con datos y matriz
 """
+import consultas
+import instrumentacion
+import operaciones_estadisticas
+import operaciones_ordenamiento
 import utils
-from utn_fra.datasets import (
-lista_nombre_heroes_pp, lista_alias_pp,
-    lista_razas_pp, lista_generos_pp,
-    lista_poderes_pp, lista_inteligencias_pp,
-lista_velocidades_pp
-)
+from almacen_concurrente import AlmacenConcurrente
+from almacen_personajes import AlmacenPersonajes
+from personaje import Personaje, crear_personaje
 
 
 def crear_matriz(lista_nombre: list, lista_alias: list, lista_razas: list,
@@ -15,7 +16,7 @@ def crear_matriz(lista_nombre: list, lista_alias: list, lista_razas: list,
                 lista_velocidades: list) -> list:
     """
     Crea una matriz bidimensional con los datos de los personajes organizados por filas.
-    Cada fila representa un personaje y cada columna representa un atributo específico.
+    Cada fila es un Personaje (inmutable) y cada columna representa un atributo específico.
     
     Args:
         lista_nombre (list): Lista con los nombres de los personajes.
@@ -27,14 +28,14 @@ def crear_matriz(lista_nombre: list, lista_alias: list, lista_razas: list,
         lista_velocidades (list): Lista con los valores de velocidad de los personajes (numérico).
         
     Returns:
-        list: Matriz bidimensional donde cada sublista representa un personaje con estructura:
-            [nombre, alias, raza, genero, poder, inteligencia, velocidad].
+        list: Matriz bidimensional donde cada Personaje tiene la estructura:
+            (nombre, alias, raza, genero, poder, inteligencia, velocidad).
     """
 
     matriz = []
 
     for i in range(len(lista_nombre)):
-        fila = [
+        fila = Personaje(
             lista_nombre[i],
             lista_alias[i],
             lista_razas[i],
@@ -42,11 +43,37 @@ def crear_matriz(lista_nombre: list, lista_alias: list, lista_razas: list,
             lista_poderes[i],
             lista_inteligencias[i],
             lista_velocidades[i]
-        ]
+        )
         matriz.append(fila)
 
     return matriz
 
+def crear_almacen(lista_nombre: list, lista_alias: list, lista_razas: list,
+                lista_generos: list, lista_poderes: list, lista_inteligencias: list,
+                lista_velocidades: list) -> AlmacenPersonajes:
+    """
+    Crea un almacen columnar con los datos de los personajes. Recibe las mismas listas
+    que crear_matriz y el resultado puede usarse en su lugar en todas las operaciones.
+    
+    Args:
+        lista_nombre (list): Lista con los nombres de los personajes.
+        lista_alias (list): Lista con los alias/apodos de los personajes.
+        lista_razas (list): Lista con las razas de los personajes.
+        lista_generos (list): Lista con los géneros de los personajes.
+        lista_poderes (list): Lista con los valores de poder de los personajes (entero).
+        lista_inteligencias (list): Lista con los valores de inteligencia de los personajes (entero).
+        lista_velocidades (list): Lista con los valores de velocidad de los personajes (entero).
+        
+    Returns:
+        AlmacenPersonajes: Almacen con una fila por personaje con estructura
+            (nombre, alias, raza, genero, poder, inteligencia, velocidad).
+    """
+
+    almacen = AlmacenPersonajes()
+    almacen.agregar_varios(zip(lista_nombre, lista_alias, lista_razas, lista_generos,
+                            lista_poderes, lista_inteligencias, lista_velocidades))
+    return almacen
+
 def mostrar_cantidad_personajes(cantidad: int) -> None:
     """
     Muestra en pantalla la cantidad total de personajes cargados en el sistema.
@@ -59,12 +86,27 @@ def mostrar_cantidad_personajes(cantidad: int) -> None:
         None:
     """
     print(f"Cantidad de personajes: {cantidad}")
-    input("Presione Enter para continuar...")
+    instrumentacion.pedir_entrada("Presione Enter para continuar...")
 
 
+def coincide_raza(raza: str, tipo_raza: str) -> bool:
+    """
+    Indica si la raza de un personaje corresponde al tipo de raza buscado.
+    
+    Args:
+        raza (str): Raza del personaje (ej: "Human", "Half Saiyan").
+        tipo_raza (str): Nombre o parte del nombre de la raza a buscar (ej: "Human", "Saiyan").
+        
+    Returns:
+        bool: True si tipo_raza aparece en la raza seguido de un espacio o al final de la raza.
+    """
+    return consultas.coincide_palabra(raza, tipo_raza)
+
 def filtrar_personajes_raza(matriz: list, tipo_raza: str) -> list:
     """
     Filtra y retorna todos los personajes que pertenecen a una raza específica.
+    Sobre un AlmacenPersonajes usa el indice de razas y solo recorre los personajes
+    que coinciden.
 
     
     Args:
@@ -77,15 +119,47 @@ def filtrar_personajes_raza(matriz: list, tipo_raza: str) -> list:
             Cada elemento mantiene la estructura original [nombre, alias, raza, genero, poder, inteligencia, velocidad].
     """
 
-    personajes_filtrados = []
+    consulta = consultas.Consulta([consultas.contiene_palabra(2, tipo_raza)])  # Indice 2 = raza
+    return consultas.ejecutar_consulta(consulta, matriz).filas
+
+def contar_personajes_raza(matriz: list, tipo_raza: str) -> int:
+    """
+    Cuenta los personajes que pertenecen a una raza específica. Sobre un AlmacenPersonajes
+    la cantidad sale del indice de razas, sin recorrer la matriz.
+    
+    Args:
+        matriz (list): Matriz bidimensional con los datos de los personajes.
+        tipo_raza (str): Nombre o parte del nombre de la raza a contar (ej: "Human", "Saiyan").
+        
+    Returns:
+        int: Cantidad de personajes que coinciden con la raza especificada.
+    """
+    consulta = consultas.Consulta([consultas.contiene_palabra(2, tipo_raza)], seleccion="cantidad")
+    return consultas.ejecutar_consulta(consulta, matriz).cantidad
 
-    for personaje in matriz:
-        raza = personaje[2]
+def encontrar_personajes_maximo(matriz: list, indice_stat: int) -> list:
+    """
+    Encuentra y retorna todos los personajes empatados en el valor máximo de un stat,
+    en una sola pasada y sin copiar la matriz.
+    
+    Args:
+        matriz (list): Matriz bidimensional con los datos de los personajes.
+        indice_stat (int): Índice del stat (4=poder, 5=inteligencia, 6=velocidad).
+        
+    Returns:
+        list: Lista con todos los personajes que tienen el valor máximo, en el orden
+            en que aparecen en la matriz.
+    """
+    if operaciones_estadisticas.usar_paralelismo(matriz):
+        return operaciones_estadisticas.EJECUTOR_PARALELO.encontrar_personajes_maximo(matriz, indice_stat)
 
-        if f"{tipo_raza} " in f" {raza} ":
-            personajes_filtrados.append(personaje)
+    if isinstance(matriz, AlmacenPersonajes):
+        # Recorre solo la columna del stat como pares (posicion, valor)
+        maximos = operaciones_ordenamiento.seleccionar_top_k(enumerate(matriz.columna(indice_stat)), 1,
+                                                            incluir_empates=True)
+        return matriz.filas(posicion for posicion, _ in maximos)
 
-    return personajes_filtrados
+    return operaciones_ordenamiento.seleccionar_top_k(matriz, indice_stat, incluir_empates=True)
 
 def encontrar_personajes_mas_poderosos(matriz: list) -> list:
     """
@@ -99,21 +173,7 @@ def encontrar_personajes_mas_poderosos(matriz: list) -> list:
         list: Lista de sublistas con todos los personajes que tienen el poder máximo.
 
     """
-
-    max_poder = matriz[0][4] # Poder del primer pj.
-    personajes_mas_poderosos = [matriz[0]] # primer pj
-
-    for personaje in matriz[1:]:
-        poder_actual = personaje[4]
-
-        if poder_actual > max_poder:
-            max_poder = poder_actual
-            personajes_mas_poderosos = [personaje]
-
-        elif poder_actual == max_poder:
-            personajes_mas_poderosos.append(personaje)
-    
-    return personajes_mas_poderosos
+    return encontrar_personajes_maximo(matriz, 4)  # Indice 4 = poder
 
 def encontrar_personajes_mas_inteligente(matriz: list) -> list:
     """
@@ -125,35 +185,43 @@ def encontrar_personajes_mas_inteligente(matriz: list) -> list:
     Returns:
         list: Lista de sublistas con todos los personajes que tienen la inteligencia máxima.
     """
-
-    max_inteligencia = matriz[0][5] # Inteligencia del primer pj.
-    personajes_mas_inteligentes = [matriz[0]] # primer pj
-
-    for personaje in matriz[1:]:
-        inteligencia_actual = personaje[5]
-
-        if inteligencia_actual > max_inteligencia:
-            max_inteligencia = inteligencia_actual
-            personajes_mas_inteligentes = [personaje]
-
-        elif inteligencia_actual == max_inteligencia:
-            personajes_mas_inteligentes.append(personaje)
-
-    return personajes_mas_inteligentes
+    return encontrar_personajes_maximo(matriz, 5)  # Indice 5 = inteligencia
 
 def agregar_personaje(matriz: list, nuevo_personaje: list) -> list:
     """
-    Agrega un nuevo personaje a la matriz existente sin modificar la matriz original.
+    Agrega un nuevo personaje al final de la matriz en O(1) amortizado.
+    La matriz se modifica en el lugar (ya no se copia completa en cada alta) y se
+    retorna la misma matriz. Los datos se guardan como un Personaje inmutable (si ya
+    lo son, sin copiarlos), por lo que modificar luego la lista recibida no altera la matriz.
     
     Args:
         matriz (list): Matriz bidimensional existente con los datos de los personajes.
         nuevo_personaje (list): Lista con los datos del nuevo personaje a agregar.
         
     Returns:
-        list: Nueva matriz que incluye todos los personajes originales más el nuevo personaje.
+        list: La misma matriz, que ahora incluye al nuevo personaje.
+    """
+    if isinstance(matriz, (AlmacenPersonajes, AlmacenConcurrente)):
+        matriz.agregar(nuevo_personaje)
+    else:
+        matriz.append(crear_personaje(nuevo_personaje))
+    return matriz
+
+def agregar_personajes(matriz: list, nuevos_personajes: list) -> list:
+    """
+    Agrega varios personajes al final de la matriz en una sola operacion, en O(1)
+    amortizado por personaje. Igual que agregar_personaje, modifica la matriz en el
+    lugar y guarda cada personaje como un Personaje inmutable.
+    
+    Args:
+        matriz (list): Matriz bidimensional existente con los datos de los personajes.
+        nuevos_personajes (list): Lista (o iterable) de personajes a agregar.
+        
+    Returns:
+        list: La misma matriz, que ahora incluye a los nuevos personajes.
     """
-    matrix_auxiliar = []
-    for personaje in matriz:
-        matrix_auxiliar.append(personaje[:])
-    matrix_auxiliar.append(nuevo_personaje)
-    return matrix_auxiliar
\ No newline at end of file
+    if isinstance(matriz, (AlmacenPersonajes, AlmacenConcurrente)):
+        matriz.agregar_varios(nuevos_personajes)
+    else:
+        matriz.extend(map(crear_personaje, nuevos_personajes))
+    return matriz
\ No newline at end of file
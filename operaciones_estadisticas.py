@@ -3,12 +3,111 @@ Modulo de operaciones con estadisticas
 """
 from typing import Optional, Tuple
 
-from utn_fra.datasets import (
-lista_nombre_heroes_pp, lista_alias_pp,
-    lista_razas_pp, lista_generos_pp,
-    lista_poderes_pp, lista_inteligencias_pp,
-lista_velocidades_pp
-)
+import consultas
+import estadisticas_vectorizadas
+import instrumentacion
+from agregados import Agregado
+from almacen_personajes import AlmacenPersonajes
+
+
+# Si NumPy esta instalado las funciones usan el backend vectorizado por defecto
+BACKEND_VECTORIZADO = estadisticas_vectorizadas.NUMPY_DISPONIBLE
+
+
+def configurar_backend(vectorizado: bool) -> bool:
+    """
+    Activa o desactiva el backend vectorizado (NumPy) de las funciones de este modulo.
+    
+    Args:
+        vectorizado (bool): True para usar NumPy, False para usar Python puro.
+    
+    Returns:
+        bool: True si el backend vectorizado quedo activo. Es False si se pidio
+            activarlo pero NumPy no esta instalado.
+    """
+    global BACKEND_VECTORIZADO
+    BACKEND_VECTORIZADO = vectorizado and estadisticas_vectorizadas.NUMPY_DISPONIBLE
+    return BACKEND_VECTORIZADO
+
+
+# Ejecutor de procesos (estadisticas_paralelas.EjecutorParalelo) o None para calcular en serie
+EJECUTOR_PARALELO = None
+
+
+def configurar_paralelismo(procesos: Optional[int]) -> bool:
+    """
+    Activa o desactiva el calculo en paralelo, por particiones, de las funciones de este
+    modulo sobre un AlmacenPersonajes. Tiene prioridad sobre el backend vectorizado.
+    
+    Args:
+        procesos (int): Cantidad de procesos del pool (0 usa os.cpu_count()).
+                        None desactiva el paralelismo y detiene el pool.
+    
+    Returns:
+        bool: True si el calculo en paralelo quedo activo.
+    """
+    global EJECUTOR_PARALELO
+    if EJECUTOR_PARALELO is not None:
+        EJECUTOR_PARALELO.cerrar()
+        EJECUTOR_PARALELO = None
+    if procesos is not None:
+        # Se importa recien aca: multiprocessing demora el arranque del programa
+        import estadisticas_paralelas
+        EJECUTOR_PARALELO = estadisticas_paralelas.EjecutorParalelo(procesos or None)
+    return EJECUTOR_PARALELO is not None
+
+
+def usar_paralelismo(matriz) -> bool:
+    """
+    Indica si una operacion sobre la matriz debe ejecutarse en el pool de procesos.
+    """
+    return EJECUTOR_PARALELO is not None and isinstance(matriz, AlmacenPersonajes)
+
+
+def calcular_agregados(matriz: list, indices_stat: list, filtro_raza: Optional[str] = None,
+                    filtro_genero: Optional[str] = None) -> dict:
+    """
+    Calcula cantidad, suma, minimo, maximo y posiciones del maximo de varios stats a la vez,
+    en una sola pasada por la matriz. Sobre un AlmacenPersonajes los valores salen del
+    registro de agregados, sin recorrer filas.
+    
+    Args:
+        matriz (list): Matriz bidimensional con los datos de los personajes.
+        indices_stat (list): Índices de los stats a agregar (4 = poder, 5 = inteligencia, 6 = velocidad).
+        filtro_raza (str, opcional): Nombre o parte del nombre de la raza para filtrar.
+                        None incluye todas.
+        filtro_genero (str, opcional): Genero exacto para filtrar. None incluye todos.
+    
+    Returns:
+        dict: Diccionario {indice_stat: Agregado}. Las posiciones del maximo son indices de
+            filas de la matriz.
+    """
+    if isinstance(matriz, AlmacenPersonajes) and (filtro_raza is None or filtro_genero is None):
+        agregados = {}
+        for indice_stat in indices_stat:
+            if filtro_raza is not None:
+                agregados[indice_stat] = matriz.agregado(indice_stat, 2, lambda raza: filtro_raza in raza)
+            elif filtro_genero is not None:
+                agregados[indice_stat] = matriz.agregado(indice_stat, 3, lambda genero: genero == filtro_genero)
+            else:
+                agregados[indice_stat] = matriz.agregado(indice_stat)
+        return agregados
+
+    agregados = {}
+    for indice_stat in indices_stat:
+        agregados[indice_stat] = Agregado()
+
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("filas_recorridas", len(matriz))
+    for posicion, personaje in enumerate(matriz):
+        if filtro_raza is not None and filtro_raza not in personaje[2]:
+            continue
+        if filtro_genero is not None and personaje[3] != filtro_genero:
+            continue
+        for indice_stat, agregado in agregados.items():
+            agregado.actualizar(personaje[indice_stat], posicion)
+
+    return agregados
 
 
 def calcular_promedio(matriz: list, indice_stat: int, filtro_raza: Optional[str] = None) -> float:
@@ -25,22 +124,12 @@ def calcular_promedio(matriz: list, indice_stat: int, filtro_raza: Optional[str]
     Returns:
         float: Promedio de la estadística especificada.
     """
-    suma = 0
-    cantidad = 0
-
-    for personaje in matriz:
-        raza = personaje[2]
-        stat = personaje[indice_stat]
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.calcular_promedio(matriz, indice_stat, filtro_raza)
+    if BACKEND_VECTORIZADO and not isinstance(matriz, AlmacenPersonajes):
+        return estadisticas_vectorizadas.calcular_promedio(matriz, indice_stat, filtro_raza)
 
-        if filtro_raza is None or filtro_raza in raza:
-            suma += stat
-            cantidad += 1
-
-    if cantidad == 0:
-        return 0
-
-    promedio = suma / cantidad
-    return promedio
+    return calcular_agregados(matriz, [indice_stat], filtro_raza)[indice_stat].promedio()
 
 
 def filtrar_menos_velocidad(matriz: list) -> Tuple[list, float]:
@@ -55,16 +144,13 @@ def filtrar_menos_velocidad(matriz: list) -> Tuple[list, float]:
             - list: Lista de listas con los personajes que tienen velocidad menor al promedio.
             - float: Valor del promedio de velocidad calculado para todos los personajes.
     """
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.filtrar_menos_velocidad(matriz)
+    if BACKEND_VECTORIZADO:
+        return estadisticas_vectorizadas.filtrar_menos_velocidad(matriz)
 
-    promedio = calcular_promedio(matriz, 6)  # Indice 6 = velocidad
-    personajes_filtrados = []
-
-    for personaje in matriz:
-        velocidad = personaje[6]
-        if velocidad < promedio:
-            personajes_filtrados.append(personaje)
-
-    return personajes_filtrados, promedio
+    resultado = consultas.ejecutar_consulta(consultas.CONSULTA_MENOS_VELOCIDAD, matriz)
+    return resultado.filas, resultado.valores["promedio"]
 
 def filtrar_debiles(matriz: list) -> Tuple[list, float]:
     """
@@ -78,26 +164,13 @@ def filtrar_debiles(matriz: list) -> Tuple[list, float]:
             - list: Lista de listas con los personajes que tienen poder menor al mínimo Saiyan.
             - int: Valor del poder mínimo encontrado entre los Saiyans.
     """
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.filtrar_debiles(matriz)
+    if BACKEND_VECTORIZADO:
+        return estadisticas_vectorizadas.filtrar_debiles(matriz)
 
-    poder_minimo_saiyan = None
-
-    for personaje in matriz:
-        raza = personaje[2]
-        poder = personaje[4]
-
-        if "Saiyan" in raza:
-            if poder_minimo_saiyan is None or poder < poder_minimo_saiyan:
-                poder_minimo_saiyan = poder
-
-    if poder_minimo_saiyan is None:
-        return [], 0  # No hay Saiyans en la matriz
-
-    personajes_filtrados = []
-    for personaje in matriz:
-        if personaje[4] < poder_minimo_saiyan:
-            personajes_filtrados.append(personaje)
-
-    return personajes_filtrados, poder_minimo_saiyan
+    resultado = consultas.ejecutar_consulta(consultas.CONSULTA_DEBILES, matriz)
+    return resultado.filas, resultado.valores["poder_minimo_saiyan"]
 
 
 def calcular_promedio_android(matriz: list) -> Tuple[float, float]:
@@ -112,10 +185,13 @@ def calcular_promedio_android(matriz: list) -> Tuple[float, float]:
             - float: Promedio de inteligencia de los personajes Android. Retorna 0 si no hay Androids.
             - float: Promedio de poder de los personajes Android. Retorna 0 si no hay Androids.
     """
-    promedio_inteligencia = calcular_promedio(matriz, 5, filtro_raza="Android")  # Indice 5 = inteligencia
-    promedio_poder = calcular_promedio(matriz, 4, filtro_raza="Android")  # Indice 4 = poder
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.calcular_promedio_android(matriz)
+    if BACKEND_VECTORIZADO and not isinstance(matriz, AlmacenPersonajes):
+        return estadisticas_vectorizadas.calcular_promedio_android(matriz)
 
-    return promedio_inteligencia, promedio_poder
+    resultado = consultas.ejecutar_consulta(consultas.CONSULTA_PROMEDIOS_ANDROID, matriz)
+    return resultado.valores["promedio_inteligencia"], resultado.valores["promedio_poder"]
 
 def filtrar_kryptonian_poder(matriz: list) -> Tuple[list, float]:
     """
@@ -131,17 +207,13 @@ def filtrar_kryptonian_poder(matriz: list) -> Tuple[list, float]:
             - float: Promedio de poder calculado para los personajes Kryptonianos.
                     Retorna 0 si no hay Kryptonianos en la matriz.
     """
-    promedio_poder_kryptonian = calcular_promedio(matriz, 4, filtro_raza="Kryptonian")  # Indice 4 = poder
-    personajes_filtrados = []
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.filtrar_kryptonian_poder(matriz)
+    if BACKEND_VECTORIZADO:
+        return estadisticas_vectorizadas.filtrar_kryptonian_poder(matriz)
 
-    for personaje in matriz:
-        raza = personaje[2]
-        poder = personaje[4]
-
-        if "Kryptonian" not in raza and poder > promedio_poder_kryptonian:
-            personajes_filtrados.append(personaje)
-
-    return personajes_filtrados, promedio_poder_kryptonian
+    resultado = consultas.ejecutar_consulta(consultas.CONSULTA_KRYPTONIAN, matriz)
+    return resultado.filas, resultado.valores["promedio_poder_kryptonian"]
 
 
 
@@ -161,27 +233,13 @@ def filtrar_saiyan_poder(matriz: list) -> Tuple[list, float]:
             - float: Valor del índice de ataque promedio calculado para los Saiyans
                     (promedio de poder + inteligencia + velocidad).
     """
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.filtrar_saiyan_poder(matriz)
+    if BACKEND_VECTORIZADO:
+        return estadisticas_vectorizadas.filtrar_saiyan_poder(matriz)
 
-    promedio_poder_saiyan = calcular_promedio(matriz, 4, "Saiyan")  # Indice 4 = poder
-    promedio_inteligencia_saiyan = calcular_promedio(matriz, 5, "Saiyan")  # Indice 5 = inteligencia
-    promedio_velocidad_saiyan = calcular_promedio(matriz, 6, "Saiyan")  # Indice 6 = velocidad
-
-    indice_ataque_saiyan = (promedio_poder_saiyan + promedio_inteligencia_saiyan + promedio_velocidad_saiyan) / 3
-
-    personajes_filtrados = []
-
-    for personaje in matriz:
-        raza = personaje[2]
-        poder = personaje[4]
-        inteligencia = personaje[5]
-        velocidad = personaje[6]
-
-        if "Saiyan" not in raza:
-            indice_personaje = (poder + inteligencia + velocidad) / 3
-            if indice_personaje < indice_ataque_saiyan:
-                personajes_filtrados.append(personaje)
-
-    return personajes_filtrados, indice_ataque_saiyan
+    resultado = consultas.ejecutar_consulta(consultas.CONSULTA_SAIYAN_POWER, matriz)
+    return resultado.filas, resultado.valores["indice_ataque_saiyan"]
 
 
 def filtrar_no_binario_veloces(matriz: list) -> Tuple[list, Optional[float]]:
@@ -196,19 +254,10 @@ def filtrar_no_binario_veloces(matriz: list) -> Tuple[list, Optional[float]]:
             - int/float: Valor de la velocidad máxima encontrada entre los personajes No-Binarios.
                         None si no hay personajes No-Binarios en la matriz.
     """
-    max_velocidad = None
-    for personaje in matriz:
-        if personaje[3] == "No-Binario":  # Indice 3 = genero
-            velocidad = personaje[6]  # Indice 6 = velocidad
-            if max_velocidad is None or velocidad > max_velocidad:
-                max_velocidad = velocidad
-
-    if max_velocidad is None:
-        return []  # No hay personajes de genero no-Binario
-    
-    personajes_filtrados = []
-    for personaje in matriz:
-        if personaje[3] == "No-Binario" and personaje[6] == max_velocidad:
-            personajes_filtrados.append(personaje)
+    if usar_paralelismo(matriz):
+        return EJECUTOR_PARALELO.filtrar_no_binario_veloces(matriz)
+    if BACKEND_VECTORIZADO and not isinstance(matriz, AlmacenPersonajes):
+        return estadisticas_vectorizadas.filtrar_no_binario_veloces(matriz)
 
-    return personajes_filtrados, max_velocidad
\ No newline at end of file
+    resultado = consultas.ejecutar_consulta(consultas.CONSULTA_NO_BINARIO_VELOCES, matriz)
+    return resultado.filas, resultado.valores["maxima_velocidad"]
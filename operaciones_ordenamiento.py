@@ -1,6 +1,11 @@
 """
 Modulo de operaciones con ordenamiento
 """
+import heapq
+
+import instrumentacion
+from almacen_personajes import AlmacenPersonajes
+from vistas_columnas import VistaColumna
 
 def intercambiar_posicion(matriz: list, i: int, j: int) -> None:
     """
@@ -17,6 +22,8 @@ def intercambiar_posicion(matriz: list, i: int, j: int) -> None:
 
     # tupla unpacking en vez de variable temporal
     matriz[i], matriz[j] = matriz[j], matriz[i]
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("intercambios")
 
 def obtener_columna(matriz: list, indice_columna: int) -> list:
     """
@@ -31,6 +38,9 @@ def obtener_columna(matriz: list, indice_columna: int) -> list:
         list: Lista que contiene todos los valores de la columna especificada,
             en el mismo orden que aparecen en la matriz original.
     """
+    if isinstance(matriz, AlmacenPersonajes):
+        return list(VistaColumna(matriz, indice_columna))
+
     columna = []
     for personaje in matriz:
         columna.append(personaje[indice_columna])
@@ -39,6 +49,8 @@ def obtener_columna(matriz: list, indice_columna: int) -> list:
 def trasponer_matriz(matriz: list) -> list:
     """
     Traspone la matriz convirtiendo filas en columnas y columnas en filas.
+    No copia los datos: cada fila de la traspuesta es una VistaColumna sobre la matriz,
+    que refleja tambien los personajes agregados despues.
     
     Args:
         matriz (list): Matriz bidimensional con los datos de los personajes, donde cada
@@ -60,15 +72,14 @@ def trasponer_matriz(matriz: list) -> list:
     numero_columnas = len(matriz[0])
 
     for col in range(numero_columnas):
-        nueva_fila = obtener_columna(matriz, col)
-        matriz_traspuesta.append(nueva_fila)
+        matriz_traspuesta.append(VistaColumna(matriz, col))
     return matriz_traspuesta
 
 def obtener_razas_unicas(matriz: list) -> list:
     """
     Obtiene una lista de todas las razas únicas presentes en la matriz de personajes.
-    Utiliza un conjunto (set) para eliminar duplicados y luego convierte a lista
-    para mantener solo valores únicos de razas.
+    Utiliza un conjunto (set) para detectar duplicados en O(1) y conserva el orden
+    de primera aparicion de cada raza.
     
     Args:
         matriz (list): Matriz bidimensional con los datos de los personajes.
@@ -76,13 +87,36 @@ def obtener_razas_unicas(matriz: list) -> list:
     Returns:
         list: Lista con todas las razas únicas encontradas en la matriz, sin duplicados.
     """
+    razas_vistas = set()
     razas_unicas = []
     for personaje in matriz:
         raza = personaje[2]  # Indice 2 = raza
-        if raza not in  razas_unicas:
+        if raza not in razas_vistas:
+            razas_vistas.add(raza)
             razas_unicas.append(raza)
     return razas_unicas
 
+def agrupar_por_columna(matriz: list, indice_columna: int) -> dict:
+    """
+    Agrupa los personajes segun el valor exacto de una columna, en una sola pasada.
+    
+    Args:
+        matriz (list): Matriz bidimensional con los datos de los personajes.
+        indice_columna (int): Índice de la columna por la que se agrupa (ej: 2 = raza).
+    
+    Returns:
+        dict: Diccionario {valor: lista de personajes}. Cada grupo conserva el orden
+            original de la matriz.
+    """
+    grupos = {}
+    for personaje in matriz:
+        valor = personaje[indice_columna]
+        if valor in grupos:
+            grupos[valor].append(personaje)
+        else:
+            grupos[valor] = [personaje]
+    return grupos
+
 def filtrar_por_raza_exacta(matriz: list, raza_buscar: str) -> list:
     """
     Filtra personajes que tengan una raza que coincida exactamente con la especificada.
@@ -103,7 +137,7 @@ def filtrar_por_raza_exacta(matriz: list, raza_buscar: str) -> list:
 
 def ordenar_por_mas_poder(matriz: list) -> list:
     """
-    Ordena la matriz por poder en orden descendente utilizando algoritmo Selection Sort.
+    Ordena la matriz por poder en orden descendente de forma estable, en O(n log n).
     
     Args:
         matriz (list): Matriz bidimensional con los datos de los personajes.
@@ -112,16 +146,7 @@ def ordenar_por_mas_poder(matriz: list) -> list:
         list: Nueva matriz ordenada descendentemente por poder. La matriz original
             no se modifica.
     """
-    matriz_ordenada = []
-    for personaje in matriz:
-        matriz_ordenada.append(personaje[:])
-
-    # Selection Sort
-    for i in range(len(matriz_ordenada) - 1):
-        pos_max = encontrar_extremo(matriz_ordenada, i, 4, True)
-        intercambiar_posicion(matriz_ordenada, i, pos_max)
-
-    return matriz_ordenada
+    return ordenar_por_criterios(matriz, [(4, True)])  # Indice 4 = poder
 
 def agregar_grupo_a_matriz(matriz_destino: list, grupo: list) -> None:
     """
@@ -137,12 +162,37 @@ def agregar_grupo_a_matriz(matriz_destino: list, grupo: list) -> None:
     for personaje in grupo:
         matriz_destino.append(personaje)
 
+def ordenar_por_criterios(matriz: list, criterios: list) -> list:
+    """
+    Ordena la matriz por varias columnas a la vez ("por X y luego por Y").
+    Aplica un sort estable por cada criterio, desde el menos importante al mas
+    importante, por lo que el costo es O(c · n log n) para c criterios.
+    
+    Args:
+        matriz (list): Matriz bidimensional con los datos de los personajes.
+        criterios (list): Lista de tuplas (indice_columna, descendente) en orden de prioridad.
+                        Ej: [(2, False), (4, True)] = raza ascendente y luego poder descendente.
+    
+    Returns:
+        list: Nueva matriz ordenada. A igualdad en todos los criterios se conserva
+            el orden original.
+    """
+    matriz_ordenada = list(matriz)
+    for indice_columna, descendente in reversed(criterios):
+        claves = obtener_columna(matriz_ordenada, indice_columna)
+        indices = ordenar_indices_timsort(claves, range(len(matriz_ordenada)), descendente)
+        matriz_ordenada = [matriz_ordenada[i] for i in indices]
+    return matriz_ordenada
+
 def ordenar_personalizado(matriz: list) -> list:
     """
     Aplica un ordenamiento personalizado a la matriz de personajes.
     1. Por raza en orden alfabético ascendente
     2. Dentro de cada raza, por poder en orden descendente
     3. Mantiene estabilidad dentro de grupos con mismo poder
+
+    Agrupa los personajes por raza en una sola pasada y ordena cada grupo
+    por separado, en lugar de volver a recorrer la matriz por cada raza.
     
     Args:
         matriz (list): Matriz bidimensional con los datos de los personajes.
@@ -151,63 +201,243 @@ def ordenar_personalizado(matriz: list) -> list:
         list: Nueva matriz ordenada según el criterio personalizado.
     """
 
-    razas_unicas = obtener_razas_unicas(matriz)
-    razas_ordenadas = sorted(razas_unicas)
+    grupos = agrupar_por_columna(matriz, 2)  # Indice 2 = raza
     
     matriz_final = []
-    for raza in razas_ordenadas:
-        grupo_raza = filtrar_por_raza_exacta(matriz, raza)
-        grupo_ordenado = ordenar_por_mas_poder(grupo_raza)
+    for raza in sorted(grupos):
+        grupo_ordenado = ordenar_por_mas_poder(grupos[raza])
         agregar_grupo_a_matriz(matriz_final, grupo_ordenado)
 
     return matriz_final
 
-def encontrar_extremo(matriz: list, inicio: int, indice_stat: int, buscar_maximo=True):
+def encontrar_extremo(matriz: list, inicio: int, indice_stat: int, buscar_maximo=True, claves=None):
     """
     Encuentra el maximo o minimo en la matriz desde inicio.
 
     Args:
-        matriz (list): Matriz bidimensional con los datos de los personajes.
+        matriz (list): Matriz bidimensional con los datos de los personajes o, si se
+                    indican claves, lista de indices de filas.
         inicio (int): Indice desde donde comenzar a buscar.
         indice_stat (int): Indice del stat a comparar (4=poder, 5=inteligencia, 6=velocidad).
         buscar_maximo (bool): Si es True, busca el máximo y si es False, busca el mínimo.
+        claves (list, opcional): Valores del stat para cada fila. Si se indican, se compara
+                                claves[matriz[i]] en lugar de matriz[i][indice_stat].
 
     Returns:
         int: Indice del personaje con el maximo o minimo en el stat especificado.
     """
+    if claves is None:
+        valor_en = lambda posicion: matriz[posicion][indice_stat]
+    else:
+        valor_en = lambda posicion: claves[matriz[posicion]]
 
     pos_extremo = inicio
+    valor_extremo = valor_en(inicio) if inicio < len(matriz) else None
+    comparaciones = 0
     for i in range(inicio + 1, len(matriz)):
+        valor = valor_en(i)
+        comparaciones += 1
         if buscar_maximo:
-            if matriz[i][indice_stat] > matriz[pos_extremo][indice_stat]:
-                pos_extremo = i
+            if valor > valor_extremo:
+                pos_extremo, valor_extremo = i, valor
         else:
-            if matriz[i][indice_stat] < matriz[pos_extremo][indice_stat]:
-                pos_extremo = i
+            if valor < valor_extremo:
+                pos_extremo, valor_extremo = i, valor
 
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("comparaciones", comparaciones)
     return pos_extremo
 
-def ordenar_por_stat(matriz: list, indice_stat: int, descendente=True, excluir_raza=None) -> list:
+def ordenar_indices_timsort(claves: list, indices: list, descendente: bool) -> list:
+    """
+    Motor de ordenamiento O(n log n) basado en el sort nativo de Python (Timsort).
+    Es estable: los personajes con el mismo stat conservan su orden original,
+    tanto en orden ascendente como descendente.
+
+    Args:
+        claves (list): Valores del stat para cada fila de la matriz.
+        indices (list): Indices de las filas a ordenar.
+        descendente (bool): True para DES, False para ASC.
+
+    Returns:
+        list: Los indices ordenados segun el valor de su clave.
     """
-    Ordena la matriz por un stat específico en orden ascendente o descendente
+    return sorted(indices, key=claves.__getitem__, reverse=descendente)
+
+def ordenar_indices_seleccion(claves: list, indices: list, descendente: bool) -> list:
+    """
+    Motor de ordenamiento O(n²) por Selection Sort. Se conserva como referencia
+    para comparar contra el motor por defecto en los benchmarks.
+
+    Args:
+        claves (list): Valores del stat para cada fila de la matriz.
+        indices (list): Indices de las filas a ordenar.
+        descendente (bool): True para DES, False para ASC.
+
+    Returns:
+        list: Los indices ordenados segun el valor de su clave.
+    """
+    indices_ordenados = indices[:]
+
+    for i in range(len(indices_ordenados) - 1):
+        # encontrar_extremo e intercambiar_posicion cuentan comparaciones e intercambios
+        pos_extremo = encontrar_extremo(indices_ordenados, i, None, descendente, claves)
+        intercambiar_posicion(indices_ordenados, i, pos_extremo)
+
+    return indices_ordenados
+
+MOTORES_ORDENAMIENTO = {
+    "timsort": ordenar_indices_timsort,
+    "seleccion": ordenar_indices_seleccion,
+}
+
+def ordenar_indices_por_stat(matriz: list, indice_stat: int, descendente=True, excluir_raza=None,
+                            motor: str = "timsort") -> list:
+    """
+    Calcula la permutacion de indices que ordena la matriz por un stat, sin copiar filas.
+
+    Args:
+        matriz (list): Matriz de personajes
+        indice_stat (int): Índice del stat a ordenar (4=poder, 5=inteligencia, 6=velocidad).
+        descendente (bool): True para DES, False para ASC
+        excluir_raza (str, opcional): None para todos, "Human" para excluir humanos etc.
+        motor (str, opcional): Nombre del motor en MOTORES_ORDENAMIENTO. Por defecto "timsort".
+
+    Returns:
+        list: Indices de las filas de la matriz en el orden resultante.
+    """
+    if excluir_raza is None:
+        indices = list(range(len(matriz)))
+    elif isinstance(matriz, AlmacenPersonajes):
+        # El indice de razas marca las filas a excluir sin comparar cadenas por fila
+        excluidos = bytearray(len(matriz))
+        for posicion in matriz.posiciones_coincidentes(2, lambda raza: excluir_raza in raza):
+            excluidos[posicion] = 1
+        indices = [i for i, excluido in enumerate(excluidos) if not excluido]
+    else:
+        indices = []
+        for i, personaje in enumerate(matriz):
+            if excluir_raza not in personaje[2]:
+                indices.append(i)
+
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("filas_recorridas", len(matriz))
+    claves = VistaColumna(matriz, indice_stat).valores()  # Sin copia sobre un almacen
+    motor_ordenamiento = MOTORES_ORDENAMIENTO[motor]
+    return motor_ordenamiento(claves, indices, descendente)
+
+def seleccionar_top_k(personajes, indice_stat: int, k: int = 1, descendente=True,
+                    incluir_empates=False, predicado=None) -> list:
+    """
+    Selecciona los k personajes con mayor (o menor) valor de un stat en una sola pasada,
+    usando un heap de tamaño k. Acepta cualquier iterable, incluso un generador, por lo
+    que no necesita copiar ni cargar completa la entrada.
+    
+    Args:
+        personajes (iterable): Personajes (o tuplas) a recorrer.
+        indice_stat (int): Índice del valor a comparar (4=poder, 5=inteligencia, 6=velocidad).
+        k (int, opcional): Cantidad de personajes a seleccionar. Por defecto 1.
+        descendente (bool, opcional): True busca los mayores, False los menores.
+        incluir_empates (bool, opcional): Si es True, incluye tambien a todos los personajes
+                                        empatados con el k-ésimo valor.
+        predicado (callable, opcional): Si se indica, solo se consideran los personajes
+                                        para los que retorna True.
+    
+    Returns:
+        list: Personajes seleccionados, del mejor al peor valor. A igual valor se respeta
+            el orden de aparicion en la entrada.
+    """
+    if k <= 0:
+        return []
+
+    heap = []
+    empatados = []  # Desplazados del heap con el mismo valor que el peor del heap
+    orden = -1  # Si la entrada esta vacia no se recorre ninguna fila
+    for orden, personaje in enumerate(personajes):
+        if predicado is not None and not predicado(personaje):
+            continue
+        clave = personaje[indice_stat] if descendente else -personaje[indice_stat]
+        # -orden hace que, a igual clave, el peor del heap sea el que aparecio ultimo
+        entrada = (clave, -orden, personaje)
+        if len(heap) < k:
+            heapq.heappush(heap, entrada)
+        elif clave > heap[0][0]:
+            desplazado = heapq.heapreplace(heap, entrada)
+            if incluir_empates:
+                if desplazado[0] == heap[0][0]:
+                    empatados.append(desplazado)
+                else:
+                    empatados = []
+        elif incluir_empates and clave == heap[0][0]:
+            empatados.append(entrada)
+
+    if instrumentacion.ACTIVA:
+        instrumentacion.contar("filas_recorridas", orden + 1)
+    seleccionados = heap + empatados
+    seleccionados.sort(key=lambda entrada: (-entrada[0], -entrada[1]))
+    return [entrada[2] for entrada in seleccionados]
+
+def ordenar_por_stat(matriz: list, indice_stat: int, descendente=True, excluir_raza=None,
+                    motor: str = "timsort", limite=None) -> list:
+    """
+    Ordena la matriz por un stat específico en orden ascendente o descendente.
+    Ordena una permutacion de indices y luego arma la nueva matriz con las filas
+    originales, sin copiarlas. Con el motor por defecto el costo es O(n log n) y
+    el orden es estable.
 
     Args:
         matriz (list): Matriz de personajes
         indice_stat (int): Índice del stat a ordenar (4=poder, 5=inteligencia, 6=velocidad).
         descendente (bool): True para DES, False para ASC
         excluir_raza (str, opcional): None para todos, "Human" para excluir humanos etc.
+        motor (str, opcional): Nombre del motor en MOTORES_ORDENAMIENTO. Por defecto "timsort".
+        limite (int, opcional): Si se indica, retorna solo los primeros `limite` personajes
+                            usando seleccionar_top_k en una sola pasada, sin ordenar todo.
     Returns:
         list: Nueva matriz ordenada según el stat y criterio especificado.
     """
 
+    if limite is not None:
+        return ordenar_por_stat_con_limite(matriz, indice_stat, descendente, excluir_raza, limite)
+
+    indices = ordenar_indices_por_stat(matriz, indice_stat, descendente, excluir_raza, motor)
+
+    if isinstance(matriz, AlmacenPersonajes):
+        return matriz.filas(indices)
+
     matriz_ordenada = []
-    for personaje in matriz:
-        if excluir_raza is None or excluir_raza not in personaje[2]:
-            matriz_ordenada.append(personaje[:])
+    for i in indices:
+        matriz_ordenada.append(matriz[i])
+
+    return matriz_ordenada
+
+def ordenar_por_stat_con_limite(matriz: list, indice_stat: int, descendente: bool,
+                                excluir_raza, limite: int) -> list:
+    """
+    Retorna los primeros `limite` personajes que daria ordenar_por_stat, en una sola
+    pasada y sin ordenar toda la matriz (ej: los 10 mas veloces que no son Human).
+
+    Args:
+        matriz (list): Matriz de personajes
+        indice_stat (int): Índice del stat a ordenar (4=poder, 5=inteligencia, 6=velocidad).
+        descendente (bool): True para DES, False para ASC
+        excluir_raza (str): None para todos, "Human" para excluir humanos etc.
+        limite (int): Cantidad maxima de personajes a retornar.
 
-    # Selection Sort
-    for i in range(len(matriz_ordenada) - 1):
-        pos_extremo = encontrar_extremo(matriz_ordenada, i, indice_stat, buscar_maximo=descendente)
-        intercambiar_posicion(matriz_ordenada, i, pos_extremo)
+    Returns:
+        list: Hasta `limite` personajes, en el mismo orden que ordenar_por_stat.
+    """
+    if isinstance(matriz, AlmacenPersonajes):
+        # Recorre solo las columnas de raza y stat: (posicion, codigo_raza, stat)
+        candidatos = zip(range(len(matriz)), matriz.codigos(2), matriz.columna(indice_stat))
+        predicado = None
+        if excluir_raza is not None:
+            excluidos = matriz.codigos_coincidentes(2, lambda raza: excluir_raza in raza)
+            predicado = lambda candidato: candidato[1] not in excluidos
+        seleccionados = seleccionar_top_k(candidatos, 2, limite, descendente, predicado=predicado)
+        return matriz.filas(candidato[0] for candidato in seleccionados)
 
-    return matriz_ordenada
\ No newline at end of file
+    predicado = None
+    if excluir_raza is not None:
+        predicado = lambda personaje: excluir_raza not in personaje[2]
+    return seleccionar_top_k(matriz, indice_stat, limite, descendente, predicado=predicado)
\ No newline at end of file
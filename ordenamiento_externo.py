@@ -0,0 +1,280 @@
+"""
+Ordenamiento externo de personajes para datasets que no entran en memoria.
+
+Los personajes se leen en tramos de tamaño fijo. Cada tramo se ordena en un proceso
+del pool y se guarda ordenado en un archivo temporal (un "tramo ordenado"). Luego los
+tramos se combinan con heapq.merge, que es un generador: los personajes ordenados se
+producen de a uno y solo se mantiene en memoria un bloque por tramo.
+
+El orden es el mismo que el de operaciones_ordenamiento (estable): cada personaje
+lleva su numero de aparicion como ultimo criterio, por lo que a igualdad en todos los
+criterios se conserva el orden original.
+"""
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+from itertools import chain, count, islice
+from operator import itemgetter, neg
+
+import cargador_datos
+from almacen_personajes import CANTIDAD_COLUMNAS, COLUMNAS_NUMERICAS
+
+FILAS_POR_TRAMO = 100_000  # Personajes que se ordenan juntos en memoria
+FILAS_POR_BLOQUE = 1_000  # Personajes que se escriben y leen juntos en un tramo ordenado
+MAXIMO_TRAMOS_ABIERTOS = 64  # Tramos que se combinan a la vez (archivos abiertos)
+CRITERIOS_PERSONALIZADO = [(2, False), (4, True)]  # Raza ascendente, luego poder descendente
+
+
+def validar_criterios(criterios: list) -> tuple:
+    """
+    Verifica que los criterios se puedan usar en el ordenamiento externo.
+
+    Args:
+        criterios (list): Tuplas (indice_columna, descendente) en orden de prioridad.
+
+    Returns:
+        tuple: Los criterios como tupla de tuplas.
+
+    Raises:
+        ValueError: Si se pide orden descendente sobre una columna de texto.
+    """
+    for indice_columna, descendente in criterios:
+        if descendente and indice_columna not in COLUMNAS_NUMERICAS:
+            raise ValueError("El orden descendente solo se admite en poder, inteligencia o velocidad.")
+    return tuple((indice_columna, bool(descendente)) for indice_columna, descendente in criterios)
+
+
+def armar_entradas(personajes: list, primer_numero: int, criterios: tuple) -> list:
+    """
+    Arma las entradas a ordenar: tuplas planas con un valor por criterio (negado si es
+    descendente), el numero de aparicion del personaje, que desempata, y los siete datos
+    del personaje. Como dos entradas nunca empatan en el numero, los datos no se llegan
+    a comparar. Una tupla plana por personaje se escribe y se lee bastante mas rapido
+    que una tupla con la fila anidada.
+
+    Args:
+        personajes (list): Personajes del tramo.
+        primer_numero (int): Numero de aparicion del primer personaje.
+        criterios (tuple): Tuplas (indice_columna, descendente).
+
+    Returns:
+        list: Entradas (valores..., numero, nombre, ..., velocidad), sin ordenar.
+    """
+    claves = []
+    for indice, descendente in criterios:
+        valores = map(itemgetter(indice), personajes)
+        claves.append(map(neg, valores) if descendente else valores)
+    return list(zip(*claves, count(primer_numero), *zip(*personajes)))
+
+
+def escribir_tramo(entradas, ruta: str, filas_por_bloque: int = FILAS_POR_BLOQUE) -> str:
+    """
+    Escribe entradas ya ordenadas en un archivo, por bloques.
+
+    Args:
+        entradas (iterable): Entradas ordenadas.
+        ruta (str): Archivo a crear.
+        filas_por_bloque (int, opcional): Entradas por bloque.
+
+    Returns:
+        str: La ruta del archivo escrito.
+    """
+    entradas = iter(entradas)
+    with open(ruta, "wb") as archivo:
+        while True:
+            bloque = list(islice(entradas, filas_por_bloque))
+            if not bloque:
+                break
+            pickle.dump(bloque, archivo, pickle.HIGHEST_PROTOCOL)
+    return ruta
+
+
+def leer_tramo(ruta: str):
+    """
+    Lee un tramo ordenado de a un bloque por vez.
+
+    Args:
+        ruta (str): Archivo escrito por escribir_tramo.
+
+    Yields:
+        tuple: Entradas (valores..., numero, nombre, ..., velocidad) en orden.
+    """
+    with open(ruta, "rb") as archivo:
+        while True:
+            try:
+                bloque = pickle.load(archivo)
+            except EOFError:
+                return
+            yield from bloque
+
+
+def ordenar_tramo(tarea: tuple) -> str:
+    """
+    Ordena un tramo de personajes y lo guarda en un archivo. Se ejecuta en el pool.
+
+    Args:
+        tarea (tuple): (personajes, numero del primero, criterios, raza a excluir o None,
+                    ruta del archivo a crear).
+
+    Returns:
+        str: La ruta del tramo ordenado.
+    """
+    personajes, primer_numero, criterios, excluir_raza, ruta = tarea
+    if excluir_raza is not None:
+        personajes = [personaje for personaje in personajes if excluir_raza not in personaje[2]]
+    entradas = armar_entradas(personajes, primer_numero, criterios)
+    entradas.sort()
+    return escribir_tramo(entradas, ruta)
+
+
+def combinar_tramos(rutas: list):
+    """
+    Combina varios tramos ordenados en un unico recorrido ordenado.
+
+    Args:
+        rutas (list): Archivos de tramos ordenados.
+
+    Returns:
+        iterator: Entradas en orden.
+    """
+    return heapq.merge(*(leer_tramo(ruta) for ruta in rutas))
+
+
+def generar_tramos(personajes, criterios: tuple, excluir_raza, directorio: str,
+                filas_por_tramo: int, procesos: int) -> list:
+    """
+    Divide los personajes en tramos, los ordena (en paralelo si procesos > 1) y los
+    guarda en el directorio. Como mucho procesos + 1 tramos esperan en memoria a la vez.
+
+    Returns:
+        list: Rutas de los tramos ordenados, en el orden de la entrada.
+    """
+    personajes = iter(personajes)
+    tareas = ((tramo, numero * filas_por_tramo, criterios, excluir_raza,
+            os.path.join(directorio, f"tramo_{numero}.bin"))
+            for numero, tramo in enumerate(iter(lambda: list(islice(personajes, filas_por_tramo)), [])))
+
+    if procesos <= 1:
+        return [ordenar_tramo(tarea) for tarea in tareas]
+
+    # Se importa recien aca: multiprocessing demora el arranque del programa
+    from multiprocessing import Pool
+    rutas = []
+    with Pool(procesos) as pool:
+        pendientes = []
+        for tarea in tareas:
+            pendientes.append(pool.apply_async(ordenar_tramo, (tarea,)))
+            if len(pendientes) > procesos:
+                rutas.append(pendientes.pop(0).get())
+        rutas.extend(pendiente.get() for pendiente in pendientes)
+    return rutas
+
+
+def reducir_tramos(rutas: list, directorio: str) -> list:
+    """
+    Si hay mas de MAXIMO_TRAMOS_ABIERTOS tramos, los combina por grupos en tramos
+    nuevos hasta que se puedan abrir todos a la vez.
+
+    Returns:
+        list: Rutas de los tramos resultantes.
+    """
+    pasada = 0
+    while len(rutas) > MAXIMO_TRAMOS_ABIERTOS:
+        nuevas = []
+        for inicio in range(0, len(rutas), MAXIMO_TRAMOS_ABIERTOS):
+            grupo = rutas[inicio:inicio + MAXIMO_TRAMOS_ABIERTOS]
+            ruta = os.path.join(directorio, f"combinado_{pasada}_{len(nuevas)}.bin")
+            nuevas.append(escribir_tramo(combinar_tramos(grupo), ruta))
+            for ruta_grupo in grupo:
+                os.remove(ruta_grupo)
+        rutas = nuevas
+        pasada += 1
+    return rutas
+
+
+def ordenar_externo(personajes, criterios: list, excluir_raza=None, filas_por_tramo: int = FILAS_POR_TRAMO,
+                    procesos=None, directorio=None):
+    """
+    Ordena personajes por varias columnas sin cargarlos todos en memoria.
+
+    Args:
+        personajes (iterable): Personajes a ordenar (ej: un generador que lee un archivo).
+        criterios (list): Tuplas (indice_columna, descendente) en orden de prioridad.
+                        Ej: [(2, False), (4, True)] = raza ascendente y luego poder descendente.
+        excluir_raza (str, opcional): Excluye los personajes cuya raza contiene este texto.
+        filas_por_tramo (int, opcional): Personajes que se ordenan juntos en memoria.
+        procesos (int, opcional): Procesos que ordenan tramos en paralelo. None usa
+                                os.cpu_count(); 1 ordena en este proceso.
+        directorio (str, opcional): Donde crear los archivos temporales. None usa el
+                                    directorio temporal del sistema.
+
+    Yields:
+        tuple: Personajes en orden, como tuplas (nombre, alias, raza, genero, poder,
+            inteligencia, velocidad). A igualdad en todos los criterios se conserva el
+            orden de la entrada. Los archivos temporales se borran al terminar (o al
+            cerrar el generador).
+    """
+    criterios = validar_criterios(criterios)
+    procesos = procesos or os.cpu_count() or 1
+    directorio_tramos = tempfile.mkdtemp(prefix="orden_externo_", dir=directorio)
+    try:
+        rutas = generar_tramos(personajes, criterios, excluir_raza, directorio_tramos, filas_por_tramo, procesos)
+        rutas = reducir_tramos(rutas, directorio_tramos)
+        datos_personaje = itemgetter(slice(-CANTIDAD_COLUMNAS, None))
+        yield from map(datos_personaje, combinar_tramos(rutas))
+    finally:
+        shutil.rmtree(directorio_tramos, ignore_errors=True)
+
+
+def ordenar_externo_por_stat(personajes, indice_stat: int, descendente=True, excluir_raza=None, **opciones):
+    """
+    Version externa de operaciones_ordenamiento.ordenar_por_stat.
+
+    Args:
+        personajes (iterable): Personajes a ordenar.
+        indice_stat (int): Índice del stat a ordenar (4=poder, 5=inteligencia, 6=velocidad).
+        descendente (bool): True para DES, False para ASC.
+        excluir_raza (str, opcional): None para todos, "Human" para excluir humanos etc.
+        **opciones: filas_por_tramo, procesos y directorio de ordenar_externo.
+
+    Returns:
+        generator: Personajes en el mismo orden que ordenar_por_stat.
+    """
+    return ordenar_externo(personajes, [(indice_stat, descendente)], excluir_raza, **opciones)
+
+
+def ordenar_externo_personalizado(personajes, **opciones):
+    """
+    Version externa de operaciones_ordenamiento.ordenar_personalizado (raza ascendente y,
+    dentro de cada raza, poder descendente).
+
+    Args:
+        personajes (iterable): Personajes a ordenar.
+        **opciones: filas_por_tramo, procesos y directorio de ordenar_externo.
+
+    Returns:
+        generator: Personajes en el mismo orden que ordenar_personalizado.
+    """
+    return ordenar_externo(personajes, CRITERIOS_PERSONALIZADO, **opciones)
+
+
+def leer_personajes_archivo(ruta: str, tamano_bloque: int = cargador_datos.TAMANO_BLOQUE):
+    """
+    Lee los personajes validos de un archivo CSV, JSON Lines o Parquet sin cargarlo
+    completo, con las mismas reglas que cargador_datos.cargar_archivo. Las filas
+    invalidas se descartan.
+
+    Args:
+        ruta (str): Ruta del archivo.
+        tamano_bloque (int, opcional): Filas que se leen y validan por vez.
+
+    Returns:
+        iterator: Personajes validos, en el orden del archivo.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in cargador_datos.LECTORES:
+        raise ValueError(f"Formato no soportado: {extension}. Use .csv, .jsonl o .parquet.")
+    bloques = cargador_datos.LECTORES[extension](ruta, tamano_bloque)
+    return chain.from_iterable(cargador_datos.preparar_bloque(bloque)[0] for bloque in bloques)
@@ -0,0 +1,238 @@
+"""
+Snapshots binarios del almacen de personajes.
+
+Formato del archivo (little-endian):
+    - Encabezado: firma b"PJSNAP01", cantidad de personajes (uint64) y una tabla
+      de 15 secciones con (desplazamiento, longitud) en uint64.
+    - Por cada columna de texto (nombre, alias, raza, genero), su tabla de cadenas
+      en dos secciones: desplazamientos int64 (cantidad + 1) y los bytes UTF-8.
+    - Las siete columnas de codigos y stats, como int32 de ancho fijo.
+Cada seccion empieza alineada a 8 bytes.
+
+abrir_snapshot mapea el archivo con mmap y las columnas del almacen resultante
+son vistas sobre el buffer mapeado, sin copiar datos.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from almacen_personajes import (
+    AlmacenPersonajes, DiccionarioCadenas,
+    COLUMNAS_TEXTO, CANTIDAD_COLUMNAS,
+)
+
+FIRMA = b"PJSNAP01"
+EXTENSION_SNAPSHOT = ".pjs"
+CANTIDAD_SECCIONES = 2 * len(COLUMNAS_TEXTO) + CANTIDAD_COLUMNAS
+FORMATO_ENCABEZADO = "<8sQ" + "QQ" * CANTIDAD_SECCIONES
+ALINEACION = 8
+ES_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+class TablaCadenasMapeada:
+    """
+    Tabla de cadenas de un snapshot. Decodifica cada cadena recien al accederla.
+    """
+
+    def __init__(self, desplazamientos: memoryview, contenido: memoryview) -> None:
+        self.desplazamientos = desplazamientos
+        self.contenido = contenido
+
+    def __len__(self) -> int:
+        return len(self.desplazamientos) - 1
+
+    def __getitem__(self, codigo: int) -> str:
+        return str(self.contenido[self.desplazamientos[codigo]:self.desplazamientos[codigo + 1]], "utf-8")
+
+    def __iter__(self):
+        for codigo in range(len(self)):
+            yield self[codigo]
+
+
+def a_little_endian(columna: array) -> bytes:
+    """
+    Retorna los bytes de una columna de enteros en orden little-endian.
+
+    Args:
+        columna (array): Columna de enteros.
+
+    Returns:
+        bytes: Contenido de la columna listo para escribir.
+    """
+    if ES_LITTLE_ENDIAN:
+        return columna.tobytes()
+    copia = array(columna.typecode, columna)
+    copia.byteswap()
+    return copia.tobytes()
+
+
+def armar_secciones(almacen: AlmacenPersonajes) -> list:
+    """
+    Serializa las tablas de cadenas y las columnas del almacen.
+
+    Args:
+        almacen (AlmacenPersonajes): Almacen a serializar.
+
+    Returns:
+        list: Contenido (bytes) de cada seccion, en el orden del formato.
+    """
+    secciones = []
+    for indice in COLUMNAS_TEXTO:
+        desplazamientos = array('q', [0])
+        contenido = bytearray()
+        for cadena in almacen.diccionarios[indice].valores:
+            contenido += cadena.encode("utf-8")
+            desplazamientos.append(len(contenido))
+        secciones.append(a_little_endian(desplazamientos))
+        secciones.append(bytes(contenido))
+    for columna in almacen.columnas:
+        secciones.append(a_little_endian(array('i', columna)))
+    return secciones
+
+
+def guardar_snapshot(matriz, ruta: str) -> None:
+    """
+    Guarda la matriz de personajes en un snapshot binario. Escribe primero un archivo
+    temporal y luego lo reemplaza, para no dejar un snapshot a medio escribir.
+
+    Args:
+        matriz (list | AlmacenPersonajes): Matriz de personajes a guardar.
+        ruta (str): Ruta del archivo de snapshot.
+
+    Returns:
+        None
+    """
+    if isinstance(matriz, AlmacenPersonajes):
+        almacen = matriz
+    else:
+        almacen = AlmacenPersonajes()
+        almacen.agregar_varios(matriz)
+
+    secciones = armar_secciones(almacen)
+    tabla = []
+    desplazamiento = struct.calcsize(FORMATO_ENCABEZADO)
+    for seccion in secciones:
+        desplazamiento += -desplazamiento % ALINEACION
+        tabla.extend((desplazamiento, len(seccion)))
+        desplazamiento += len(seccion)
+
+    ruta_temporal = ruta + ".tmp"
+    with open(ruta_temporal, "wb") as archivo:
+        archivo.write(struct.pack(FORMATO_ENCABEZADO, FIRMA, len(almacen), *tabla))
+        for posicion, seccion in enumerate(secciones):
+            archivo.write(b"\0" * (tabla[2 * posicion] - archivo.tell()))
+            archivo.write(seccion)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(ruta_temporal, ruta)
+
+
+def vista_enteros(buffer: memoryview, formato: str):
+    """
+    Interpreta una seccion como enteros. En maquinas little-endian es una vista sin copia;
+    en las demas se copia a un array con el orden de bytes corregido.
+
+    Args:
+        buffer (memoryview): Bytes de la seccion.
+        formato (str): 'i' para int32 o 'q' para int64.
+
+    Returns:
+        memoryview | array: Secuencia de enteros de la seccion.
+    """
+    if ES_LITTLE_ENDIAN:
+        return buffer.cast(formato)
+    valores = array(formato, bytes(buffer))
+    valores.byteswap()
+    return valores
+
+
+def validar_secciones(ruta: str, buffer: memoryview, cantidad: int, tabla: tuple) -> None:
+    """
+    Verifica, antes de interpretar las secciones, que cada una este dentro del archivo,
+    que las tablas de cadenas cubran exactamente sus bytes y que las columnas tengan
+    un entero por personaje.
+
+    Args:
+        ruta (str): Ruta del snapshot (para el mensaje de error).
+        buffer (memoryview): Contenido completo del archivo.
+        cantidad (int): Cantidad de personajes segun el encabezado.
+        tabla (tuple): (desplazamiento, longitud) de cada seccion, en secuencia.
+
+    Returns:
+        None
+
+    Raises:
+        ValueError: Si alguna seccion no es consistente con el archivo o el encabezado.
+    """
+    inicio_datos = struct.calcsize(FORMATO_ENCABEZADO)
+    for posicion in range(CANTIDAD_SECCIONES):
+        desplazamiento, longitud = tabla[2 * posicion], tabla[2 * posicion + 1]
+        if desplazamiento < inicio_datos or desplazamiento + longitud > len(buffer):
+            raise ValueError(f"{ruta}: la seccion {posicion} (bytes {desplazamiento} a {desplazamiento + longitud}) "
+                            f"esta fuera del archivo ({len(buffer)} bytes).")
+    for indice in COLUMNAS_TEXTO:
+        desplazamiento, longitud = tabla[4 * indice], tabla[4 * indice + 1]
+        if longitud < 8 or longitud % 8:
+            raise ValueError(f"{ruta}: la tabla de cadenas de la columna {indice} no es valida.")
+        primero, = struct.unpack_from("<q", buffer, desplazamiento)
+        ultimo, = struct.unpack_from("<q", buffer, desplazamiento + longitud - 8)
+        if primero != 0 or ultimo != tabla[4 * indice + 3]:
+            raise ValueError(f"{ruta}: la tabla de cadenas de la columna {indice} no es valida.")
+    primera_columna = 2 * len(COLUMNAS_TEXTO)
+    tamano_entero = array('i').itemsize
+    for posicion in range(primera_columna, CANTIDAD_SECCIONES):
+        longitud = tabla[2 * posicion + 1]
+        if longitud != cantidad * tamano_entero:
+            raise ValueError(f"{ruta}: la columna {posicion - primera_columna} ocupa {longitud} bytes y el "
+                            f"encabezado indica {cantidad} personajes.")
+
+
+def abrir_snapshot(ruta: str) -> AlmacenPersonajes:
+    """
+    Abre un snapshot mapeandolo en memoria. No lee ni copia las columnas: el almacen
+    resultante las consulta directamente sobre el archivo mapeado. Si luego se agregan
+    personajes, el almacen copia sus columnas a memoria antes de la primera escritura.
+
+    Args:
+        ruta (str): Ruta del archivo de snapshot.
+
+    Returns:
+        AlmacenPersonajes: Almacen respaldado por el archivo.
+
+    Raises:
+        ValueError: Si el archivo no es un snapshot o esta truncado o dañado.
+    """
+    with open(ruta, "rb") as archivo:
+        if os.fstat(archivo.fileno()).st_size < struct.calcsize(FORMATO_ENCABEZADO):
+            raise ValueError(f"{ruta} no es un snapshot de personajes valido.")
+        mapeo = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    buffer = memoryview(mapeo)
+    encabezado = struct.unpack_from(FORMATO_ENCABEZADO, buffer)
+    try:
+        if encabezado[0] != FIRMA:
+            raise ValueError(f"{ruta} no es un snapshot de personajes valido.")
+        validar_secciones(ruta, buffer, encabezado[1], encabezado[2:])
+    except ValueError:
+        buffer.release()
+        mapeo.close()
+        raise
+
+    tabla = encabezado[2:]
+    secciones = []
+    for posicion in range(CANTIDAD_SECCIONES):
+        desplazamiento, longitud = tabla[2 * posicion], tabla[2 * posicion + 1]
+        secciones.append(buffer[desplazamiento:desplazamiento + longitud])
+
+    almacen = AlmacenPersonajes()
+    almacen.diccionarios = []
+    for indice in COLUMNAS_TEXTO:
+        desplazamientos = vista_enteros(secciones[2 * indice], 'q')
+        tabla_cadenas = TablaCadenasMapeada(desplazamientos, secciones[2 * indice + 1])
+        almacen.diccionarios.append(DiccionarioCadenas(tabla_cadenas))
+    primera_columna = 2 * len(COLUMNAS_TEXTO)
+    almacen.columnas = [vista_enteros(seccion, 'i') for seccion in secciones[primera_columna:]]
+    almacen.mapeo = mapeo
+    return almacen
@@ -0,0 +1,48 @@
+"""
+Registro inmutable de un personaje.
+
+Personaje es una tupla con campos con nombre (typing.NamedTuple). Cada dato se puede
+leer por nombre (personaje.poder) o por indice (personaje[4]), igual que en las filas
+de lista que usaba el programa, pero no se puede modificar. Por eso agregar_personaje
+y los ordenamientos comparten las filas entre matrices sin copiarlas.
+
+Ocupa menos memoria que una lista de siete elementos. La tupla guarda los datos en el
+mismo bloque que el objeto; la lista los guarda en un bloque aparte. La diferencia se
+mide con benchmarks.medir_memoria_filas.
+
+Las filas de AlmacenPersonajes siguen siendo tuplas comunes, con los mismos campos en
+el mismo orden. Construir una subclase de tupla por fila cuesta unas cuatro veces mas
+que armar la tupla con zip, y una tupla comun ya es inmutable.
+"""
+from typing import NamedTuple
+
+
+class Personaje(NamedTuple):
+    """
+    Datos de un personaje, en el orden de las columnas de la matriz.
+    """
+    nombre: str
+    alias: str
+    raza: str
+    genero: str
+    poder: int
+    inteligencia: int
+    velocidad: int
+
+
+def crear_personaje(datos) -> Personaje:
+    """
+    Convierte los datos de un personaje en un Personaje. Si ya lo son, los retorna sin copiarlos.
+
+    Args:
+        datos (list | tuple | Personaje): [nombre, alias, raza, genero, poder, inteligencia, velocidad].
+
+    Returns:
+        Personaje: Registro inmutable con los datos.
+
+    Raises:
+        TypeError: Si no son exactamente siete datos.
+    """
+    if isinstance(datos, Personaje):
+        return datos
+    return Personaje._make(datos)
@@ -0,0 +1,313 @@
+"""
+Registro de escritura anticipada (write-ahead log) de los personajes agregados.
+
+Cada alta se agrega al final de un archivo antes de aplicarse a la matriz. Un hilo
+escribe las altas pendientes en grupos y hace un solo fsync por grupo (group
+commit), de modo que muchas altas seguidas comparten el costo de sincronizar el
+disco. Al iniciar, recuperar() aplica sobre el ultimo snapshot las altas que
+todavia no estaban en el, y compactar() vuelca todo a un snapshot nuevo en segundo
+plano y descarta del registro lo que ya quedo guardado.
+
+Formato de cada registro: longitud (uint32) y CRC32 (uint32) del contenido,
+seguidos del contenido: JSON [posicion, [nombre, alias, raza, genero, poder,
+inteligencia, velocidad]]. Un registro incompleto o corrupto (ej: por un corte durante
+la escritura) se descarta al leerlo junto con todo lo posterior, con un aviso por la
+salida de errores.
+"""
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+
+import persistencia
+import utils
+from almacen_concurrente import InstantaneaAlmacen
+from almacen_personajes import AlmacenPersonajes
+
+EXTENSION_REGISTRO = ".wal"
+FORMATO_CABECERA = "<II"
+TAMANO_CABECERA = struct.calcsize(FORMATO_CABECERA)
+UMBRAL_COMPACTACION = 8 * 1024 * 1024  # Bytes de registro a partir de los cuales conviene compactar
+
+
+def codificar_registro(posicion: int, personaje) -> bytes:
+    """
+    Codifica el alta de un personaje como registro binario.
+
+    Args:
+        posicion (int): Posicion que ocupa el personaje en la matriz.
+        personaje (list): Datos validados del personaje.
+
+    Returns:
+        bytes: Cabecera y contenido del registro.
+    """
+    contenido = json.dumps([posicion, list(personaje)], ensure_ascii=False).encode("utf-8")
+    return struct.pack(FORMATO_CABECERA, len(contenido), zlib.crc32(contenido)) + contenido
+
+
+def leer_registro(ruta: str, reparar: bool = True):
+    """
+    Lee las altas guardadas en un registro, en orden.
+
+    Args:
+        ruta (str): Ruta del archivo de registro. Si no existe no se lee nada.
+        reparar (bool, opcional): Si es True y el final del archivo esta incompleto o
+                                corrupto, lo recorta para que las nuevas altas se
+                                escriban a continuacion del ultimo registro valido.
+
+    Yields:
+        tuple: (desplazamiento, posicion, personaje) de cada alta valida. El
+            desplazamiento es el byte del archivo donde empieza el registro.
+    """
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+
+    desplazamiento = 0
+    while desplazamiento + TAMANO_CABECERA <= len(datos):
+        longitud, crc = struct.unpack_from(FORMATO_CABECERA, datos, desplazamiento)
+        inicio = desplazamiento + TAMANO_CABECERA
+        contenido = datos[inicio:inicio + longitud]
+        if len(contenido) < longitud or zlib.crc32(contenido) != crc:
+            break
+        try:
+            posicion, personaje = json.loads(contenido)
+        except (TypeError, ValueError):
+            break
+        yield desplazamiento, posicion, personaje
+        desplazamiento = inicio + longitud
+
+    if reparar and desplazamiento < len(datos):
+        recortar_registro(ruta, desplazamiento, "registro incompleto o corrupto")
+
+
+def recortar_registro(ruta: str, desplazamiento: int, motivo: str) -> None:
+    """
+    Descarta del registro todo lo que empieza en desplazamiento y lo informa por la
+    salida de errores. Se usa antes de aceptar altas nuevas, para que no se escriban
+    detras de registros que nunca se van a aplicar.
+
+    Args:
+        ruta (str): Ruta del archivo de registro.
+        desplazamiento (int): Byte donde empieza el primer registro a descartar.
+        motivo (str): Por que se descartan (se incluye en el aviso).
+
+    Returns:
+        None
+    """
+    descartados = os.path.getsize(ruta) - desplazamiento
+    print(f"Aviso: {ruta}: {motivo}; se descartan {descartados} bytes desde el byte {desplazamiento}.",
+        file=sys.stderr)
+    with open(ruta, "r+b") as archivo:
+        archivo.truncate(desplazamiento)
+        os.fsync(archivo.fileno())
+
+
+def recuperar(ruta_snapshot: str, ruta_registro: str) -> AlmacenPersonajes:
+    """
+    Reconstruye la matriz al iniciar: abre el snapshot (si existe) y le aplica las altas
+    del registro que todavia no estaban guardadas en el. Si falta un alta intermedia,
+    el registro se recorta en ese punto: las altas posteriores no se pueden aplicar y,
+    si quedaran, las nuevas altas reutilizarian sus posiciones.
+
+    Args:
+        ruta_snapshot (str): Ruta del snapshot.
+        ruta_registro (str): Ruta del registro de altas.
+
+    Returns:
+        AlmacenPersonajes: Almacen con todos los personajes confirmados.
+    """
+    if os.path.exists(ruta_snapshot):
+        almacen = persistencia.abrir_snapshot(ruta_snapshot)
+    else:
+        almacen = AlmacenPersonajes()
+
+    pendientes = []
+    for desplazamiento, posicion, personaje in leer_registro(ruta_registro):
+        siguiente = len(almacen) + len(pendientes)
+        if posicion < siguiente:
+            continue  # Ya estaba incluido en el snapshot
+        if posicion > siguiente:
+            recortar_registro(ruta_registro, desplazamiento, f"falta el alta de la posicion {siguiente}")
+            break
+        pendientes.append(personaje)
+
+    if pendientes:
+        almacen.agregar_varios(pendientes)
+    return almacen
+
+
+class RegistroEscritura:
+    """
+    Registro de altas abierto para escritura, con group commit en un hilo propio.
+    """
+
+    def __init__(self, ruta: str, tamano_grupo: int = 256, espera_maxima: float = 0.002) -> None:
+        """
+        Args:
+            ruta (str): Ruta del archivo de registro (se crea si no existe).
+            tamano_grupo (int, opcional): Cantidad de altas a partir de la cual se escribe
+                                        el grupo sin esperar mas.
+            espera_maxima (float, opcional): Segundos que se espera a que lleguen mas altas
+                                            antes de escribir un grupo incompleto.
+        """
+        self.ruta = ruta
+        self.tamano_grupo = tamano_grupo
+        self.espera_maxima = espera_maxima
+        self.archivo = open(ruta, "ab")
+        self.pendientes = []
+        self.secuencia_encolada = 0
+        self.secuencia_durable = 0
+        self.cerrado = False
+        self.condicion = threading.Condition()
+        self.bloqueo_archivo = threading.Lock()
+        self.hilo = threading.Thread(target=self.escribir_grupos, daemon=True)
+        self.hilo.start()
+
+    def registrar(self, personaje, posicion: int, esperar: bool = True) -> int:
+        """
+        Agrega el alta de un personaje al registro. Debe llamarse antes de aplicar el alta
+        a la matriz.
+
+        Args:
+            personaje (list): Datos del personaje, validados con las reglas de
+                            utils.validar_personaje_completo.
+            posicion (int): Posicion que ocupara el personaje en la matriz.
+            esperar (bool, opcional): Si es True, retorna recien cuando el alta esta en disco.
+
+        Returns:
+            int: Numero de secuencia del alta, para usar con sincronizar().
+        """
+        error = utils.obtener_error_personaje(personaje)
+        if error is not None:
+            raise ValueError(error)
+        registro = codificar_registro(posicion, personaje)
+
+        with self.condicion:
+            if self.cerrado:
+                raise ValueError("El registro de cambios esta cerrado.")
+            self.pendientes.append(registro)
+            self.secuencia_encolada += 1
+            secuencia = self.secuencia_encolada
+            self.condicion.notify_all()
+            if esperar:
+                while self.secuencia_durable < secuencia:
+                    self.condicion.wait()
+        return secuencia
+
+    def escribir_grupos(self) -> None:
+        """
+        Ciclo del hilo escritor: junta las altas pendientes, las escribe con un solo
+        write y un solo fsync, y avisa a quienes esperan.
+
+        Returns:
+            None
+        """
+        while True:
+            with self.condicion:
+                while not self.pendientes and not self.cerrado:
+                    self.condicion.wait()
+                if not self.pendientes:
+                    return  # Cerrado y sin nada pendiente
+                if len(self.pendientes) < self.tamano_grupo and not self.cerrado:
+                    self.condicion.wait(self.espera_maxima)  # Da tiempo a que se sumen mas altas
+                grupo = self.pendientes
+                self.pendientes = []
+                secuencia = self.secuencia_encolada
+
+            with self.bloqueo_archivo:
+                self.archivo.write(b"".join(grupo))
+                self.archivo.flush()
+                os.fsync(self.archivo.fileno())
+
+            with self.condicion:
+                self.secuencia_durable = secuencia
+                self.condicion.notify_all()
+
+    def sincronizar(self, secuencia=None) -> None:
+        """
+        Espera a que las altas registradas hasta `secuencia` esten en disco.
+
+        Args:
+            secuencia (int, opcional): Numero retornado por registrar(). None espera todas.
+
+        Returns:
+            None
+        """
+        with self.condicion:
+            if secuencia is None:
+                secuencia = self.secuencia_encolada
+            while self.secuencia_durable < secuencia:
+                self.condicion.wait()
+
+    def tamano(self) -> int:
+        """
+        Retorna el tamaño del archivo de registro en bytes.
+
+        Returns:
+            int: Bytes escritos en el registro.
+        """
+        with self.bloqueo_archivo:
+            return self.archivo.tell()
+
+    def compactar(self, almacen: AlmacenPersonajes, ruta_snapshot: str) -> threading.Thread:
+        """
+        Guarda el almacen en un snapshot en segundo plano y luego quita del registro las
+        altas que ya quedaron en el snapshot. Las altas que lleguen mientras tanto se
+        conservan en el registro.
+
+        Args:
+            almacen (AlmacenPersonajes): Almacen con todas las altas aplicadas.
+            ruta_snapshot (str): Ruta del snapshot a escribir.
+
+        Returns:
+            threading.Thread: Hilo que hace la compactacion (se puede esperar con join()).
+        """
+        self.sincronizar()
+        # Una instantanea no cambia con las altas posteriores: se guarda sin copiarla
+        copia = almacen if isinstance(almacen, InstantaneaAlmacen) else almacen.copiar()
+        hilo = threading.Thread(target=self.completar_compactacion, args=(copia, ruta_snapshot))
+        hilo.start()
+        return hilo
+
+    def completar_compactacion(self, copia: AlmacenPersonajes, ruta_snapshot: str) -> None:
+        """
+        Escribe el snapshot y reescribe el registro solo con las altas posteriores a el.
+
+        Args:
+            copia (AlmacenPersonajes): Copia del almacen a guardar.
+            ruta_snapshot (str): Ruta del snapshot a escribir.
+
+        Returns:
+            None
+        """
+        persistencia.guardar_snapshot(copia, ruta_snapshot)
+
+        with self.bloqueo_archivo:
+            ruta_temporal = self.ruta + ".tmp"
+            with open(ruta_temporal, "wb") as archivo:
+                for _, posicion, personaje in leer_registro(self.ruta, reparar=False):
+                    if posicion >= len(copia):
+                        archivo.write(codificar_registro(posicion, personaje))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            self.archivo.close()
+            os.replace(ruta_temporal, self.ruta)
+            self.archivo = open(self.ruta, "ab")
+
+    def cerrar(self) -> None:
+        """
+        Escribe las altas pendientes, detiene el hilo escritor y cierra el archivo.
+
+        Returns:
+            None
+        """
+        with self.condicion:
+            self.cerrado = True
+            self.condicion.notify_all()
+        self.hilo.join()
+        with self.bloqueo_archivo:
+            self.archivo.close()
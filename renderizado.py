@@ -0,0 +1,119 @@
+"""
+Formateo de tablas de personajes por bloques.
+
+Las funciones generar_* son generadores: formatean las filas de a un bloque por vez y
+retornan cada bloque como un unico string, listo para escribirse con una sola llamada.
+Asi un resultado grande nunca se formatea completo en memoria y la consola recibe
+pocas escrituras grandes en lugar de dos print por fila.
+"""
+import sys
+from itertools import islice
+
+SEPARADOR = "=" * 100
+FILAS_POR_BLOQUE = 1000  # Filas que se formatean y escriben juntas
+
+
+def generar_detalle(personajes, titulo: str, limite=None, filas_por_bloque: int = FILAS_POR_BLOQUE):
+    """
+    Genera la tabla de detalle de personajes con el formato de menu.mostrar_detalle_personajes.
+
+    Args:
+        personajes (iterable): Filas [nombre, alias, raza, genero, poder, inteligencia, velocidad].
+        titulo (str): Título de la tabla.
+        limite (int, opcional): Cantidad maxima de filas a mostrar. None muestra todas.
+        filas_por_bloque (int, opcional): Filas formateadas en cada bloque.
+
+    Yields:
+        str: Bloques de texto consecutivos de la tabla (el primero incluye la cabecera).
+    """
+    cabecera = (
+        f"{titulo}\n\n{SEPARADOR}\n"
+        f"{'Nombre':<15} {'Alias':<15} {'Raza':<15} {'Genero':<12} {'Inteligencia':<12} {'Poder':<8} {'Velocidad':<10}\n"
+        f"{SEPARADOR}\n"
+    )
+    filas = iter(personajes) if limite is None else islice(personajes, limite)
+    lineas = [cabecera]
+    for nombre, alias, raza, genero, poder, inteligencia, velocidad in filas:
+        lineas.append(f"{nombre:<15} {alias[:15]:<15} {raza:<15} {genero:<12} {inteligencia:<12} {poder:<8} {velocidad:<10}\n{SEPARADOR}\n")
+        if len(lineas) >= filas_por_bloque:
+            yield "".join(lineas)
+            lineas = []
+    if lineas:
+        yield "".join(lineas)
+
+
+def generar_traspuesta(matriz_traspuesta: list, limite=None, filas_por_bloque: int = FILAS_POR_BLOQUE):
+    """
+    Genera el listado de la matriz traspuesta con el formato de menu.mostrar_matriz_traspuesta.
+
+    Args:
+        matriz_traspuesta (list): Una secuencia de valores por atributo (nombres, alias, ...).
+        limite (int, opcional): Cantidad maxima de personajes a mostrar. None muestra todos.
+        filas_por_bloque (int, opcional): Personajes formateados en cada bloque.
+
+    Yields:
+        str: Bloques de texto consecutivos del listado (el ultimo incluye el cierre).
+    """
+    personajes = zip(*matriz_traspuesta[:7])
+    if limite is not None:
+        personajes = islice(personajes, limite)
+    lineas = ["MATRIZ TRASPUESTA\n"]
+    for numero, (nombre, alias, raza, genero, poder, inteligencia, velocidad) in enumerate(personajes, 1):
+        lineas.append(
+            f"{SEPARADOR}\nPersonaje {numero}:\n{SEPARADOR}\n"
+            f"    Nombre: {nombre}\n    Alias: {alias}\n    Raza: {raza}\n    Genero: {genero}\n"
+            f"    Poder: {poder}\n    Inteligencia: {inteligencia}\n    Velocidad: {velocidad}\n"
+        )
+        if len(lineas) >= filas_por_bloque:
+            yield "".join(lineas)
+            lineas = []
+    lineas.append(f"{SEPARADOR}\n")
+    yield "".join(lineas)
+
+
+def paginar(bloques, lineas_por_pagina: int):
+    """
+    Reagrupa los bloques de un generador en paginas de una cantidad fija de lineas.
+
+    Args:
+        bloques (iterable): Bloques de texto (cada linea termina en salto de linea).
+        lineas_por_pagina (int): Lineas de cada pagina.
+
+    Yields:
+        str: Paginas de texto; la ultima puede tener menos lineas.
+    """
+    pagina = []
+    for bloque in bloques:
+        for linea in bloque.splitlines(keepends=True):
+            pagina.append(linea)
+            if len(pagina) == lineas_por_pagina:
+                yield "".join(pagina)
+                pagina = []
+    if pagina:
+        yield "".join(pagina)
+
+
+def escribir(bloques, salida=None, pausar=None) -> int:
+    """
+    Escribe los bloques con una escritura por bloque y un solo flush al final.
+
+    Args:
+        bloques (iterable): Bloques de texto a escribir.
+        salida (file, opcional): Donde escribir. None usa la salida estandar.
+        pausar (callable, opcional): Se llama entre bloque y bloque (ej: para paginar);
+                                    si retorna False se deja de escribir.
+
+    Returns:
+        int: Cantidad de bloques escritos.
+    """
+    salida = sys.stdout if salida is None else salida
+    escritos = 0
+    for bloque in bloques:
+        if escritos and pausar is not None:
+            salida.flush()
+            if pausar() is False:
+                break
+        salida.write(bloque)
+        escritos += 1
+    salida.flush()
+    return escritos
@@ -0,0 +1,369 @@
+"""
+Servidor de consultas (asyncio) sobre una matriz de personajes compartida.
+
+Atiende a varios clientes a la vez por TCP o por un socket Unix local. El protocolo es
+JSON Lines: cada linea de la solicitud es una operacion del menu, como texto ("16",
+"2:Zed,Z,Human,Masculino,10,10,10") o como objeto {"id": ..., "operacion": "16"}, y
+cada linea de la respuesta es el mismo objeto JSON que escribe cli.py, con el "id"
+de la solicitud si se indico.
+
+Un cliente puede enviar varias solicitudes sin esperar las respuestas (pipelining):
+se resuelven en paralelo y las respuestas se escriben en el orden de las solicitudes.
+La matriz se guarda en un AlmacenConcurrente: cada consulta lee una instantanea, y
+las altas (opcion 2) y la recarga (opcion 1) se aplican sin esperar a las consultas
+en curso. Si la sesion no es concurrente, las consultas comparten un cerrojo de
+lectura y las altas toman el de escritura. En ambos casos las escrituras se aplican
+de a una, despues de las solicitudes anteriores de la misma conexion y antes de las
+siguientes.
+
+Con un registro de cambios, el alta se encola en el registro sin esperar el fsync y
+se aplica a la matriz; la respuesta se envia recien cuando el alta esta en disco. La
+espera no retiene el cerrojo, por lo que las altas de varios clientes se escriben
+juntas (group commit). La recarga, los ordenamientos y las operaciones que retornan
+muchas filas se ejecutan en un pool de hilos, para que el ciclo de eventos siga
+atendiendo consultas cortas. La opcion 22 cierra la conexion.
+
+Ejemplos:
+    python servidor.py --datos personajes.pjs --puerto 8765
+    python servidor.py --datos personajes.csv --socket /tmp/personajes.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, nullcontext
+from typing import Optional
+
+import cli
+import operaciones_estadisticas
+
+PUERTO_POR_DEFECTO = 8765
+OPCIONES_ESCRITURA = {1, 2}
+# Recarga, ordenamientos y operaciones que retornan muchas filas: se resuelven (y se pasan a JSON) en el pool de hilos
+OPCIONES_EN_EXECUTOR = {1, 6, 7, 10, 11, 14, 15, 16, 17, 18, 19, 20, 21}
+PROFUNDIDAD_MAXIMA = 64  # Solicitudes de una conexion en curso a la vez
+FILAS_MINIMAS_MEMO_JSON = 1000  # Listas de filas desde este tamaño se pasan a JSON una sola vez
+MAXIMO_MEMO_JSON = 32  # Listas pasadas a JSON que se recuerdan
+
+
+class CerrojoLecturaEscritura:
+    """
+    Cerrojo para asyncio con varios lectores o un escritor. Un escritor que espera tiene
+    prioridad sobre los lectores nuevos, para que las altas no esperen indefinidamente.
+    """
+
+    def __init__(self) -> None:
+        self.condicion = asyncio.Condition()
+        self.lectores = 0
+        self.escribiendo = False
+        self.escritores_esperando = 0
+
+    @asynccontextmanager
+    async def lectura(self):
+        async with self.condicion:
+            await self.condicion.wait_for(lambda: not self.escribiendo and self.escritores_esperando == 0)
+            self.lectores += 1
+        try:
+            yield
+        finally:
+            async with self.condicion:
+                self.lectores -= 1
+                if self.lectores == 0:
+                    self.condicion.notify_all()
+
+    @asynccontextmanager
+    async def escritura(self):
+        async with self.condicion:
+            self.escritores_esperando += 1
+            await self.condicion.wait_for(lambda: not self.escribiendo and self.lectores == 0)
+            self.escritores_esperando -= 1
+            self.escribiendo = True
+        try:
+            yield
+        finally:
+            async with self.condicion:
+                self.escribiendo = False
+                self.condicion.notify_all()
+
+
+class ServidorConsultas:
+    """
+    Servidor de consultas sobre una sesion (cli.SesionCli) compartida por todos los clientes.
+    """
+
+    def __init__(self, sesion: cli.SesionCli, hilos: Optional[int] = None) -> None:
+        """
+        Args:
+            sesion (cli.SesionCli): Sesion con la matriz ya cargada.
+            hilos (int, opcional): Hilos del pool para las operaciones pesadas. None usa
+                                min(4, os.cpu_count()).
+        """
+        self.sesion = sesion
+        self.sesion.esperar_registro = False  # El servidor espera el fsync fuera del cerrojo
+        self.cerrojo = CerrojoLecturaEscritura()
+        self.cerrojo_escrituras = asyncio.Lock()  # Ordena las escrituras en una sesion concurrente
+        self.executor = ThreadPoolExecutor(hilos or min(4, os.cpu_count() or 1))
+        self.solicitudes_atendidas = 0
+        # id(lista) -> (lista, JSON). Los resultados de la cache se comparten entre
+        # solicitudes sin modificarse, por lo que su JSON se puede reusar
+        self.memo_json = OrderedDict()
+        self.cerrojo_memo = threading.Lock()
+
+    def codificar_filas(self, filas) -> str:
+        """
+        Pasa una lista de filas a JSON, reusando el texto si la misma lista ya se codifico.
+
+        Returns:
+            str: La lista en JSON.
+        """
+        with self.cerrojo_memo:
+            memo = self.memo_json.get(id(filas))
+            if memo is not None and memo[0] is filas:
+                self.memo_json.move_to_end(id(filas))
+                return memo[1]
+        texto = json.dumps(filas, ensure_ascii=False, default=list)
+        with self.cerrojo_memo:
+            self.memo_json[id(filas)] = (filas, texto)
+            if len(self.memo_json) > MAXIMO_MEMO_JSON:
+                self.memo_json.popitem(last=False)
+        return texto
+
+    def ejecutar(self, opcion: int, argumento: Optional[str], identificador) -> str:
+        """
+        Ejecuta una operacion y retorna la linea JSON de la respuesta.
+
+        Returns:
+            str: Respuesta terminada en salto de linea.
+        """
+        inicio = time.perf_counter()
+        if opcion is None:
+            resultado = {"error": "Operacion invalida."}
+        elif opcion == 22:
+            resultado = {}  # Cierra solo la conexion, no la sesion compartida
+        else:
+            try:
+                resultado = self.sesion.ejecutar(opcion, argumento)
+            except Exception as error:  # Un error en una operacion no debe cortar la conexion
+                resultado = {"error": f"{type(error).__name__}: {error}"}
+        respuesta = {"opcion": opcion, "operacion": cli.NOMBRES_OPERACIONES.get(opcion)}
+        if identificador is not None:
+            respuesta["id"] = identificador
+        grandes = {}
+        for clave, valor in resultado.items():
+            if isinstance(valor, list) and len(valor) >= FILAS_MINIMAS_MEMO_JSON:
+                grandes[clave] = self.codificar_filas(valor)
+            else:
+                respuesta[clave] = valor
+        respuesta["segundos"] = time.perf_counter() - inicio
+        texto = json.dumps(respuesta, ensure_ascii=False, default=list)
+        if grandes:
+            texto = texto[:-1] + "".join(f", {json.dumps(clave)}: {valor}" for clave, valor in grandes.items()) + "}"
+        return texto + "\n"
+
+    async def resolver(self, opcion: Optional[int], argumento: Optional[str], identificador,
+                    escritura_anterior: Optional[asyncio.Task] = None) -> str:
+        """
+        Resuelve una solicitud con el cerrojo que corresponde, en el ciclo de eventos o en
+        el pool de hilos.
+
+        Args:
+            opcion (int): Opcion del menu, o None si la solicitud es invalida.
+            argumento (str): Argumento de la opcion 2.
+            identificador: "id" de la solicitud, o None.
+            escritura_anterior (asyncio.Task, opcional): Ultima escritura de la misma
+                                                        conexion, que se espera antes de leer.
+
+        Returns:
+            str: Linea JSON de la respuesta.
+        """
+        self.solicitudes_atendidas += 1
+        if escritura_anterior is not None:
+            await asyncio.wait([escritura_anterior])
+        loop = asyncio.get_running_loop()
+        if self.sesion.concurrente:
+            # Las consultas leen instantaneas: solo las escrituras se ordenan entre si
+            cerrojo = self.cerrojo_escrituras if opcion in OPCIONES_ESCRITURA else nullcontext()
+        elif opcion in OPCIONES_ESCRITURA:
+            cerrojo = self.cerrojo.escritura()
+        else:
+            cerrojo = self.cerrojo.lectura()
+        async with cerrojo:
+            if opcion in OPCIONES_EN_EXECUTOR:
+                respuesta = await loop.run_in_executor(self.executor, self.ejecutar, opcion, argumento, identificador)
+            else:
+                respuesta = self.ejecutar(opcion, argumento, identificador)
+        if opcion == 2:
+            # Responde cuando el alta esta en disco; el pool por defecto no compite con las consultas
+            await loop.run_in_executor(None, self.sesion.sincronizar)
+        return respuesta
+
+    async def responder(self, pendientes: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        """
+        Escribe las respuestas de una conexion en el orden de sus solicitudes.
+
+        Returns:
+            None
+        """
+        while True:
+            tarea = await pendientes.get()
+            if tarea is None:
+                return
+            writer.write((await tarea).encode("utf-8"))
+            await writer.drain()
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Atiende una conexion: lee solicitudes, las resuelve en paralelo y responde en orden.
+
+        Returns:
+            None
+        """
+        pendientes = asyncio.Queue(PROFUNDIDAD_MAXIMA)
+        escritor = asyncio.create_task(self.responder(pendientes, writer))
+        en_curso = []
+        escritura_anterior = None
+        try:
+            while not escritor.done():
+                linea = await reader.readline()
+                if not linea:
+                    break
+                texto = linea.decode("utf-8").strip()
+                if not texto:
+                    continue
+                opcion, argumento, identificador = interpretar_solicitud(texto)
+                en_curso = [tarea for tarea in en_curso if not tarea.done()]
+                if opcion in OPCIONES_ESCRITURA and en_curso:
+                    # Una escritura se aplica despues de las solicitudes anteriores de esta conexion
+                    await asyncio.wait(en_curso)
+                tarea = asyncio.create_task(self.resolver(opcion, argumento, identificador, escritura_anterior))
+                en_curso.append(tarea)
+                if opcion in OPCIONES_ESCRITURA:
+                    escritura_anterior = tarea
+                if not await self.encolar(pendientes, tarea, escritor) or opcion == 22:
+                    break
+            if await self.encolar(pendientes, None, escritor):
+                await escritor
+        except ConnectionError:
+            pass
+        finally:
+            escritor.cancel()
+            for tarea in en_curso:
+                tarea.cancel()
+            writer.close()
+
+    async def encolar(self, pendientes: asyncio.Queue, elemento, escritor: asyncio.Task) -> bool:
+        """
+        Encola un elemento para el escritor de respuestas de una conexion, sin quedar
+        esperando si el escritor ya termino (ej: el cliente cerro la conexion).
+
+        Returns:
+            bool: True si se encolo; False si el escritor termino.
+        """
+        if escritor.done():
+            return False
+        encolado = asyncio.ensure_future(pendientes.put(elemento))
+        await asyncio.wait([encolado, escritor], return_when=asyncio.FIRST_COMPLETED)
+        if not encolado.done():
+            encolado.cancel()
+            return False
+        return True
+
+    def cerrar(self) -> None:
+        """
+        Detiene el pool de hilos y cierra la sesion (guarda las altas en el snapshot).
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=True)
+        self.sesion.cerrar()
+
+
+def interpretar_solicitud(texto: str) -> tuple:
+    """
+    Interpreta una linea de solicitud: texto ("16", "2:...") u objeto JSON con "operacion"
+    y opcionalmente "id".
+
+    Returns:
+        tuple: (opcion, argumento, id). La opcion es None si la solicitud es invalida.
+    """
+    identificador = None
+    if texto.startswith("{"):
+        try:
+            solicitud = json.loads(texto)
+        except json.JSONDecodeError:
+            return None, None, None
+        identificador = solicitud.get("id")
+        texto = str(solicitud.get("operacion", ""))
+    opcion, argumento = cli.interpretar_operacion(texto)
+    return opcion, argumento, identificador
+
+
+async def servir(servidor: ServidorConsultas, host: str = "127.0.0.1", puerto: int = PUERTO_POR_DEFECTO,
+                ruta_socket: Optional[str] = None, listo: Optional[asyncio.Event] = None) -> None:
+    """
+    Atiende conexiones hasta que se cancele la tarea.
+
+    Args:
+        servidor (ServidorConsultas): Servidor a exponer.
+        host (str, opcional): Direccion TCP.
+        puerto (int, opcional): Puerto TCP (0 elige uno libre).
+        ruta_socket (str, opcional): Si se indica, usa un socket Unix en esa ruta en lugar de TCP.
+        listo (asyncio.Event, opcional): Se activa cuando el servidor ya acepta conexiones.
+
+    Returns:
+        None
+    """
+    if ruta_socket is not None:
+        servidor_asyncio = await asyncio.start_unix_server(servidor.atender, ruta_socket)
+    else:
+        servidor_asyncio = await asyncio.start_server(servidor.atender, host, puerto)
+    direcciones = ", ".join(str(socket.getsockname()) for socket in servidor_asyncio.sockets)
+    print(f"Atendiendo en {direcciones}", flush=True)
+    if listo is not None:
+        listo.set()
+    async with servidor_asyncio:
+        await servidor_asyncio.serve_forever()
+
+
+def main(argumentos: Optional[list] = None) -> int:
+    """
+    Punto de entrada del servidor.
+
+    Args:
+        argumentos (list, opcional): Argumentos a interpretar. None usa sys.argv.
+
+    Returns:
+        int: Codigo de salida.
+    """
+    parser = argparse.ArgumentParser(description="Servidor de consultas JSON Lines sobre la matriz de personajes.")
+    parser.add_argument("--datos", help="Archivo CSV, JSON Lines, Parquet o snapshot (.pjs). Por defecto, el dataset de utn_fra.")
+    parser.add_argument("--host", default="127.0.0.1", help="Direccion TCP.")
+    parser.add_argument("--puerto", type=int, default=PUERTO_POR_DEFECTO, help="Puerto TCP.")
+    parser.add_argument("--socket", help="Ruta de un socket Unix (en lugar de TCP).")
+    parser.add_argument("--hilos", type=int, help="Hilos para ordenamientos y resultados grandes.")
+    parser.add_argument("--sin-instantaneas", action="store_true", help="Proteger la matriz con un cerrojo de lectura y escritura en lugar de instantaneas.")
+    parser.add_argument("--procesos", type=int, help="Calcular las estadisticas en paralelo con esta cantidad de procesos (0 = uno por CPU).")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.procesos is not None:
+        operaciones_estadisticas.configurar_paralelismo(opciones.procesos)
+    sesion = cli.SesionCli(opciones.datos, concurrente=not opciones.sin_instantaneas)
+    sesion.cargar()
+    servidor = ServidorConsultas(sesion, opciones.hilos)
+    try:
+        asyncio.run(servir(servidor, opciones.host, opciones.puerto, opciones.socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.cerrar()
+        operaciones_estadisticas.configurar_paralelismo(None)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
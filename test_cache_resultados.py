@@ -0,0 +1,33 @@
+"""
+Pruebas de la cache de resultados.
+"""
+import cache_resultados
+import consultas
+from almacen_personajes import AlmacenPersonajes
+from benchmarks import generar_personajes
+
+
+def test_resultado_de_consulta_se_cobra_por_sus_filas():
+    almacen = AlmacenPersonajes()
+    almacen.agregar_varios(generar_personajes(300, 7))
+    cache = cache_resultados.CacheResultados()
+    resultado = consultas.ejecutar_opcion_menu(almacen, 16)
+    clave = cache_resultados.clave_operacion(consultas.ejecutar_opcion_menu, almacen, (16,), {})
+
+    cache.guardar(clave, resultado)
+
+    assert cache.memoria_usada >= cache_resultados.estimar_tamano(resultado.filas)
+
+
+def test_limite_de_memoria_desaloja_resultados_de_consultas():
+    almacen = AlmacenPersonajes()
+    almacen.agregar_varios(generar_personajes(300, 7))
+    tamano_filas = cache_resultados.estimar_tamano(consultas.ejecutar_opcion_menu(almacen, 16).filas)
+    cache = cache_resultados.CacheResultados(memoria_maxima=int(tamano_filas * 1.5))
+
+    for opcion in (16, 19):
+        clave = cache_resultados.clave_operacion(consultas.ejecutar_opcion_menu, almacen, (opcion,), {})
+        cache.guardar(clave, consultas.ejecutar_opcion_menu(almacen, opcion))
+
+    assert cache.estadisticas()["entradas"] == 1
+    assert cache.desalojos == 1
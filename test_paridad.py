@@ -0,0 +1,41 @@
+"""
+Pruebas de paridad: cada camino optimizado (NumPy, consultas, procesos, ordenamiento
+externo e instantaneas) debe dar los mismos resultados que la implementacion de
+referencia, sobre planteles chicos generados con semilla fija.
+"""
+import pytest
+
+import benchmarks
+
+
+@pytest.mark.parametrize("semilla", [1, 42])
+def test_paridad_backend_numpy(semilla):
+    pytest.importorskip("numpy")
+    backend_anterior = benchmarks.operaciones_estadisticas.BACKEND_VECTORIZADO
+    try:
+        assert benchmarks.verificar_paridad_estadisticas(500, semilla)
+    finally:
+        benchmarks.operaciones_estadisticas.configurar_backend(backend_anterior)
+
+
+@pytest.mark.parametrize("semilla", [1, 42])
+def test_paridad_consultas_menu(semilla):
+    assert benchmarks.verificar_consultas_menu(500, semilla)
+
+
+def test_paridad_calculo_paralelo():
+    assert benchmarks.verificar_paridad_paralela(1000, 7, procesos=2)
+
+
+def test_paridad_orden_externo():
+    assert benchmarks.verificar_orden_externo(1000, 7, procesos=2)
+
+
+def test_instantaneas_no_ven_altas_posteriores():
+    assert benchmarks.verificar_instantaneas(1000, 7, tamano_lote=53)
+
+
+def test_lectores_concurrentes_no_ven_instantaneas_inconsistentes():
+    resultados = benchmarks.medir_lectores_concurrentes(2000, hilos=(2,), segundos=0.3)
+
+    assert all(inconsistentes == 0 for _, _, inconsistentes in resultados.values())
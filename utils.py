@@ -1,5 +1,11 @@
 """
 Funciones de utilidad para validacion y verificacion de datos."""
+from typing import Optional
+
+import instrumentacion
+
+MAXIMO_STAT = 2**31 - 1  # Mayor valor que entra en las columnas array('i') del almacen
+
 def verificar_matriz_vacia(matriz: list, nombre_operacion: str = "operacion") -> bool:
     """
     Verifica si una matriz está vacía y muestra un mensaje de error personalizado si es así.
@@ -14,7 +20,7 @@ def verificar_matriz_vacia(matriz: list, nombre_operacion: str = "operacion") ->
     """
     if not matriz:
         print(f"Error: No se puede realizar la {nombre_operacion} porque la matriz esta vacia.")
-        input("Presione Enter para continuar...")
+        instrumentacion.pedir_entrada("Presione Enter para continuar...")
         return True
     return False
 
@@ -30,16 +36,12 @@ def validar_texto(mensaje: str) -> str:
         str: Texto válido ingresado por el usuario que cumple con los criterios.
     """
     
-    texto = input(mensaje)
+    texto = instrumentacion.pedir_entrada(mensaje)
 
-    if texto ==  "":
-        print("Error: El texto no puede estar vacio.")
+    error = obtener_error_texto(texto)
+    if error is not None:
+        print(error)
         return validar_texto(mensaje)
-    
-    for caracter in texto:
-        if caracter.isdigit():
-            print("Error: El texto no puede contener numeros.")
-            return validar_texto(mensaje)
     return texto
         
 def validar_numero(mensaje: str) -> int:
@@ -51,19 +53,79 @@ def validar_numero(mensaje: str) -> int:
 
     
     Returns:
-        int: Número entero positivo (mayor o igual a 0) validado ingresado por el usuario.
+        int: Número entero positivo (entre 0 y MAXIMO_STAT) validado ingresado por el usuario.
     """
     
     try:
-        numero = int(input(mensaje))
-        if numero < 0:
-            print("Error: El numero debe ser positivo.")
-            return validar_numero(mensaje)
-        return numero
-    except ValueError:
-        print("Error: Debe ingresar un numero valido.")
+        return convertir_stat(instrumentacion.pedir_entrada(mensaje))
+    except ValueError as error:
+        print(error)
         return validar_numero(mensaje)
     
+def obtener_error_texto(texto: str) -> Optional[str]:
+    """
+    Aplica las reglas de validar_texto sin pedir ni mostrar nada: el texto no puede
+    estar vacio ni contener numeros.
+
+    Args:
+        texto (str): Texto a validar.
+
+    Returns:
+        str | None: Mensaje de error si el texto no es valido, None si es valido.
+    """
+    if texto == "":
+        return "Error: El texto no puede estar vacio."
+    for caracter in texto:
+        if caracter.isdigit():
+            return "Error: El texto no puede contener numeros."
+    return None
+
+def obtener_error_personaje(personaje: list) -> Optional[str]:
+    """
+    Aplica las reglas de validacion de un personaje sin mostrar nada en pantalla.
+    
+    Args:
+        personaje (list): Lista con los datos del personaje a validar.
+    
+    Returns:
+        str | None: Mensaje de error si el personaje no es valido, None si es valido.
+    """
+    if not isinstance(personaje, (list, tuple)):
+        return "Error: El personaje debe ser una lista con sus 7 datos."
+    if len(personaje) != 7:
+        return "Error: El personaje debe tener 7 datos (nombre, alias, raza, genero, poder, inteligencia, velocidad)."
+    for dato in personaje:
+        if dato is None or dato == "":
+            return "Error: Todos los datos del personaje deben estar completos."
+    for dato in personaje[:4]:
+        if not isinstance(dato, str):
+            return "Error: Nombre, alias, raza y genero deben ser texto."
+    return None
+
+def convertir_stat(valor) -> int:
+    """
+    Convierte un stat (poder, inteligencia o velocidad) a entero sin mostrar nada en
+    pantalla. No redondea: 1.9 se rechaza, 2.0 se acepta como 2.
+
+    Args:
+        valor (str | int | float): Valor leido del archivo o ingresado por el usuario.
+
+    Returns:
+        int: Stat entre 0 y MAXIMO_STAT.
+
+    Raises:
+        ValueError: Si el valor no es un numero entero o esta fuera de rango.
+    """
+    if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+        raise ValueError("Error: Poder, inteligencia y velocidad deben ser numeros enteros.")
+    try:
+        numero = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError("Error: Poder, inteligencia y velocidad deben ser numeros enteros.") from None
+    if numero < 0 or numero > MAXIMO_STAT:
+        raise ValueError(f"Error: Poder, inteligencia y velocidad deben estar entre 0 y {MAXIMO_STAT}.")
+    return numero
+
 def validar_personaje_completo(personaje: list) -> bool:
     """
     Valida que un personaje tenga todos los datos requeridos y estén completos.
@@ -75,11 +137,33 @@ def validar_personaje_completo(personaje: list) -> bool:
             False si falta algún dato, hay datos de más, o algún campo está vacío/None.
 
     """
-    if len(personaje) != 7:
-        print("Error: El personaje debe tener 7 datos (nombre, alias, raza, genero, poder, inteligencia, velocidad).")
+    error = obtener_error_personaje(personaje)
+    if error is not None:
+        print(error)
         return False
-    for dato in personaje:
-        if dato is None or dato == "":
-            print("Error: Todos los datos del personaje deben estar completos.")
-            return False
-    return True
\ No newline at end of file
+    return True
+
+def convertir_personaje(datos: list) -> list:
+    """
+    Valida y convierte los datos de un personaje con las mismas reglas que el menu
+    (pedir_datos_personaje), sin interaccion: los textos no pueden estar vacios ni
+    contener numeros y los stats deben ser enteros entre 0 y MAXIMO_STAT.
+
+    Args:
+        datos (list): [nombre, alias, raza, genero, poder, inteligencia, velocidad].
+
+    Returns:
+        list: Personaje con los stats convertidos a enteros.
+
+    Raises:
+        ValueError: Con el mensaje del primer dato invalido.
+    """
+    error = obtener_error_personaje(datos)
+    if error is None:
+        for texto in datos[:4]:
+            error = obtener_error_texto(texto)
+            if error is not None:
+                break
+    if error is not None:
+        raise ValueError(error)
+    return list(datos[:4]) + [convertir_stat(valor) for valor in datos[4:]]
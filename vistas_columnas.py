@@ -0,0 +1,83 @@
+"""
+Vistas de solo lectura sobre las columnas de una matriz de personajes.
+
+Una VistaColumna expone un atributo (nombre, alias, raza, ...) de todos los personajes
+sin copiarlo: sobre una lista de personajes lee personaje[indice] al recorrerla y sobre
+un AlmacenPersonajes lee directamente su columna. Como no guarda una copia, siempre
+refleja los personajes agregados despues de crearla y no hay que invalidarla.
+"""
+from operator import itemgetter
+
+from almacen_personajes import AlmacenPersonajes, COLUMNAS_TEXTO
+
+
+class VistaColumna:
+    """
+    Columna de una matriz de personajes, indexable e iterable, sin copia de los datos.
+    """
+
+    def __init__(self, matriz, indice_columna: int) -> None:
+        """
+        Args:
+            matriz (list | AlmacenPersonajes): Matriz de personajes.
+            indice_columna (int): Índice de la columna (0=nombre, 1=alias, 2=raza,
+                                3=genero, 4=poder, 5=inteligencia, 6=velocidad).
+        """
+        self.matriz = matriz
+        self.indice_columna = indice_columna
+        self.es_almacen = isinstance(matriz, AlmacenPersonajes)
+        self.es_texto = self.es_almacen and indice_columna in COLUMNAS_TEXTO
+
+    def __len__(self) -> int:
+        return len(self.matriz)
+
+    def __getitem__(self, posicion):
+        if not self.es_almacen:
+            if isinstance(posicion, slice):
+                return [personaje[self.indice_columna] for personaje in self.matriz[posicion]]
+            return self.matriz[posicion][self.indice_columna]
+        # Se busca la columna en cada acceso: el almacen la reemplaza al copiar un snapshot mapeado
+        columna = self.matriz.columnas[self.indice_columna]
+        if not self.es_texto:
+            return list(columna[posicion]) if isinstance(posicion, slice) else columna[posicion]
+        valores = self.matriz.diccionarios[self.indice_columna].valores
+        if isinstance(posicion, slice):
+            return [valores[codigo] for codigo in columna[posicion]]
+        return valores[columna[posicion]]
+
+    def __iter__(self):
+        if not self.es_almacen:
+            return map(itemgetter(self.indice_columna), self.matriz)
+        columna = self.matriz.columnas[self.indice_columna]
+        if not self.es_texto:
+            return iter(columna)
+        return map(self.matriz.diccionarios[self.indice_columna].valores.__getitem__, columna)
+
+    def valores(self):
+        """
+        Retorna la columna como secuencia indexable para accesos repetidos (ej: como
+        clave de un sort). Sobre las columnas numericas del almacen es la columna misma,
+        sin copia; en los demas casos es una lista con los valores.
+
+        Returns:
+            list | array | memoryview: Valores de la columna, uno por personaje.
+        """
+        if self.es_almacen and not self.es_texto:
+            return self.matriz.columnas[self.indice_columna]
+        return list(self)
+
+
+def filas_en_posiciones(matriz, posiciones: list) -> list:
+    """
+    Retorna las filas de la matriz ubicadas en las posiciones indicadas, en ese orden.
+
+    Args:
+        matriz (list | AlmacenPersonajes): Matriz de personajes.
+        posiciones (list): Posiciones de las filas a retornar.
+
+    Returns:
+        list: Personajes seleccionados.
+    """
+    if isinstance(matriz, AlmacenPersonajes):
+        return matriz.filas(posiciones)
+    return [matriz[posicion] for posicion in posiciones]